@@ -16,6 +16,9 @@ from homeassistant.exceptions import ConfigEntryNotReady
 
 from .const import DOMAIN
 from .coordinator import BMWWallboxCoordinator
+from .services import async_setup_services, async_unload_services
+from .sessions import SessionLedger
+from .store import WallboxStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -50,6 +53,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Create coordinator
     coordinator = BMWWallboxCoordinator(hass, config)
 
+    # Start from the state persisted before the last restart
+    await coordinator.async_restore_state(
+        WallboxStore(hass, entry.entry_id), SessionLedger(hass, entry.entry_id)
+    )
+
     # Store coordinator
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -64,7 +72,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # Reload integration when options change
+    # Services are shared by all entries
+    async_setup_services(hass)
+
+    # Apply options in place when they change (reload only if the server changes)
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     _LOGGER.info("BMW Wallbox integration setup complete")
@@ -73,7 +84,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    coordinator: BMWWallboxCoordinator = hass.data[DOMAIN][entry.entry_id]
+    config = {**entry.data, **entry.options}
+
+    if coordinator.requires_reload(config):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    # Keep the OCPP connection up - a reload drops it and the wallbox has to
+    # reconnect and redo the on-connect setup
+    await coordinator.async_apply_options(config)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -90,5 +110,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         # Remove coordinator
         hass.data[DOMAIN].pop(entry.entry_id)
+        if not hass.data[DOMAIN]:
+            async_unload_services(hass)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the persisted state and session history of a removed entry."""
+    await WallboxStore(hass, entry.entry_id).async_remove()
+    await SessionLedger(hass, entry.entry_id).async_remove()
@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
@@ -37,6 +35,9 @@ async def async_setup_entry(
 class BMWWallboxBinarySensorBase(CoordinatorEntity, BinarySensorEntity):
     """Base class for BMW Wallbox binary sensors."""
 
+    # coordinator.data keys this sensor reads (None = refresh on every update)
+    _data_keys: frozenset[str] | None = None
+
     def __init__(
         self,
         coordinator: BMWWallboxCoordinator,
@@ -44,7 +45,7 @@ class BMWWallboxBinarySensorBase(CoordinatorEntity, BinarySensorEntity):
         sensor_type: str,
     ) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, self._data_keys)
         self._attr_unique_id = f"{entry.entry_id}_{sensor_type}"
         self._attr_device_info = {
             "identifiers": {(DOMAIN, entry.data["charge_point_id"])},
@@ -59,6 +60,8 @@ class BMWWallboxBinarySensorBase(CoordinatorEntity, BinarySensorEntity):
 class BMWWallboxChargingBinarySensor(BMWWallboxBinarySensorBase):
     """Binary sensor for charging status."""
 
+    _data_keys = frozenset({"power"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         """Initialize the binary sensor."""
         super().__init__(coordinator, entry, BINARY_SENSOR_CHARGING)
@@ -69,13 +72,15 @@ class BMWWallboxChargingBinarySensor(BMWWallboxBinarySensorBase):
     def is_on(self) -> bool:
         """Return true if actively charging (power > 100W)."""
         # Check power draw instead of state, as state can be "EVConnected" even when charging
-        power = self.coordinator.data.get("power", 0)
+        power = self.coordinator.data.power or 0
         return power > 100  # Consider charging if drawing more than 100W
 
 
 class BMWWallboxConnectedBinarySensor(BMWWallboxBinarySensorBase):
     """Binary sensor for OCPP connection status between wallbox and Home Assistant."""
 
+    _data_keys = frozenset({"connected", "last_heartbeat"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         """Initialize the binary sensor."""
         super().__init__(coordinator, entry, BINARY_SENSOR_CONNECTED)
@@ -85,16 +90,13 @@ class BMWWallboxConnectedBinarySensor(BMWWallboxBinarySensorBase):
     @property
     def is_on(self) -> bool:
         """Return true if wallbox is connected to Home Assistant via OCPP."""
-        # Consider connected if we've received a heartbeat in the last 30 seconds
-        last_heartbeat = self.coordinator.data.get("last_heartbeat")
-        if last_heartbeat and isinstance(last_heartbeat, datetime):
-            return (datetime.utcnow() - last_heartbeat) < timedelta(seconds=30)
-        return self.coordinator.data.get("connected", False)
+        # Cleared by the liveness watchdog once the wallbox falls silent
+        return self.coordinator.data.connected
 
     @property
     def extra_state_attributes(self) -> dict:
         """Return extra attributes."""
-        last_heartbeat = self.coordinator.data.get("last_heartbeat")
+        last_heartbeat = self.coordinator.data.last_heartbeat
         return {
             "last_heartbeat": last_heartbeat.isoformat() if last_heartbeat else None,
         }
@@ -0,0 +1,104 @@
+"""Connect-time bootstrap pipeline for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+
+After a (re)connect the coordinator has a handful of things to ask the wallbox
+(fresh meter values, transaction recovery, configuration, default profile).
+This runs them as an ordered pipeline with explicit dependencies and records
+how long each step took, instead of racing fire-and-forget tasks that each
+sleep a fixed time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+STEP_OK = "ok"
+STEP_FAILED = "failed"
+STEP_CANCELLED = "cancelled"
+
+
+@dataclass(slots=True)
+class BootstrapStep:
+    """One step of the bootstrap pipeline.
+
+    The step starts once every step named in `after` has finished (whatever
+    its outcome) - OCPP calls to the wallbox are serialized anyway, so this
+    only controls ordering. A step that returns False counts as failed.
+    """
+
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    after: tuple[str, ...] = ()
+
+
+@dataclass(slots=True)
+class StepResult:
+    """Outcome and timing of a bootstrap step."""
+
+    status: str
+    started: float  # seconds after the pipeline started
+    duration: float  # seconds
+
+
+async def async_run_pipeline(
+    steps: Iterable[BootstrapStep],
+    results: dict[str, StepResult] | None = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> dict[str, StepResult]:
+    """Run steps respecting their dependencies and return per-step results.
+
+    Results are filled into `results` as steps finish, so a caller keeping a
+    reference sees partial timings too. Cancelling the pipeline cancels every
+    running step.
+    """
+    steps = list(steps)
+    start = clock()
+    if results is None:
+        results = {}
+    tasks: dict[str, asyncio.Task] = {}
+
+    async def run_step(step: BootstrapStep) -> None:
+        await asyncio.gather(
+            *(tasks[name] for name in step.after), return_exceptions=True
+        )
+        step_start = clock()
+        status = STEP_OK
+        try:
+            if await step.run() is False:
+                status = STEP_FAILED
+        except asyncio.CancelledError:
+            results[step.name] = StepResult(
+                STEP_CANCELLED, step_start - start, clock() - step_start
+            )
+            raise
+        except Exception as err:
+            _LOGGER.warning("Bootstrap step %s failed: %s", step.name, err)
+            status = STEP_FAILED
+        results[step.name] = StepResult(
+            status, step_start - start, clock() - step_start
+        )
+
+    for step in steps:
+        unknown = [name for name in step.after if name not in tasks]
+        if unknown:
+            raise ValueError(f"Step {step.name} depends on unknown step(s) {unknown}")
+        tasks[step.name] = asyncio.create_task(run_step(step))
+
+    try:
+        await asyncio.gather(*tasks.values())
+    except asyncio.CancelledError:
+        for task in tasks.values():
+            task.cancel()
+        raise
+
+    return results
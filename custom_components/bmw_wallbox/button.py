@@ -43,6 +43,9 @@ async def async_setup_entry(
 class BMWWallboxButtonBase(CoordinatorEntity, ButtonEntity):
     """Base class for BMW Wallbox buttons."""
 
+    # Buttons read no coordinator.data keys - only availability changes matter
+    _data_keys: frozenset[str] = frozenset()
+
     def __init__(
         self,
         coordinator: BMWWallboxCoordinator,
@@ -51,7 +54,7 @@ class BMWWallboxButtonBase(CoordinatorEntity, ButtonEntity):
         button_type: str,
     ) -> None:
         """Initialize the button."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, self._data_keys)
         self.hass = hass
         self._attr_unique_id = f"{entry.entry_id}_{button_type}"
         self._attr_device_info = {
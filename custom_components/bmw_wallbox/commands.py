@@ -0,0 +1,252 @@
+"""OCPP command executor for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+
+Every call to the wallbox goes through CommandExecutor.async_call, which
+applies a per-action timeout and retry policy and records latency and
+outcome statistics per action, so the diagnostics show which OCPP calls are
+slow or flaky on the link to the wallbox.
+
+Only idempotent actions are retried, and only after a timeout (the request
+or its answer got lost): sending the same profile ID again replaces it,
+clearing or reading twice is harmless. Starting a transaction or resetting
+the wallbox twice is not, so those are never retried. Retries wait a short
+random (full jitter) delay.
+
+The wallbox handles one call at a time, so calls to the same charge point
+queue up here; an attempt's timeout and latency only start once it is its
+turn, so a busy connection does not look like a silent wallbox.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import logging
+import random
+import time
+from typing import Any
+import weakref
+
+from ocpp.exceptions import OCPPError
+from websockets.exceptions import ConnectionClosed
+
+_LOGGER = logging.getLogger(__name__)
+
+# Upper bounds (s) of the latency histogram buckets; the last one is open
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0)
+
+
+@dataclass(slots=True, frozen=True)
+class CommandPolicy:
+    """How an OCPP action is sent."""
+
+    timeout: float = 15.0  # seconds per attempt
+    attempts: int = 1  # attempts in total, >1 only for idempotent actions
+    backoff: float = 0.5  # maximum delay (s) before a retry, doubled each time
+
+
+DEFAULT_POLICY = CommandPolicy()
+
+# Per-action policies; anything missing uses DEFAULT_POLICY (no retry)
+POLICIES: dict[str, CommandPolicy] = {
+    "SetChargingProfile": CommandPolicy(timeout=8.0, attempts=2),
+    "ClearChargingProfile": CommandPolicy(timeout=8.0, attempts=2),
+    "GetChargingProfiles": CommandPolicy(timeout=5.0, attempts=2),
+    "GetTransactionStatus": CommandPolicy(timeout=5.0, attempts=2),
+    "TriggerMessage": CommandPolicy(timeout=5.0, attempts=2),
+    "SetVariables": CommandPolicy(timeout=10.0, attempts=2),
+    "RequestStartTransaction": CommandPolicy(timeout=15.0),
+    "Reset": CommandPolicy(timeout=15.0),
+}
+
+
+class CommandStats:
+    """Latency histogram and outcome counters of one action."""
+
+    __slots__ = (
+        "answered",
+        "buckets",
+        "calls",
+        "cancelled",
+        "failed",
+        "last_latency",
+        "retries",
+        "timeouts",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.calls = 0  # async_call invocations
+        self.answered = 0  # calls that got a response (any status)
+        self.failed = 0  # calls that raised after the last attempt
+        self.timeouts = 0  # attempts that timed out
+        self.retries = 0
+        self.cancelled = 0  # callers that gave up while waiting
+        self.last_latency: float | None = None
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record_latency(self, latency: float) -> None:
+        """Add the round trip time of an answered attempt."""
+        self.last_latency = latency
+        self.buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    @property
+    def success_rate(self) -> float | None:
+        """Return the share of finished calls that got a response."""
+        finished = self.answered + self.failed
+        return self.answered / finished if finished else None
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the bucket bound below which `fraction` of latencies fall.
+
+        None without samples, infinity if it falls in the open last bucket.
+        """
+        total = sum(self.buckets)
+        if not total:
+            return None
+        threshold = fraction * total
+        seen = 0
+        for bound, count in zip(
+            (*LATENCY_BUCKETS, float("inf")), self.buckets, strict=True
+        ):
+            seen += count
+            if seen >= threshold:
+                return bound
+        return float("inf")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {
+            "calls": self.calls,
+            "answered": self.answered,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "cancelled": self.cancelled,
+            "success_rate": self.success_rate,
+            "last_latency": self.last_latency,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "histogram": {
+                f"<={bound}": count
+                for bound, count in zip(LATENCY_BUCKETS, self.buckets, strict=False)
+            }
+            | {f">{LATENCY_BUCKETS[-1]}": self.buckets[-1]},
+        }
+
+
+class CommandExecutor:
+    """Send OCPP calls with per-action timeouts, retries and statistics."""
+
+    def __init__(
+        self,
+        policies: dict[str, CommandPolicy] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+        jitter: Callable[[], float] = random.random,
+        on_attempt: Callable[[bool], None] = lambda _: None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            policies: Per-action policies (default: POLICIES)
+            clock: Time source for latency measurements
+            sleep: Waits before a retry
+            jitter: Returns a random fraction of the backoff to wait
+            on_attempt: Called with True/False for every attempt the wallbox
+                answered/left unanswered (feeds the circuit breaker)
+        """
+        self.policies = POLICIES if policies is None else policies
+        self._on_attempt = on_attempt
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+        self.stats: dict[str, CommandStats] = {}
+        self._locks: weakref.WeakKeyDictionary[Any, asyncio.Lock] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def policy(self, action: str) -> CommandPolicy:
+        """Return the policy of an action."""
+        return self.policies.get(action, DEFAULT_POLICY)
+
+    async def async_call(self, charge_point: Any, request: Any) -> Any:
+        """Send request and return the response.
+
+        Calls to the same charge point are sent one at a time; each attempt
+        waits for its turn before its timeout starts. Timed out attempts of
+        idempotent actions are retried. Cancelling the caller cancels the
+        attempt in flight (releasing the connection for the next call) and is
+        never retried.
+
+        Raises:
+            TimeoutError: The last attempt timed out
+            Exception: Whatever the OCPP library raised (not retried)
+        """
+        action = type(request).__name__
+        policy = self.policy(action)
+        stats = self.stats.setdefault(action, CommandStats())
+        stats.calls += 1
+        lock = self._locks.setdefault(charge_point, asyncio.Lock())
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with lock:
+                    started = self._clock()
+                    response = await asyncio.wait_for(
+                        charge_point.call(request), timeout=policy.timeout
+                    )
+            except asyncio.CancelledError:
+                stats.cancelled += 1
+                raise
+            except TimeoutError:
+                stats.timeouts += 1
+                self._on_attempt(False)
+                if attempt >= policy.attempts:
+                    stats.failed += 1
+                    raise
+                stats.retries += 1
+                delay = policy.backoff * 2 ** (attempt - 1) * self._jitter()
+                _LOGGER.info(
+                    "⏱️ %s timed out after %.0fs, retrying in %.2fs (%d/%d)",
+                    action,
+                    policy.timeout,
+                    delay,
+                    attempt + 1,
+                    policy.attempts,
+                )
+                try:
+                    await self._sleep(delay)
+                except asyncio.CancelledError:
+                    stats.cancelled += 1
+                    raise
+            except ConnectionClosed:
+                stats.failed += 1
+                self._on_attempt(False)
+                raise
+            except OCPPError:
+                # A CALLERROR is still an answer from the wallbox
+                stats.failed += 1
+                self._on_attempt(True)
+                raise
+            except Exception:
+                # Local errors (payload validation etc.) say nothing about
+                # the wallbox
+                stats.failed += 1
+                raise
+            else:
+                stats.answered += 1
+                self._on_attempt(True)
+                stats.record_latency(self._clock() - started)
+                return response
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics of every action for diagnostics."""
+        return {action: stats.as_dict() for action, stats in self.stats.items()}
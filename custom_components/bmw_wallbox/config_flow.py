@@ -10,21 +10,38 @@ from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, selector
 import voluptuous as vol
 
 from .const import (
     CONF_CHARGE_POINT_ID,
+    CONF_CONTROL_GRID_TARGET,
+    CONF_CONTROL_SOURCE,
+    CONF_ESCALATION_STEPS,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_LIVENESS_DEADLINE,
     CONF_MAX_CURRENT,
+    CONF_METER_INTERVAL,
     CONF_PORT,
+    CONF_PUBLISH_WINDOW,
     CONF_RFID_TOKEN,
     CONF_SCAN_INTERVAL,
     CONF_SSL_CERT,
     CONF_SSL_KEY,
+    CONF_TELEMETRY_LOGGING,
+    DEFAULT_CONTROL_GRID_TARGET,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_LIVENESS_DEADLINE,
     DEFAULT_MAX_CURRENT,
+    DEFAULT_METER_INTERVAL,
     DEFAULT_PORT,
+    DEFAULT_PUBLISH_WINDOW,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TELEMETRY_LOGGING,
     DOMAIN,
+    TELEMETRY_LOG_MODES,
 )
+from .escalation import ESCALATION_STEPS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -142,6 +159,28 @@ class OptionsFlow(config_entries.OptionsFlow):
             CONF_SCAN_INTERVAL,
             self.config_entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
         )
+        current_window = self.config_entry.options.get(
+            CONF_PUBLISH_WINDOW, DEFAULT_PUBLISH_WINDOW
+        )
+        current_meter_interval = self.config_entry.options.get(
+            CONF_METER_INTERVAL, DEFAULT_METER_INTERVAL
+        )
+        current_telemetry_logging = self.config_entry.options.get(
+            CONF_TELEMETRY_LOGGING, DEFAULT_TELEMETRY_LOGGING
+        )
+        current_control_source = self.config_entry.options.get(CONF_CONTROL_SOURCE)
+        current_grid_target = self.config_entry.options.get(
+            CONF_CONTROL_GRID_TARGET, DEFAULT_CONTROL_GRID_TARGET
+        )
+        current_deadline = self.config_entry.options.get(
+            CONF_LIVENESS_DEADLINE, DEFAULT_LIVENESS_DEADLINE
+        )
+        current_heartbeat = self.config_entry.options.get(
+            CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+        )
+        current_escalation = self.config_entry.options.get(
+            CONF_ESCALATION_STEPS, list(ESCALATION_STEPS)
+        )
 
         return self.async_show_form(
             step_id="init",
@@ -154,6 +193,36 @@ class OptionsFlow(config_entries.OptionsFlow):
                     vol.Optional(CONF_SCAN_INTERVAL, default=current_scan): vol.All(
                         vol.Coerce(int), vol.Range(min=5, max=60)
                     ),
+                    vol.Optional(CONF_PUBLISH_WINDOW, default=current_window): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=2000)
+                    ),
+                    vol.Optional(
+                        CONF_METER_INTERVAL, default=current_meter_interval
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        CONF_TELEMETRY_LOGGING, default=current_telemetry_logging
+                    ): vol.In(TELEMETRY_LOG_MODES),
+                    # Suggested rather than default so the field can be cleared
+                    vol.Optional(
+                        CONF_CONTROL_SOURCE,
+                        description={"suggested_value": current_control_source},
+                    ): selector.EntitySelector(
+                        selector.EntitySelectorConfig(
+                            domain="sensor", device_class="power"
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_CONTROL_GRID_TARGET, default=current_grid_target
+                    ): vol.All(vol.Coerce(int), vol.Range(min=-50000, max=50000)),
+                    vol.Optional(
+                        CONF_LIVENESS_DEADLINE, default=current_deadline
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10, max=600)),
+                    vol.Optional(
+                        CONF_HEARTBEAT_INTERVAL, default=current_heartbeat
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
+                    vol.Optional(
+                        CONF_ESCALATION_STEPS, default=current_escalation
+                    ): cv.multi_select(list(ESCALATION_STEPS)),
                 }
             ),
         )
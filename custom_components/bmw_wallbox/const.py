@@ -4,6 +4,9 @@ from typing import Final
 
 DOMAIN: Final = "bmw_wallbox"
 
+# hass.data key for the shared OCPP servers, keyed by port
+DATA_SERVERS: Final = f"{DOMAIN}_servers"
+
 # Configuration
 CONF_PORT: Final = "port"
 CONF_SSL_CERT: Final = "ssl_cert"
@@ -12,11 +15,76 @@ CONF_CHARGE_POINT_ID: Final = "charge_point_id"
 CONF_RFID_TOKEN: Final = "rfid_token"
 CONF_MAX_CURRENT: Final = "max_current"
 CONF_SCAN_INTERVAL: Final = "scan_interval"
+CONF_PUBLISH_WINDOW: Final = "publish_window"
+CONF_METER_INTERVAL: Final = "meter_interval"
+CONF_TELEMETRY_LOGGING: Final = "telemetry_logging"
+CONF_CONTROL_SOURCE: Final = "control_source"
+CONF_CONTROL_GRID_TARGET: Final = "control_grid_target"
+CONF_ESCALATION_STEPS: Final = "escalation_steps"
+CONF_LIVENESS_DEADLINE: Final = "liveness_deadline"
+CONF_HEARTBEAT_INTERVAL: Final = "heartbeat_interval"
 
 # Defaults
 DEFAULT_PORT: Final = 9000
 DEFAULT_MAX_CURRENT: Final = 32
 DEFAULT_SCAN_INTERVAL: Final = 10  # seconds
+DEFAULT_PUBLISH_WINDOW: Final = 250  # milliseconds, 0 disables coalescing
+DEFAULT_METER_INTERVAL: Final = 10  # seconds, 0 leaves the wallbox untouched
+DEFAULT_CONTROL_GRID_TARGET: Final = 0  # W, 0 = charge from PV surplus only
+DEFAULT_LIVENESS_DEADLINE: Final = 30  # seconds of silence before going offline
+DEFAULT_HEARTBEAT_INTERVAL: Final = 10  # seconds, while no other traffic flows
+
+# Current control following a grid power sensor (see control.py)
+MIN_CURRENT: Final = 6  # A, lowest current an EV charges with
+NOMINAL_VOLTAGE: Final = 230  # V, used until the wallbox reports voltage
+MAX_PHASES: Final = 3  # phases assumed until the wallbox reports them
+CONTROL_MIN_INTERVAL: Final = 1.0  # seconds between limit updates
+CONTROL_MIN_DWELL: Final = 30  # seconds after a change before raising again
+CONTROL_HYSTERESIS: Final = 0.5  # A of headroom kept when raising
+
+# Telemetry logging modes for MeterValues/TransactionEvent
+TELEMETRY_LOG_OFF: Final = "off"
+TELEMETRY_LOG_SUMMARY: Final = "summary"  # one line per message
+TELEMETRY_LOG_FULL: Final = "full"  # plus every sample (debug, rate-limited)
+TELEMETRY_LOG_MODES: Final = (
+    TELEMETRY_LOG_OFF,
+    TELEMETRY_LOG_SUMMARY,
+    TELEMETRY_LOG_FULL,
+)
+DEFAULT_TELEMETRY_LOGGING: Final = TELEMETRY_LOG_SUMMARY
+TELEMETRY_TRACE_INTERVAL: Final = 10  # seconds between full sample traces
+
+# Waiting for the wallbox to confirm a command (see events.py)
+TRANSACTION_START_TIMEOUT: Final = 10  # seconds for TransactionEvent(Started)
+CHARGING_START_TIMEOUT: Final = 15  # seconds until the car draws current
+RECONNECT_TIMEOUT: Final = 90  # seconds for the wallbox to come back after a reset
+
+# Offline TransactionEvent replay (see replay.py)
+REPLAY_SETTLE_TIME: Final = 1.0  # seconds without queued events ending a burst
+
+# Failure escalation circuit breaker (see escalation.py): reboot only if at
+# least BREAKER_FAILURE_RATE of BREAKER_MIN_CALLS+ recent calls went unanswered
+BREAKER_WINDOW: Final = 120  # seconds of call outcomes considered
+BREAKER_MIN_CALLS: Final = 5
+BREAKER_FAILURE_RATE: Final = 0.75
+
+# Connection liveness watchdog (see watchdog.py)
+LIVENESS_PING_INTERVAL: Final = 10  # seconds between WebSocket pings
+HEARTBEAT_BUSY_INTERVAL: Final = 300  # seconds while MeterValues etc. flow
+
+# Charging profile cache (see profiles.py)
+PROFILE_RECONCILE_INTERVAL: Final = 900  # seconds between GetChargingProfiles
+PROFILE_REPORT_TIMEOUT: Final = 10  # seconds to wait for ReportChargingProfiles
+
+# Wallbox sampling configuration (see docs/WALLBOX_CAPABILITIES.md)
+SUPPORTED_MEASURANDS: Final = (
+    "Current.Import",
+    "Energy.Active.Import.Register",
+    "Power.Active.Import",
+    "Voltage",
+)
+ALIGNED_DATA_MEASURANDS: Final = ("Energy.Active.Import.Register",)
+ALIGNED_DATA_INTERVAL: Final = 900  # seconds, clock-aligned (quarter hour)
 
 # Entity unique ID suffixes
 SENSOR_POWER: Final = "power"
@@ -0,0 +1,205 @@
+"""Grid-following current control for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+
+Follows a grid power sensor (W, positive = import, negative = export) and
+moves the charging current limit so the grid settles on a target power:
+0 W charges from PV surplus only, a positive target (e.g. the main fuse
+capacity) balances the wallbox against the rest of the house.
+
+The loop runs on the sensor's state changes, not on the meter poll, so a
+house load that pushes the grid over the target lowers the limit right away.
+Lowering is never delayed beyond the rate bound; raising needs a margin of
+CONTROL_HYSTERESIS and CONTROL_MIN_DWELL since the last change, so passing
+clouds don't toggle the car between currents.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+import math
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN, UnitOfPower
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    CONF_MAX_CURRENT,
+    CONTROL_HYSTERESIS,
+    CONTROL_MIN_DWELL,
+    CONTROL_MIN_INTERVAL,
+    DEFAULT_MAX_CURRENT,
+    MAX_PHASES,
+    MIN_CURRENT,
+    NOMINAL_VOLTAGE,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import BMWWallboxCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CurrentController:
+    """Adjust the current limit to keep a grid power sensor at a target."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: BMWWallboxCoordinator,
+        source: str,
+        grid_target: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            hass: Home Assistant instance
+            coordinator: Coordinator of the wallbox to control
+            source: Entity ID of the grid power sensor
+            grid_target: Grid power to settle on (W, positive = import)
+            clock: Time source for the dwell and rate bounds
+        """
+        self.hass = hass
+        self.coordinator = coordinator
+        self.source = source
+        self.grid_target = grid_target
+        self._clock = clock
+        self._unsub: CALLBACK_TYPE | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._send: asyncio.Task | None = None
+        self._requested: float | None = None
+        self._last_change: float | None = None  # clock() of the last limit sent
+        self.updates = 0
+
+    @callback
+    def async_start(self) -> None:
+        """Start following the source sensor."""
+        _LOGGER.info(
+            "⚡ Current control following %s (grid target %s W)",
+            self.source,
+            self.grid_target,
+        )
+        self._unsub = async_track_state_change_event(
+            self.hass, [self.source], self._async_source_changed
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the source sensor and drop a limit still being sent."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._send is not None:
+            # Must not overwrite a limit the user sets after control stopped
+            self._send.cancel()
+            self._send = None
+
+    @callback
+    def _async_source_changed(self, event: Event) -> None:
+        """Re-evaluate the limit on every new grid reading."""
+        if self._timer is None:
+            self.async_evaluate()
+        # Otherwise the pending re-evaluation reads the latest state
+
+    @callback
+    def _async_timer_fired(self) -> None:
+        """Re-evaluate once a rate or dwell bound has passed."""
+        self._timer = None
+        self.async_evaluate()
+
+    def grid_power(self) -> float | None:
+        """Return the source sensor's grid power in W (None if unknown)."""
+        state = self.hass.states.get(self.source)
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return None
+        try:
+            value = float(state.state)
+        except ValueError:
+            return None
+        if state.attributes.get("unit_of_measurement") == UnitOfPower.KILO_WATT:
+            value *= 1000
+        return value
+
+    def target_current(self, grid_power: float) -> float:
+        """Return the current (A) that would bring the grid to the target.
+
+        The grid reading includes the wallbox itself, so the power the
+        wallbox may draw is its own power plus the room left on the grid.
+        Until the wallbox reports its phases, all three are assumed, which
+        gives the lowest current for a surplus.
+        """
+        data = self.coordinator.data
+        voltage = data.voltage or NOMINAL_VOLTAGE
+        phases = data.phases_used or MAX_PHASES
+        available = (data.power or 0.0) + self.grid_target - grid_power
+        return available / (voltage * phases)
+
+    @callback
+    def async_evaluate(self) -> None:
+        """Compute the limit for the latest grid reading and send it if due."""
+        coordinator = self.coordinator
+        if not (coordinator.charge_point and coordinator.current_transaction_id):
+            return  # nothing draws current, nothing to control
+        grid_power = self.grid_power()
+        if grid_power is None:
+            return
+
+        max_current = coordinator.config.get(CONF_MAX_CURRENT, DEFAULT_MAX_CURRENT)
+        current = coordinator.data.current_limit
+        if current is None:
+            current = max_current
+        target = self.target_current(grid_power)
+        now = self._clock()
+
+        limit = min(max(math.floor(target), MIN_CURRENT), max_current)
+        if limit >= current:
+            # Raising: keep a margin and let the last change settle first
+            limit = min(
+                max(math.floor(target - CONTROL_HYSTERESIS), MIN_CURRENT), max_current
+            )
+            if limit <= current:
+                return
+            if self._last_change is not None:
+                dwell = self._last_change + CONTROL_MIN_DWELL - now
+                if dwell > 0:
+                    self._schedule(dwell)
+                    return
+
+        if limit == self._requested and self._send and not self._send.done():
+            return  # already on its way
+
+        # Bounded update rate, also for reductions
+        if self._last_change is not None:
+            wait = self._last_change + CONTROL_MIN_INTERVAL - now
+            if wait > 0:
+                self._schedule(wait)
+                return
+
+        _LOGGER.info(
+            "⚡ Grid at %.0f W (target %s W): current limit %sA -> %sA",
+            grid_power,
+            self.grid_target,
+            current,
+            limit,
+        )
+        self._requested = limit
+        self._last_change = now
+        self.updates += 1
+        self._send = self.hass.async_create_task(
+            coordinator.async_set_current_limit(limit)
+        )
+
+    def _schedule(self, delay: float) -> None:
+        """Re-evaluate after delay seconds (once, with the latest reading)."""
+        if self._timer is None:
+            self._timer = self.hass.loop.call_later(delay, self._async_timer_fired)
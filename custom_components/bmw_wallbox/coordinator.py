@@ -8,16 +8,19 @@ Not affiliated with BMW, Delta Electronics, or any other company.
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable, Iterable
 from datetime import UTC, datetime, timedelta
 import logging
-import ssl
+import time
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from ocpp.routing import on
+from homeassistant.util import dt as dt_util
+from ocpp.routing import after, on
 from ocpp.v201 import ChargePoint as cp, call, call_result
 from ocpp.v201.datatypes import (
+    ChargingProfileCriterionType,
     ChargingProfileType,
     ChargingSchedulePeriodType,
     ChargingScheduleType,
@@ -38,15 +41,84 @@ from ocpp.v201.enums import (
     ResetEnumType,
     ResetStatusEnumType,
 )
-import websockets
+from websockets.exceptions import ConnectionClosed
 
+from .bootstrap import BootstrapStep, StepResult, async_run_pipeline
+from .commands import CommandExecutor
 from .const import (
+    ALIGNED_DATA_INTERVAL,
+    ALIGNED_DATA_MEASURANDS,
+    BREAKER_FAILURE_RATE,
+    BREAKER_MIN_CALLS,
+    BREAKER_WINDOW,
+    CHARGING_START_TIMEOUT,
+    CONF_CHARGE_POINT_ID,
+    CONF_CONTROL_GRID_TARGET,
+    CONF_CONTROL_SOURCE,
+    CONF_ESCALATION_STEPS,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_LIVENESS_DEADLINE,
     CONF_MAX_CURRENT,
+    CONF_METER_INTERVAL,
+    CONF_PORT,
+    CONF_PUBLISH_WINDOW,
+    CONF_RFID_TOKEN,
     CONF_SCAN_INTERVAL,
+    CONF_SSL_CERT,
+    CONF_SSL_KEY,
+    CONF_TELEMETRY_LOGGING,
+    DEFAULT_CONTROL_GRID_TARGET,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_LIVENESS_DEADLINE,
     DEFAULT_MAX_CURRENT,
+    DEFAULT_METER_INTERVAL,
+    DEFAULT_PUBLISH_WINDOW,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TELEMETRY_LOGGING,
     DOMAIN,
+    HEARTBEAT_BUSY_INTERVAL,
+    LIVENESS_PING_INTERVAL,
+    PROFILE_RECONCILE_INTERVAL,
+    PROFILE_REPORT_TIMEOUT,
+    RECONNECT_TIMEOUT,
+    REPLAY_SETTLE_TIME,
+    SUPPORTED_MEASURANDS,
+    TELEMETRY_LOG_FULL,
+    TELEMETRY_LOG_OFF,
+    TELEMETRY_TRACE_INTERVAL,
+    TRANSACTION_START_TIMEOUT,
 )
+from .control import CurrentController
+from .escalation import (
+    ESCALATION_STEPS,
+    RUNG_CLEAR_PROFILES,
+    RUNG_RESET,
+    RUNG_RETRY,
+    RUNG_STOP_TRANSACTION,
+    RUNG_ZERO_PROFILE,
+    ZERO_PROFILE_ID,
+    CircuitBreaker,
+    Rung,
+    async_escalate,
+)
+from .events import (
+    EVENT_CHARGING_STATE_CHANGED,
+    EVENT_CONNECTED,
+    EVENT_METER_VALUES_RECEIVED,
+    EVENT_TRANSACTION_STARTED,
+    WallboxEvents,
+)
+from .limits import LimitCommandQueue
+from .models import WallboxState
+from .polling import AdaptivePoller
+from .profiles import ProfileCache
+from .replay import TransactionEventOrder, replay_order
+from .schedule import SCHEDULE_PROFILE_ID, build_charging_profile
+from .server import OCPPServer, async_get_server, async_release_server
+from .sessions import SessionLedger
+from .store import PERSISTED_KEYS, WallboxStore
+from .timeseries import MeterHistory
+from .watchdog import LivenessMonitor
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -94,6 +166,263 @@ def _compute_live_current(
     return None
 
 
+# Default measurand when a sampled value omits it (OCPP 2.0.1 SampledValueType).
+DEFAULT_MEASURAND = "Energy.Active.Import.Register"
+
+# State transitions that skip the publish window and reach entities at once.
+# Everything else (meter readings, counters) is coalesced.
+_IMMEDIATE_KEYS = frozenset(
+    {
+        "connected",
+        "charging_state",
+        "connector_status",
+        "transaction_id",
+        "current_limit",
+    }
+)
+
+# Lets SetChargingProfile(0A) pause without ending the transaction
+_PAUSE_RESUME_VARIABLES = [("TxCtrlr", "StopTxOnEVSideDisconnect", "false")]
+
+# Start the connect bootstrap anyway if the wallbox stays silent this long (s)
+BOOTSTRAP_FALLBACK_DELAY = 10
+
+# Settings that define the OCPP listener. Changing any of these needs a reload;
+# every other option is applied in place by async_apply_options().
+_RELOAD_KEYS = (CONF_PORT, CONF_SSL_CERT, CONF_SSL_KEY, CONF_CHARGE_POINT_ID)
+
+# Dispatch target for a non-phased Current.Import. The Delta firmware freezes
+# this register, so it only feeds _compute_live_current as a last resort and is
+# never stored directly (issue #15).
+_REPORTED_CURRENT = "reported_total_current"
+
+# Every phase label OCPP 2.0.1 allows on a sampled value (PhaseEnumType).
+_PHASES: tuple[str | None, ...] = (
+    None,
+    "L1",
+    "L2",
+    "L3",
+    "N",
+    "L1-N",
+    "L2-N",
+    "L3-N",
+    "L1-L2",
+    "L2-L3",
+    "L3-L1",
+)
+
+# Per-conductor phases. The wallbox reports both "L1" and "L1-N" for the same
+# conductor depending on firmware, so both map to the same data key.
+_PHASE_INDEX: dict[str | None, int] = {
+    "L1": 0,
+    "L1-N": 0,
+    "L2": 1,
+    "L2-N": 1,
+    "L3": 2,
+    "L3-N": 2,
+}
+
+
+def _kilo(value: str) -> float:
+    """Convert a kilo-unit reading (kW, kvar) to its base unit."""
+    return float(value) * 1000.0
+
+
+def _milli(value: str) -> float:
+    """Convert a base-unit register (Wh, varh) to its kilo unit (kWh, kvarh)."""
+    return float(value) / 1000.0
+
+
+# Unit scaling per measurand family. The None entry is the converter used when
+# the sample carries no (or an unknown) unit_of_measure.
+_POWER_UNITS = {None: float, "W": float, "kW": _kilo}
+_REACTIVE_POWER_UNITS = {None: float, "var": float, "kvar": _kilo}
+_ENERGY_UNITS = {None: _milli, "Wh": _milli, "kWh": float}
+_REACTIVE_ENERGY_UNITS = {None: _milli, "varh": _milli, "kvarh": float}
+_PLAIN_UNITS = {None: float}
+
+# (measurand, data key, per-phase data keys L1/L2/L3 or None, unit converters)
+_MEASURAND_SPECS: tuple[
+    tuple[str, str, tuple[str, str, str] | None, dict[str | None, Any]], ...
+] = (
+    ("Power.Active.Import", "power", None, _POWER_UNITS),
+    ("Power.Active.Export", "power_active_export", None, _POWER_UNITS),
+    ("Power.Reactive.Import", "power_reactive_import", None, _REACTIVE_POWER_UNITS),
+    ("Power.Reactive.Export", "power_reactive_export", None, _REACTIVE_POWER_UNITS),
+    ("Power.Offered", "power_offered", None, _POWER_UNITS),
+    ("Power.Factor", "power_factor", None, _PLAIN_UNITS),
+    ("Energy.Active.Import.Register", "energy_total", None, _ENERGY_UNITS),
+    ("Energy.Active.Export.Register", "energy_active_export", None, _ENERGY_UNITS),
+    (
+        "Energy.Reactive.Import.Register",
+        "energy_reactive_import",
+        None,
+        _REACTIVE_ENERGY_UNITS,
+    ),
+    (
+        "Energy.Reactive.Export.Register",
+        "energy_reactive_export",
+        None,
+        _REACTIVE_ENERGY_UNITS,
+    ),
+    (
+        "Current.Import",
+        _REPORTED_CURRENT,
+        ("current_l1", "current_l2", "current_l3"),
+        _PLAIN_UNITS,
+    ),
+    ("Voltage", "voltage", ("voltage_l1", "voltage_l2", "voltage_l3"), _PLAIN_UNITS),
+    ("Frequency", "frequency", None, _PLAIN_UNITS),
+    ("Temperature", "temperature", None, _PLAIN_UNITS),
+)
+
+
+def _build_measurand_dispatch() -> dict[
+    tuple[str, str | None, str | None], tuple[str, Any]
+]:
+    """Expand _MEASURAND_SPECS into a flat (measurand, phase, unit) lookup.
+
+    Resolving phase aliases and unit scaling here means the meter hot path does
+    a single dict lookup per sampled value instead of walking string compares.
+    """
+    table: dict[tuple[str, str | None, str | None], tuple[str, Any]] = {}
+    for measurand, key, phase_keys, units in _MEASURAND_SPECS:
+        for phase in _PHASES:
+            index = _PHASE_INDEX.get(phase)
+            target = phase_keys[index] if phase_keys and index is not None else key
+            for unit, convert in units.items():
+                table[(measurand, phase, unit)] = (target, convert)
+    return table
+
+
+_MEASURAND_DISPATCH = _build_measurand_dispatch()
+
+
+def _count_samples(meter_value: list[dict[str, Any]]) -> int:
+    """Return the number of sampled values in a payload."""
+    return sum(len(mv.get("sampled_value", ())) for mv in meter_value)
+
+
+def _format_samples(meter_value: list[dict[str, Any]]) -> str:
+    """Render every sampled value for the full telemetry trace."""
+    return ", ".join(
+        f"{sample.get('measurand') or DEFAULT_MEASURAND}={sample.get('value')}"
+        + (f"[{sample['phase']}]" if sample.get("phase") else "")
+        + (f" ({sample['context']})" if sample.get("context") else "")
+        for mv in meter_value
+        for sample in mv.get("sampled_value", ())
+    )
+
+
+class TelemetryLog:
+    """Logging policy for the meter hot path (CONF_TELEMETRY_LOGGING).
+
+    The handlers ask before building any log text, so with logging off (or the
+    logger level above the line's level) a message costs two cheap checks.
+    """
+
+    __slots__ = ("_next_trace", "mode")
+
+    def __init__(self, mode: str) -> None:
+        """Initialize with one of TELEMETRY_LOG_MODES."""
+        self.mode = mode
+        self._next_trace = 0.0
+
+    def summary_enabled(self) -> bool:
+        """Return True if a one-line summary per message should be logged."""
+        return self.mode != TELEMETRY_LOG_OFF and _LOGGER.isEnabledFor(logging.INFO)
+
+    def trace_enabled(self) -> bool:
+        """Return True if this message's samples should be traced.
+
+        Full traces are debug-level and rate-limited to one per
+        TELEMETRY_TRACE_INTERVAL seconds.
+        """
+        if self.mode != TELEMETRY_LOG_FULL or not _LOGGER.isEnabledFor(logging.DEBUG):
+            return False
+        now = time.monotonic()
+        if now < self._next_trace:
+            return False
+        self._next_trace = now + TELEMETRY_TRACE_INTERVAL
+        return True
+
+
+def _sample_time(mv: dict[str, Any]) -> float:
+    """Return a meter value's timestamp in seconds since the epoch."""
+    timestamp = mv.get("timestamp")
+    parsed = dt_util.parse_datetime(timestamp) if isinstance(timestamp, str) else None
+    if parsed is None:
+        return time.time()
+    return dt_util.as_utc(parsed).timestamp()
+
+
+def _apply_sampled_values(
+    data: dict[str, Any],
+    meter_value: list[dict[str, Any]],
+    history: MeterHistory | None = None,
+) -> float | None:
+    """Apply every sampled value in a MeterValues/TransactionEvent payload.
+
+    Shared by both handlers so they can no longer drift apart. Returns the
+    non-phased Current.Import seen in this payload (if any) for
+    _compute_live_current. Every reading is also recorded in `history`.
+    """
+    reported_total_current = None
+    for mv in meter_value:
+        sampled_at = _sample_time(mv) if history is not None else 0.0
+        for sample in mv.get("sampled_value", []):
+            measurand = sample.get("measurand") or DEFAULT_MEASURAND
+            value = sample.get("value")
+            phase = sample.get("phase")
+            context = sample.get("context")
+            location = sample.get("location")
+
+            # Store context and location for all measurands
+            if context:
+                data["context"] = context
+            if location:
+                data["location"] = location
+
+            unit_of_measure = sample.get("unit_of_measure")
+            unit = unit_of_measure.get("unit") if unit_of_measure else None
+            target = _MEASURAND_DISPATCH.get((measurand, phase, unit))
+            if target is None:
+                # Unknown unit label - fall back to the measurand's default unit
+                target = _MEASURAND_DISPATCH.get((measurand, phase, None))
+                if target is None:
+                    continue
+
+            key, convert = target
+            reading = convert(value)
+            if history is not None:
+                history.add(
+                    "current" if key == _REPORTED_CURRENT else key, sampled_at, reading
+                )
+
+            if key == _REPORTED_CURRENT:
+                # Total or unspecified - only used as a last-resort live current
+                reported_total_current = reading
+            elif key == "energy_total":
+                # Only update energy_total if new value is positive and >= current
+                # This prevents utility meters from being corrupted by 0/reset values
+                current_energy = data.get("energy_total")
+                if reading > 0 and (
+                    current_energy is None or reading >= current_energy
+                ):
+                    data["energy_total"] = reading
+                else:
+                    _LOGGER.debug(
+                        "Ignoring energy_total update: new=%.3f kWh, current=%s kWh "
+                        "(value must be > 0 and >= current)",
+                        reading,
+                        current_energy,
+                    )
+            else:
+                data[key] = reading
+
+    return reported_total_current
+
+
 class WallboxChargePoint(cp):
     """ChargePoint handler for the BMW wallbox."""
 
@@ -104,8 +433,16 @@ class WallboxChargePoint(cp):
         super().__init__(charge_point_id, websocket)
         self.coordinator = coordinator
         self.current_transaction_id: str | None = None
+        # Offline TransactionEvents of the current replay burst
+        self._replay_batch: list[dict[str, Any]] = []
+        self._replay_timer: asyncio.TimerHandle | None = None
         _LOGGER.info("Initialized ChargePoint: %s", charge_point_id)
 
+    async def route_message(self, raw_msg):
+        """Count every incoming message as a sign of life."""
+        self.coordinator.liveness.note_alive()
+        await super().route_message(raw_msg)
+
     @on("BootNotification")
     async def on_boot_notification(self, charging_station, reason, **kwargs):
         """Handle BootNotification from wallbox."""
@@ -119,13 +456,41 @@ class WallboxChargePoint(cp):
             "serial_number": charging_station.get("serial_number", "Unknown"),
             "firmware_version": charging_station.get("firmware_version", "Unknown"),
         }
+        if self.coordinator.store is not None:
+            self.coordinator.store.async_update(
+                device_info=self.coordinator.device_info
+            )
+
+        # A booted wallbox starts idle; the watchdog stretches it with traffic
+        interval = self.coordinator.config.get(
+            CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+        )
+        self.coordinator.heartbeat_interval = interval
 
         return call_result.BootNotification(
             current_time=datetime.utcnow().isoformat(),
-            interval=10,
+            interval=interval,
             status=RegistrationStatusEnumType.accepted,
         )
 
+    # The wallbox only accepts our calls once it has heard back from us, so the
+    # connect bootstrap starts after the first response has been sent.
+
+    @after("BootNotification")
+    def after_boot_notification(self, **kwargs):
+        """Start the connect bootstrap after a boot."""
+        self.coordinator.async_start_bootstrap(self)
+
+    @after("Heartbeat")
+    def after_heartbeat(self, **kwargs):
+        """Start the connect bootstrap after a reconnect (no boot)."""
+        self.coordinator.async_start_bootstrap(self)
+
+    @after("StatusNotification")
+    def after_status_notification(self, **kwargs):
+        """Start the connect bootstrap after a reconnect (no boot)."""
+        self.coordinator.async_start_bootstrap(self)
+
     @on("StatusNotification")
     async def on_status_notification(
         self, timestamp, connector_status, evse_id, connector_id, **kwargs
@@ -139,85 +504,49 @@ class WallboxChargePoint(cp):
         )
 
         # Update coordinator data
-        self.coordinator.data["connector_status"] = connector_status
-        self.coordinator.data["evse_id"] = evse_id
-        self.coordinator.data["connector_id"] = connector_id
-        self.coordinator.async_set_updated_data(self.coordinator.data)
+        self.coordinator.async_update_state(
+            connector_status=connector_status,
+            evse_id=evse_id,
+            connector_id=connector_id,
+        )
 
         return call_result.StatusNotification()
 
     @on("MeterValues")
     async def on_meter_values(self, evse_id, meter_value, **kwargs):
         """Handle MeterValues from wallbox (triggered or periodic)."""
-        _LOGGER.info("📊 MeterValues received for EVSE %s", evse_id)
-
-        reported_total_current = None  # non-phased Current.Import seen this event
-        for mv in meter_value:
-            timestamp = mv.get("timestamp")
-            _LOGGER.debug("  Timestamp: %s", timestamp)
-
-            for sample in mv.get("sampled_value", []):
-                measurand = sample.get("measurand", "Energy.Active.Import.Register")
-                value = sample.get("value")
-                phase = sample.get("phase")
-                context = sample.get("context")
+        started = time.perf_counter()
 
-                _LOGGER.info(
-                    "  📈 %s = %s (phase=%s, context=%s)",
-                    measurand,
-                    value,
-                    phase,
-                    context,
-                )
-
-                # Update coordinator data
-                if measurand == "Power.Active.Import":
-                    self.coordinator.data["power"] = float(value)
-                elif measurand == "Energy.Active.Import.Register":
-                    # Only update energy_total if new value is positive and >= current
-                    # This prevents utility meters from being corrupted by 0/reset values
-                    new_energy = float(value) / 1000.0
-                    current_energy = self.coordinator.data.get("energy_total")
-                    if new_energy > 0 and (
-                        current_energy is None or new_energy >= current_energy
-                    ):
-                        self.coordinator.data["energy_total"] = new_energy
-                    else:
-                        _LOGGER.debug(
-                            "Ignoring energy_total update: new=%.3f kWh, current=%s kWh "
-                            "(value must be > 0 and >= current)",
-                            new_energy,
-                            current_energy,
-                        )
-                elif measurand == "Current.Import":
-                    if phase in ("L1", "L1-N"):
-                        self.coordinator.data["current_l1"] = float(value)
-                    elif phase in ("L2", "L2-N"):
-                        self.coordinator.data["current_l2"] = float(value)
-                    elif phase in ("L3", "L3-N"):
-                        self.coordinator.data["current_l3"] = float(value)
-                    else:
-                        reported_total_current = float(value)
-                elif measurand == "Voltage":
-                    if phase == "L1-N":
-                        self.coordinator.data["voltage_l1"] = float(value)
-                    elif phase == "L2-N":
-                        self.coordinator.data["voltage_l2"] = float(value)
-                    elif phase == "L3-N":
-                        self.coordinator.data["voltage_l3"] = float(value)
-                    else:
-                        self.coordinator.data["voltage"] = float(value)
+        # Build the next snapshot and swap it in once fully applied
+        state = self.coordinator.data.copy()
+        reported_total_current = _apply_sampled_values(
+            state, meter_value, self.coordinator.meter_history
+        )
 
         # Recompute the live current so the sensor never sticks (issue #15)
-        self.coordinator.data["current"] = _compute_live_current(
-            self.coordinator.data,
+        state.current = _compute_live_current(
+            state,
             reported_total_current,
-            self.coordinator.data.get("power") or 0,
-            self.coordinator.data.get("voltage") or 0,
-            self.coordinator.data.get("phases_used", 1) or 1,
+            state.power or 0,
+            state.voltage or 0,
+            state.phases_used or 1,
         )
 
-        self.coordinator.async_set_updated_data(self.coordinator.data)
+        self.coordinator.async_set_updated_data(state)
+        self.coordinator.async_note_meter_values(state.power)
+        self.coordinator.liveness.note_traffic()
+        self.coordinator.events.fire(EVENT_METER_VALUES_RECEIVED, power=state.power)
+
+        telemetry = self.coordinator.telemetry_log
+        if telemetry.trace_enabled():
+            _LOGGER.debug("📈 MeterValues samples: %s", _format_samples(meter_value))
+        if telemetry.summary_enabled():
+            _LOGGER.info(
+                "📊 MeterValues for EVSE %s: %d sample(s) in %.1f ms",
+                evse_id,
+                _count_samples(meter_value),
+                (time.perf_counter() - started) * 1000,
+            )
         return call_result.MeterValues()
 
     @on("Heartbeat")
@@ -225,9 +554,10 @@ class WallboxChargePoint(cp):
         """Handle Heartbeat from wallbox."""
         _LOGGER.debug("Heartbeat from %s", self.id)
 
-        # Update connection status
-        self.coordinator.data["connected"] = True
-        self.coordinator.data["last_heartbeat"] = datetime.utcnow()
+        # Update connection status (picked up by the next publish)
+        self.coordinator.data = self.coordinator.data.evolve(
+            connected=True, last_heartbeat=datetime.utcnow()
+        )
 
         return call_result.Heartbeat(current_time=datetime.utcnow().isoformat())
 
@@ -241,17 +571,85 @@ class WallboxChargePoint(cp):
         transaction_info,
         **kwargs,
     ):
-        """Handle TransactionEvent - contains all the sensor data!"""
+        """Handle TransactionEvent - contains all the sensor data!
+
+        Events the wallbox queued while offline are collected and applied in
+        order once the replay burst is over (see replay.py).
+        """
+        self.coordinator.liveness.note_traffic()
+        event = {
+            "event_type": event_type,
+            "timestamp": timestamp,
+            "trigger_reason": trigger_reason,
+            "seq_no": seq_no,
+            "transaction_info": transaction_info,
+            "event_time": dt_util.as_utc(
+                dt_util.parse_datetime(timestamp) or dt_util.utcnow()
+            ),
+            **kwargs,
+        }
+        if kwargs.get("offline"):
+            self._replay_batch.append(event)
+            if self._replay_timer is not None:
+                self._replay_timer.cancel()
+            self._replay_timer = self.coordinator.hass.loop.call_later(
+                REPLAY_SETTLE_TIME, self.async_flush_replay
+            )
+            return call_result.TransactionEvent()
+
+        # Queued events are older than this live one
+        self.async_flush_replay()
+        self._apply_transaction_event(**event)
+        return call_result.TransactionEvent()
+
+    @callback
+    def async_flush_replay(self) -> None:
+        """Apply the queued offline events in order, with a single publish."""
+        if self._replay_timer is not None:
+            self._replay_timer.cancel()
+            self._replay_timer = None
+        if not self._replay_batch:
+            return
+        batch = sorted(self._replay_batch, key=replay_order)
+        self._replay_batch = []
+        applied = sum(
+            self._apply_transaction_event(**event, publish=False) for event in batch
+        )
         _LOGGER.info(
-            "📊 TransactionEvent: type=%s, reason=%s, seq=%s, state=%s",
-            event_type,
-            trigger_reason,
-            seq_no,
-            transaction_info.get("charging_state", "Unknown"),
+            "⏪ Replayed %d offline TransactionEvent(s), %d older than the live state",
+            len(batch),
+            len(batch) - applied,
         )
+        self.coordinator.async_set_updated_data(self.coordinator.data)
+
+    def _apply_transaction_event(
+        self,
+        event_type,
+        timestamp,
+        trigger_reason,
+        seq_no,
+        transaction_info,
+        event_time,
+        publish=True,
+        **kwargs,
+    ) -> bool:
+        """Apply a TransactionEvent; return False if it was older than the state.
+
+        Stale events only feed the meter history and session ledger. With
+        publish=False the new state is stored without notifying entities.
+        """
+        started = time.perf_counter()
+        transaction_id = transaction_info.get("transaction_id")
+        order = self.coordinator.event_order
+        if order.is_stale(event_time, transaction_id, seq_no):
+            self._record_stale_event(
+                event_type, seq_no, transaction_id, event_time, kwargs
+            )
+            return False
+        order.note_applied(event_time, transaction_id, seq_no)
 
         # Extract transaction ID
-        self.current_transaction_id = transaction_info.get("transaction_id")
+        self.current_transaction_id = transaction_id
         self.coordinator.current_transaction_id = self.current_transaction_id
 
         # On a fresh session start, push the configured limit immediately so the
@@ -261,8 +659,12 @@ class WallboxChargePoint(cp):
                 self.coordinator.async_apply_limit_on_transaction_start()
             )
 
+        # Build the next snapshot and swap it in once fully applied
+        state = self.coordinator.data.copy()
+        previous_charging_state = state.charging_state
+
         # Update coordinator data with basic transaction info
-        self.coordinator.data.update(
+        state.update(
             {
                 "transaction_id": self.current_transaction_id,
                 "charging_state": transaction_info.get("charging_state", "Unknown"),
@@ -277,186 +679,155 @@ class WallboxChargePoint(cp):
         # Extract ID token info
         id_token = kwargs.get("id_token", {})
         if id_token:
-            self.coordinator.data["id_token"] = id_token.get("id_token")
-            self.coordinator.data["id_token_type"] = id_token.get("type")
+            state.id_token = id_token.get("id_token")
+            state.id_token_type = id_token.get("type")
 
         # Extract meter values if present
         reported_total_current = None  # non-phased Current.Import seen this event
         meter_value = kwargs.get("meter_value", [])
         if meter_value:
-            _LOGGER.info("📊 Processing %d meter value(s)", len(meter_value))
-            measurands_found = []
-            for mv in meter_value:
-                for sample in mv.get("sampled_value", []):
-                    measurand = sample.get("measurand")
-                    value = sample.get("value")
-                    phase = sample.get("phase")
-                    context = sample.get("context")
-                    location = sample.get("location")
-
-                    measurands_found.append(
-                        f"{measurand}={value}" + (f"[{phase}]" if phase else "")
-                    )
-                    _LOGGER.info(
-                        "  📈 %s = %s (phase=%s, context=%s, location=%s)",
-                        measurand,
-                        value,
-                        phase,
-                        context,
-                        location,
-                    )
-
-                    # Store context and location for all measurands
-                    if context:
-                        self.coordinator.data["context"] = context
-                    if location:
-                        self.coordinator.data["location"] = location
-
-                    # Power measurements
-                    if measurand == "Power.Active.Import":
-                        self.coordinator.data["power"] = float(value)
-                    elif measurand == "Power.Active.Export":
-                        self.coordinator.data["power_active_export"] = float(value)
-                    elif measurand == "Power.Reactive.Import":
-                        self.coordinator.data["power_reactive_import"] = float(value)
-                    elif measurand == "Power.Reactive.Export":
-                        self.coordinator.data["power_reactive_export"] = float(value)
-                    elif measurand == "Power.Offered":
-                        self.coordinator.data["power_offered"] = float(value)
-                    elif measurand == "Power.Factor":
-                        self.coordinator.data["power_factor"] = float(value)
-
-                    # Energy measurements
-                    elif measurand == "Energy.Active.Import.Register":
-                        # Only update energy_total if new value is positive and >= current
-                        # This prevents utility meters from being corrupted by 0/reset values
-                        new_energy = float(value) / 1000.0
-                        current_energy = self.coordinator.data.get("energy_total")
-                        if new_energy > 0 and (
-                            current_energy is None or new_energy >= current_energy
-                        ):
-                            self.coordinator.data["energy_total"] = new_energy
-                        else:
-                            _LOGGER.debug(
-                                "Ignoring energy_total update: new=%.3f kWh, "
-                                "current=%s kWh (value must be > 0 and >= current)",
-                                new_energy,
-                                current_energy,
-                            )
-                    elif measurand == "Energy.Active.Export.Register":
-                        self.coordinator.data["energy_active_export"] = (
-                            float(value) / 1000
-                        )
-                    elif measurand == "Energy.Reactive.Import.Register":
-                        self.coordinator.data["energy_reactive_import"] = (
-                            float(value) / 1000
-                        )
-                    elif measurand == "Energy.Reactive.Export.Register":
-                        self.coordinator.data["energy_reactive_export"] = (
-                            float(value) / 1000
-                        )
-
-                    # Current measurements (per phase)
-                    elif measurand == "Current.Import":
-                        current_value = float(value)
-                        if phase == "L1":
-                            self.coordinator.data["current_l1"] = current_value
-                        elif phase == "L2":
-                            self.coordinator.data["current_l2"] = current_value
-                        elif phase == "L3":
-                            self.coordinator.data["current_l3"] = current_value
-                        else:
-                            # Total or unspecified - prefer this as the live current
-                            reported_total_current = current_value
-
-                        _LOGGER.debug("Current: value=%s, phase=%s", value, phase)
-
-                    # Voltage measurements (per phase)
-                    elif measurand == "Voltage":
-                        if phase == "L1" or phase == "L1-N":
-                            self.coordinator.data["voltage_l1"] = float(value)
-                        elif phase == "L2" or phase == "L2-N":
-                            self.coordinator.data["voltage_l2"] = float(value)
-                        elif phase == "L3" or phase == "L3-N":
-                            self.coordinator.data["voltage_l3"] = float(value)
-                        else:
-                            # Average or unspecified
-                            self.coordinator.data["voltage"] = float(value)
-
-                    # Other measurements
-                    elif measurand == "Frequency":
-                        self.coordinator.data["frequency"] = float(value)
-                    elif measurand == "Temperature":
-                        self.coordinator.data["temperature"] = float(value)
-
-            # Log all measurands found for debugging
-            if measurands_found:
-                _LOGGER.info("📊 All measurands: %s", ", ".join(measurands_found))
-        else:
-            _LOGGER.debug("No meter_value in TransactionEvent")
+            reported_total_current = _apply_sampled_values(
+                state, meter_value, self.coordinator.meter_history
+            )
 
         # Extract other fields
         if "number_of_phases_used" in kwargs:
-            self.coordinator.data["phases_used"] = kwargs["number_of_phases_used"]
+            state.phases_used = kwargs["number_of_phases_used"]
 
         # === POST-PROCESSING: Calculate missing values ===
 
-        power = self.coordinator.data.get("power", 0) or 0
-        voltage = self.coordinator.data.get("voltage", 0) or 0
-        phases = self.coordinator.data.get("phases_used", 1) or 1
+        power = state.power or 0
+        voltage = state.voltage or 0
+        phases = state.phases_used or 1
 
         # If voltage not reported but we have power, use typical EU grid voltage
         if (voltage == 0 or voltage is None) and power > 0:
             # Use typical EU single-phase voltage (230V)
             voltage = 230.0
-            self.coordinator.data["voltage"] = voltage
+            state.voltage = voltage
             _LOGGER.debug("Using typical grid voltage: 230V (not reported by wallbox)")
 
         # Calculate voltage from per-phase if main voltage is missing
         if voltage == 0 or voltage is None:
-            l1 = self.coordinator.data.get("voltage_l1", 0) or 0
-            l2 = self.coordinator.data.get("voltage_l2", 0) or 0
-            l3 = self.coordinator.data.get("voltage_l3", 0) or 0
+            l1 = state.voltage_l1 or 0
+            l2 = state.voltage_l2 or 0
+            l3 = state.voltage_l3 or 0
             if l1 or l2 or l3:
                 active = [x for x in [l1, l2, l3] if x > 0]
                 if active:
                     voltage = sum(active) / len(active)
-                    self.coordinator.data["voltage"] = voltage
+                    state.voltage = voltage
                     _LOGGER.debug("Calculated voltage from phases: %.0fV", voltage)
 
         # === Live charging current (issue #15) ===
         # Recompute on every event so the sensor never sticks at a stale value
         # once power/phase currents change. Priority: directly reported total →
         # per-phase average → derived from power/voltage.
-        self.coordinator.data["current"] = _compute_live_current(
-            self.coordinator.data, reported_total_current, power, voltage, phases
+        state.current = _compute_live_current(
+            state, reported_total_current, power, voltage, phases
         )
 
         # Smart connector status - derive from charging state if not explicitly set
-        if self.coordinator.data.get("connector_status") == "Unknown":
-            charging_state = self.coordinator.data.get("charging_state")
+        if state.connector_status == "Unknown":
+            charging_state = state.charging_state
             if charging_state in [
                 "Charging",
                 "SuspendedEV",
                 "SuspendedEVSE",
                 "EVConnected",
             ]:
-                self.coordinator.data["connector_status"] = "Occupied"
+                state.connector_status = "Occupied"
             elif charging_state == "Available":
-                self.coordinator.data["connector_status"] = "Available"
+                state.connector_status = "Available"
             elif charging_state == "Faulted":
-                self.coordinator.data["connector_status"] = "Faulted"
+                state.connector_status = "Faulted"
 
         # Session ended — clear live readings so the sensors don't stay frozen at
         # the last value once charging stops (issue #15).
         if event_type == "Ended":
             for key in ("current", "power", "current_l1", "current_l2", "current_l3"):
-                self.coordinator.data[key] = 0
+                state[key] = 0
+            # The wallbox drops the session's TxProfiles with it
+            self.coordinator.profiles.end_transaction(self.current_transaction_id)
+
+        # Session history (start/stop register, power curve)
+        if self.coordinator.sessions is not None:
+            finished = self.coordinator.sessions.async_handle_event(
+                event_type,
+                self.current_transaction_id,
+                event_time,
+                state.energy_total,
+                state.power,
+                state.stopped_reason,
+            )
+            if finished is not None:
+                state.last_session_energy = finished.energy
 
-        # Trigger update
-        self.coordinator.async_set_updated_data(self.coordinator.data)
+        # Trigger update (a replay publishes once at the end)
+        if publish:
+            self.coordinator.async_set_updated_data(state)
+        else:
+            self.coordinator.data = state
+        if meter_value:
+            self.coordinator.async_note_meter_values(state.power)
 
-        return call_result.TransactionEvent()
+        # Wake up commands waiting for the wallbox to confirm a change
+        events = self.coordinator.events
+        if event_type == "Started":
+            events.fire(
+                EVENT_TRANSACTION_STARTED, transaction_id=self.current_transaction_id
+            )
+        if state.charging_state != previous_charging_state:
+            events.fire(
+                EVENT_CHARGING_STATE_CHANGED,
+                previous=previous_charging_state,
+                to=state.charging_state,
+            )
+        if meter_value:
+            events.fire(EVENT_METER_VALUES_RECEIVED, power=state.power)
+
+        telemetry = self.coordinator.telemetry_log
+        if meter_value and telemetry.trace_enabled():
+            _LOGGER.debug(
+                "📈 TransactionEvent samples: %s", _format_samples(meter_value)
+            )
+        if telemetry.summary_enabled():
+            _LOGGER.info(
+                "📊 TransactionEvent: type=%s, reason=%s, seq=%s, state=%s, "
+                "%d sample(s) in %.1f ms",
+                event_type,
+                trigger_reason,
+                seq_no,
+                state.charging_state,
+                _count_samples(meter_value),
+                (time.perf_counter() - started) * 1000,
+            )
+        return True
+
+    def _record_stale_event(
+        self,
+        event_type: str,
+        seq_no: int,
+        transaction_id: str | None,
+        event_time: datetime,
+        kwargs: dict[str, Any],
+    ) -> None:
+        """Keep the samples of an outdated event without touching the state."""
+        readings = WallboxState(power=None)
+        meter_value = kwargs.get("meter_value", [])
+        if meter_value:
+            _apply_sampled_values(readings, meter_value, self.coordinator.meter_history)
+        if self.coordinator.sessions is not None:
+            self.coordinator.sessions.async_add_late_sample(
+                transaction_id, event_time, readings.energy_total, readings.power
+            )
+        _LOGGER.info(
+            "⏪ TransactionEvent %s seq=%s of %s is older than the live state, "
+            "kept for history only",
+            event_type,
+            seq_no,
+            transaction_id,
+        )
 
     @on("NotifyReport")
     async def on_notify_report(
@@ -466,6 +837,28 @@ class WallboxChargePoint(cp):
         _LOGGER.debug("Notify Report: request_id=%s, seq=%s", request_id, seq_no)
         return call_result.NotifyReport()
 
+    @on("ReportChargingProfiles")
+    async def on_report_charging_profiles(
+        self,
+        request_id,
+        charging_limit_source,
+        charging_profile,
+        evse_id,
+        tbc=False,
+        **kwargs,
+    ):
+        """Handle ReportChargingProfiles - answer to GetChargingProfiles."""
+        _LOGGER.debug(
+            "Charging profiles on EVSE %s (%s): %s",
+            evse_id,
+            charging_limit_source,
+            [profile.get("id") for profile in charging_profile],
+        )
+        self.coordinator.profiles.add_report(
+            request_id, evse_id, charging_profile, charging_limit_source, tbc
+        )
+        return call_result.ReportChargingProfiles()
+
     @on("SecurityEventNotification")
     async def on_security_event_notification(self, type, timestamp, **kwargs):
         """Handle SecurityEventNotification - wallbox security events like time sync."""
@@ -498,7 +891,7 @@ class WallboxChargePoint(cp):
         )
 
 
-class BMWWallboxCoordinator(DataUpdateCoordinator):
+class BMWWallboxCoordinator(DataUpdateCoordinator[WallboxState]):
     """Class to manage fetching BMW Wallbox data."""
 
     def __init__(
@@ -516,68 +909,367 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
         )
 
         self.config = config
-        self.server = None
+        self.server: OCPPServer | None = None
         self.charge_point: WallboxChargePoint | None = None
         self.current_transaction_id: str | None = None
         self.device_info: dict[str, Any] = {}
 
         # Initialize data
-        self.data: dict[str, Any] = {
-            "connected": False,
-            "charging_state": "Unknown",
-            "power": 0.0,
-            "energy_total": None,  # None until first valid reading (prevents 0 corruption)
-            "current": 0.0,
-            "voltage": 0.0,
-            "transaction_id": None,
-            "connector_status": "Unknown",
-            "evse_id": 1,
-            "connector_id": 1,
-            "phases_used": 1,
-            "last_heartbeat": None,
-            "event_type": None,
-            "trigger_reason": None,
-            "stopped_reason": None,
-            "sequence_number": 0,
-            "last_update": None,
-            "id_token": None,
-            "id_token_type": None,
-            "context": None,
-            "location": None,
-            # Additional power measurements
-            "power_active_export": None,
-            "power_reactive_import": None,
-            "power_reactive_export": None,
-            "power_offered": None,
-            "power_factor": None,
-            # Additional energy measurements
-            "energy_active_export": None,
-            "energy_reactive_import": None,
-            "energy_reactive_export": None,
-            # Per-phase measurements
-            "current_l1": None,
-            "current_l2": None,
-            "current_l3": None,
-            "voltage_l1": None,
-            "voltage_l2": None,
-            "voltage_l3": None,
-            # Other measurements
-            "frequency": None,
-            "temperature": None,
-            # Configurable settings
-            "led_brightness": 46,  # Default from capabilities report
-            "current_limit": config.get(CONF_MAX_CURRENT, DEFAULT_MAX_CURRENT),
+        self.data = WallboxState(
+            current_limit=config.get(CONF_MAX_CURRENT, DEFAULT_MAX_CURRENT),
+        )
+
+        # Copy of the data as last pushed to listeners, so each publish only
+        # wakes the entities whose keys actually changed.
+        self._published: WallboxState | None = None
+        self._published_success: bool | None = None
+        self.dirty_keys: frozenset[str] = frozenset()
+
+        # Bursts (TransactionEvent + MeterValues + StatusNotification within a
+        # few ms) are merged into one publish after this window.
+        self.publish_window: float = (
+            config.get(CONF_PUBLISH_WINDOW, DEFAULT_PUBLISH_WINDOW) / 1000
+        )
+        self._publish_timer: asyncio.TimerHandle | None = None
+
+        # Every sampled value, in raw/1-minute/15-minute rings
+        self.meter_history = MeterHistory()
+
+        # profile ID -> (profile parameters, in-flight SetChargingProfile)
+        self._profiles_in_flight: dict[int, tuple[tuple, asyncio.Future]] = {}
+
+        # Profiles installed on the wallbox (see async_reconcile_profiles)
+        self.profiles = ProfileCache()
+
+        # Commands await the wallbox's confirmation instead of sleeping
+        self.events = WallboxEvents()
+
+        # Recent call outcomes; a reboot needs the wallbox to be unresponsive
+        self.breaker = CircuitBreaker(
+            BREAKER_WINDOW, BREAKER_MIN_CALLS, BREAKER_FAILURE_RATE
+        )
+
+        # Every OCPP call: per-action timeout/retry policy and latency stats
+        self.commands = CommandExecutor(on_attempt=self.breaker.record)
+
+        # 0 A station cap installed by a pause escalation (see escalation.py)
+        self.zero_profile_installed = False
+
+        # Newest TransactionEvent in the live view; older replays skip it
+        self.event_order = TransactionEventOrder()
+
+        # Signs of life and ping round trips of the connection (see watchdog.py)
+        self.liveness = LivenessMonitor()
+
+        # Heartbeat interval the wallbox uses (None = unknown), and whether
+        # it refused OCPPCommCtrlr.HeartbeatInterval on this connection
+        self.heartbeat_interval: int | None = None
+        self._heartbeat_fixed = False
+        self._heartbeat_task: asyncio.Task | None = None
+
+        # Slider moves and automations are coalesced into the latest target
+        self.limit_queue = LimitCommandQueue(
+            self._async_send_current_limit,
+            context=lambda: self.current_transaction_id,
+            on_change=self._async_limit_queue_changed,
+        )
+
+        # Multi-period schedule uploaded by async_set_charging_schedule
+        self.charging_schedule: ChargingProfileType | None = None
+
+        # Optional loop following a grid power sensor (see _async_update_control)
+        self.control: CurrentController | None = None
+
+        self.telemetry_log = TelemetryLog(
+            config.get(CONF_TELEMETRY_LOGGING, DEFAULT_TELEMETRY_LOGGING)
+        )
+
+        # Push-first meter polling: only trigger MeterValues when pushed data
+        # is stale, faster while power ramps, slower while it is stable
+        self._poller = AdaptivePoller(scan_interval)
+
+        # Connect-time bootstrap (see _async_bootstrap)
+        self._bootstrap_task: asyncio.Task | None = None
+        self._bootstrap_for: WallboxChargePoint | None = None
+        self._bootstrap_fallback: asyncio.TimerHandle | None = None
+        self.bootstrap_metrics: dict[str, StepResult] = {}
+
+        # Last known state persisted across restarts (see async_restore_state)
+        self.store: WallboxStore | None = None
+        self.sessions: SessionLedger | None = None
+
+    async def async_restore_state(
+        self, store: WallboxStore, sessions: SessionLedger
+    ) -> None:
+        """Load the state and session history persisted before the last restart.
+
+        Entities then start from the last energy register, transaction and
+        current limit instead of empty values until the wallbox reports again.
+        Everything written to the store afterwards is batched (write-behind).
+        """
+        self.store = store
+        self.sessions = sessions
+        await sessions.async_load()
+        if sessions.last_session is not None:
+            self.data.last_session_energy = sessions.last_session.energy
+        stored = await store.async_load()
+        restored = {
+            key: stored[key] for key in PERSISTED_KEYS if stored.get(key) is not None
         }
+        if "current_limit" in restored:
+            restored["current_limit"] = min(
+                restored["current_limit"],
+                self.config.get(CONF_MAX_CURRENT, DEFAULT_MAX_CURRENT),
+            )
+        if restored:
+            self.data = self.data.evolve(**restored)
+            self.current_transaction_id = self.data.transaction_id
+            _LOGGER.info("💾 Restored state: %s", restored)
+        if stored.get("device_info"):
+            self.device_info = stored["device_info"]
+
+    def _collect_dirty_keys(self) -> frozenset[str]:
+        """Return the data keys that changed since the last publish."""
+        dirty = self.data.changed_keys(self._published)
+        # Keep a private copy in case a caller mutated the live snapshot
+        self._published = self.data.copy()
+        return dirty
+
+    @callback
+    def async_update_state(self, **changes: Any) -> None:
+        """Publish a new snapshot with the given fields changed."""
+        self.async_set_updated_data(self.data.evolve(**changes))
+
+    @callback
+    def async_add_key_listener(
+        self, update_callback: CALLBACK_TYPE, keys: Iterable[str]
+    ) -> Callable[[], None]:
+        """Listen for updates that touch any of the given data keys."""
+        return self.async_add_listener(update_callback, frozenset(keys))
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Publish the current data, coalescing bursts of meter updates.
+
+        Changes to state-transition keys (see _IMMEDIATE_KEYS) and availability
+        changes publish immediately. Anything else is held for publish_window
+        seconds so a burst of OCPP messages results in a single publish.
+        """
+        if (
+            self.publish_window
+            and self.last_update_success == self._published_success
+            and self.data.changed_keys(self._published).isdisjoint(_IMMEDIATE_KEYS)
+        ):
+            if self._publish_timer is None:
+                self._publish_timer = self.hass.loop.call_later(
+                    self.publish_window, self._async_flush_publish
+                )
+            return
+
+        self._async_flush_publish()
+
+    @callback
+    def _async_flush_publish(self) -> None:
+        """Notify only the listeners whose data keys changed.
+
+        Entities register the coordinator.data keys they read as their listener
+        context (a frozenset). Listeners without a key set, and every listener
+        after an availability change, are always notified.
+        """
+        if self._publish_timer is not None:
+            self._publish_timer.cancel()
+            self._publish_timer = None
+
+        self.dirty_keys = dirty = self._collect_dirty_keys()
+        if self.store is not None and not dirty.isdisjoint(PERSISTED_KEYS):
+            self.store.async_update(**{key: self.data[key] for key in PERSISTED_KEYS})
+        availability_changed = self.last_update_success != self._published_success
+        self._published_success = self.last_update_success
+
+        for update_callback, context in list(self._listeners.values()):
+            if (
+                availability_changed
+                or not isinstance(context, frozenset)
+                or not context.isdisjoint(dirty)
+            ):
+                update_callback()
+
+    def requires_reload(self, config: dict[str, Any]) -> bool:
+        """Return True if config changes a setting that needs a reload."""
+        return any(config.get(key) != self.config.get(key) for key in _RELOAD_KEYS)
+
+    async def async_apply_options(self, config: dict[str, Any]) -> None:
+        """Apply changed options in place, keeping the OCPP connection up."""
+        old_config, self.config = self.config, config
+
+        scan_interval = config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        if scan_interval != old_config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL):
+            _LOGGER.info("🔧 Meter polling interval set to %ss", scan_interval)
+            self._poller.set_base_interval(scan_interval)
+            self.update_interval = timedelta(seconds=scan_interval)
+            if self._listeners:
+                self._schedule_refresh()
+
+        self.publish_window = (
+            config.get(CONF_PUBLISH_WINDOW, DEFAULT_PUBLISH_WINDOW) / 1000
+        )
+
+        meter_interval = config.get(CONF_METER_INTERVAL, DEFAULT_METER_INTERVAL)
+        if self.charge_point and meter_interval != old_config.get(
+            CONF_METER_INTERVAL, DEFAULT_METER_INTERVAL
+        ):
+            self.hass.async_create_task(self.async_configure_meter_sampling())
+
+        self.telemetry_log.mode = config.get(
+            CONF_TELEMETRY_LOGGING, DEFAULT_TELEMETRY_LOGGING
+        )
 
-    async def _async_update_data(self) -> dict[str, Any]:
+        if self.server is not None:
+            self._async_update_control()
+
+        if config.get(CONF_RFID_TOKEN) != old_config.get(CONF_RFID_TOKEN):
+            # Read from self.config on the next start, nothing else to do
+            _LOGGER.info("🔧 RFID token updated")
+
+        # A lower maximum must also lower the active limit on the wallbox
+        max_current = config.get(CONF_MAX_CURRENT, DEFAULT_MAX_CURRENT)
+        limit = self.data.current_limit
+        if limit is not None and limit > max_current:
+            _LOGGER.info(
+                "🔧 Maximum current lowered to %sA, reducing limit from %sA",
+                max_current,
+                limit,
+            )
+            if not (
+                self.charge_point and await self.async_set_current_limit(max_current)
+            ):
+                self.async_update_state(current_limit=max_current)
+
+        # Entities derive attributes (e.g. the slider maximum) from the options,
+        # so refresh all of them once
+        self._published = None
+        self._async_flush_publish()
+
+    async def _async_update_data(self) -> WallboxState:
         """Fetch data from the wallbox."""
-        # When there's an active transaction, proactively request fresh meter values.
-        # Some wallboxes don't include meter_value in TransactionEvent messages,
-        # so we can't rely purely on push-based updates.
-        if self.charge_point and self.current_transaction_id:
-            await self.async_trigger_meter_values()
+        # When there's an active transaction, request fresh meter values if the
+        # wallbox hasn't pushed any recently. Some wallboxes don't include
+        # meter_value in TransactionEvent messages, so we can't rely purely on
+        # push-based updates - but a round trip right after a push is wasted.
+        active = bool(self.charge_point and self.current_transaction_id)
+        if active:
+            if self._poller.is_stale():
+                await self.async_trigger_meter_values()
+            else:
+                _LOGGER.debug(
+                    "Meter values pushed %.0fs ago, skipping TriggerMessage",
+                    self._poller.data_age(),
+                )
+
+        # Catch profiles changed behind our back (other tools, wallbox app)
+        if self.charge_point and self.profiles.is_due(PROFILE_RECONCILE_INTERVAL):
+            self.hass.async_create_task(self.async_reconcile_profiles())
+
+        # Picked up by DataUpdateCoordinator when scheduling the next refresh
+        self.update_interval = timedelta(seconds=self._poller.next_interval(active))
         return self.data
 
+    @callback
+    def async_note_meter_values(self, power: float | None) -> None:
+        """Record that the wallbox pushed meter values."""
+        if self._poller.note_push(power):
+            _LOGGER.debug("⚡ Power ramping - polling meter values more often")
+            self._async_poll_sooner()
+
+    @callback
+    def _async_poll_sooner(self) -> None:
+        """Reschedule the next refresh after the poller tightened its interval."""
+        self.update_interval = timedelta(seconds=self._poller.interval)
+        if self._listeners:
+            self._schedule_refresh()
+
+    def _meter_sampling_variables(self) -> list[tuple[str, str, str]]:
+        """Return the variables that make the wallbox push meter values.
+
+        SampledDataCtrlr.TxUpdatedInterval/TxUpdatedMeasurands apply during a
+        session, AlignedDataCtrlr.Interval/Measurands are clock-aligned and also
+        sent while idle. Only measurands the hardware supports are requested.
+        Empty when the meter interval option is 0.
+        """
+        interval = self.config.get(CONF_METER_INTERVAL, DEFAULT_METER_INTERVAL)
+        if not interval:
+            return []
+        return [
+            ("SampledDataCtrlr", "TxUpdatedMeasurands", ",".join(SUPPORTED_MEASURANDS)),
+            ("SampledDataCtrlr", "TxUpdatedInterval", str(interval)),
+            ("AlignedDataCtrlr", "Measurands", ",".join(ALIGNED_DATA_MEASURANDS)),
+            ("AlignedDataCtrlr", "Interval", str(ALIGNED_DATA_INTERVAL)),
+        ]
+
+    async def async_configure_meter_sampling(self) -> dict[str, str]:
+        """Make the wallbox push meter values on its own.
+
+        With pushed telemetry the TriggerMessage fallback in _async_update_data
+        is rarely needed. Returns a dict of "Component.Variable" -> status.
+        """
+        variables = self._meter_sampling_variables()
+        if not self.charge_point or not variables:
+            return {}
+        return await self._async_set_variables(variables)
+
+    def _heartbeat_variables(self) -> list[tuple[str, str, str]]:
+        """Return the HeartbeatInterval change the current traffic calls for.
+
+        Short (the heartbeat interval option) while idle, HEARTBEAT_BUSY_INTERVAL
+        while MeterValues/TransactionEvents prove liveness anyway. Empty if the
+        wallbox already uses it or refused the variable.
+        """
+        if self._heartbeat_fixed:
+            return []
+        idle = self.config.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL)
+        interval = self.liveness.heartbeat_interval(idle, HEARTBEAT_BUSY_INTERVAL)
+        if interval == self.heartbeat_interval:
+            return []
+        return [("OCPPCommCtrlr", "HeartbeatInterval", str(interval))]
+
+    def _note_heartbeat_result(
+        self, variables: list[tuple[str, str, str]], results: dict[str, str]
+    ) -> None:
+        """Remember the heartbeat interval the wallbox accepted."""
+        if not variables:
+            return
+        status = results.get("OCPPCommCtrlr.HeartbeatInterval")
+        if status == "Accepted":
+            self.heartbeat_interval = int(variables[0][2])
+            _LOGGER.info("💓 Heartbeat interval set to %ss", self.heartbeat_interval)
+        elif status is not None:
+            # Not writable on this firmware; don't ask again on every ping
+            self._heartbeat_fixed = True
+
+    async def async_tune_heartbeat(self) -> None:
+        """Adapt the wallbox's heartbeat interval to the current traffic."""
+        variables = self._heartbeat_variables()
+        if not self.charge_point or not variables:
+            return
+        self._note_heartbeat_result(
+            variables, await self._async_set_variables(variables)
+        )
+
+    @callback
+    def _async_schedule_heartbeat_tuning(self) -> None:
+        """Tune the heartbeat in the background, without delaying pings.
+
+        Waits until the interval is known: BootNotification or the connect
+        bootstrap sets it first.
+        """
+        if (
+            self.heartbeat_interval is None
+            or (self._heartbeat_task is not None and not self._heartbeat_task.done())
+            or not self._heartbeat_variables()
+        ):
+            return
+        self._heartbeat_task = asyncio.create_task(self.async_tune_heartbeat())
+
     async def async_configure_wallbox_for_pause_resume(self) -> None:
         """Configure wallbox to allow pause/resume without ending transaction.
 
@@ -586,131 +1278,269 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
         """
         if not self.charge_point:
             return
+        await self._async_set_variables(_PAUSE_RESUME_VARIABLES)
 
-        _LOGGER.info("🔧 Configuring wallbox for pause/resume support...")
+    async def _async_set_variables(
+        self, variables: list[tuple[str, str, str]]
+    ) -> dict[str, str]:
+        """Set (component, variable, value) triples in one SetVariables call.
 
-        try:
-            # Try to set StopTxOnEVSideDisconnect to false
-            set_var = SetVariableDataType(
+        Returns a dict of "Component.Variable" -> attribute status, empty if the
+        call itself failed. Rejections are logged, never raised - several
+        variables are not writable on every firmware.
+        """
+        _LOGGER.info(
+            "🔧 Configuring wallbox: %s",
+            ", ".join(f"{c}.{v}={value}" for c, v, value in variables),
+        )
+        set_variable_data = [
+            SetVariableDataType(
                 attribute_type=AttributeEnumType.actual,
-                attribute_value="false",
-                component=ComponentType(name="TxCtrlr"),
-                variable=VariableType(name="StopTxOnEVSideDisconnect"),
+                attribute_value=value,
+                component=ComponentType(name=component),
+                variable=VariableType(name=variable),
             )
+            for component, variable, value in variables
+        ]
 
-            response = await asyncio.wait_for(
-                self.charge_point.call(call.SetVariables(set_variable_data=[set_var])),
-                timeout=15.0,
+        try:
+            response = await self.async_call(
+                call.SetVariables(set_variable_data=set_variable_data)
             )
-
-            if response.set_variable_result:
-                result = response.set_variable_result[0]
-                status = result.get("attribute_status", "Unknown")
-                _LOGGER.info("StopTxOnEVSideDisconnect configuration: %s", status)
-                if status == "Accepted":
-                    _LOGGER.info("✅ Wallbox configured for pause/resume!")
-                else:
-                    _LOGGER.warning(
-                        "⚠️ Could not configure StopTxOnEVSideDisconnect: %s", status
-                    )
         except Exception as e:
-            _LOGGER.warning("Could not configure StopTxOnEVSideDisconnect: %s", e)
+            _LOGGER.warning("Could not configure wallbox: %s", e)
+            return {}
+
+        results = {
+            f"{result['component']['name']}.{result['variable']['name']}": result.get(
+                "attribute_status", "Unknown"
+            )
+            for result in response.set_variable_result or []
+        }
+        for name, status in results.items():
+            if status == "Accepted":
+                _LOGGER.info("✅ %s configured", name)
+            else:
+                _LOGGER.warning("⚠️ Could not configure %s: %s", name, status)
+        return results
 
     async def async_start_server(self) -> None:
-        """Start the OCPP WebSocket server."""
+        """Register this wallbox on the shared OCPP WebSocket server for its port."""
         rfid = self.config.get("rfid_token", "")
         _LOGGER.info(
-            "Starting OCPP server on port %s (RFID token: %s)",
+            "Starting OCPP server on port %s for %s (RFID token: %s)",
             self.config["port"],
+            self.config[CONF_CHARGE_POINT_ID],
             f"{rfid[:4]}...{rfid[-4:]}"
             if len(rfid) > 8
             else ("configured" if rfid else "not configured"),
         )
 
-        # Setup SSL context - load_cert_chain is blocking, run in executor
-        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
-        await self.hass.async_add_executor_job(
-            ssl_context.load_cert_chain,
+        self.server = await async_get_server(
+            self.hass,
+            self.config["port"],
             self.config["ssl_cert"],
             self.config["ssl_key"],
+            self.config[CONF_CHARGE_POINT_ID],
+            self,
         )
 
-        async def on_connect(websocket):
-            """Handle new wallbox connection."""
-            # Get path from websocket for newer websockets library
-            path = (
-                websocket.request.path
-                if hasattr(websocket, "request")
-                else websocket.path
-            )
-            charge_point_id = path.strip("/")
-            _LOGGER.info("Wallbox connected: %s", charge_point_id)
-
-            self.charge_point = WallboxChargePoint(charge_point_id, websocket, self)
-            self.data["connected"] = True
-            self.async_set_updated_data(self.data)
-
-            # Request meter values on connect to get current energy
-            asyncio.create_task(self._request_meter_values_on_connect())
-
-            # Configure wallbox for pause/resume support
-            asyncio.create_task(self.async_configure_wallbox_for_pause_resume())
-
-            # Recover transaction state (id_token, transaction_id) after HA restart
-            asyncio.create_task(self._recover_transaction_on_connect())
-
-            # Install TxDefaultProfile so the first session starts at the limit
-            asyncio.create_task(self._apply_default_limit_on_connect())
+        _LOGGER.info("OCPP server started successfully")
+        self._async_update_control()
+
+    @callback
+    def _async_update_control(self) -> None:
+        """Start, restart or stop the grid-following current control."""
+        source = self.config.get(CONF_CONTROL_SOURCE) or None
+        grid_target = self.config.get(
+            CONF_CONTROL_GRID_TARGET, DEFAULT_CONTROL_GRID_TARGET
+        )
+        control = self.control
+        if control and (control.source, control.grid_target) == (source, grid_target):
+            return
+        if control is not None:
+            control.async_stop()
+            self.control = None
+        if source is not None:
+            self.control = CurrentController(self.hass, self, source, grid_target)
+            self.control.async_start()
+
+    async def async_handle_connection(self, charge_point_id: str, websocket) -> None:
+        """Handle a new connection from this wallbox."""
+        _LOGGER.info("Wallbox connected: %s", charge_point_id)
+
+        previous = self.charge_point
+        charge_point = WallboxChargePoint(charge_point_id, websocket, self)
+        # A reconnected wallbox may have rebooted and lost its profiles
+        self.limit_queue.invalidate()
+        self.profiles.invalidate()
+        self.breaker.reset()
+        self.liveness.reset()
+        self.heartbeat_interval = None
+        self._heartbeat_fixed = False
+        self.charge_point = charge_point
+        if previous is not None:
+            # The wallbox reconnected before the old socket timed out
+            _LOGGER.info("Closing previous connection for %s", charge_point_id)
+            asyncio.create_task(previous._connection.close())
+        # The phase count is reported again with the next TransactionEvent
+        self.async_update_state(connected=True, phases_used=None)
+
+        # Bootstrap starts on BootNotification / the first Heartbeat or
+        # StatusNotification; fall back to a timer for a silent wallbox
+        self._cancel_bootstrap()
+        self._bootstrap_fallback = self.hass.loop.call_later(
+            BOOTSTRAP_FALLBACK_DELAY, self.async_start_bootstrap, charge_point
+        )
 
+        watchdog = asyncio.create_task(self._async_watch_connection(charge_point))
+        try:
+            await charge_point.start()
+        except ConnectionClosed:
+            _LOGGER.warning("Wallbox disconnected: %s", charge_point_id)
+            # Only the live connection may mark the wallbox offline
+            if self.charge_point is charge_point:
+                self.async_update_state(connected=False)
+        finally:
+            watchdog.cancel()
+            if self._bootstrap_for is charge_point:
+                self._cancel_bootstrap()
+
+    async def _async_watch_connection(self, charge_point: WallboxChargePoint) -> None:
+        """Ping the wallbox and drop the connection once it falls silent.
+
+        Every incoming message and every pong is a sign of life. After
+        liveness_deadline seconds without one, the wallbox is marked offline
+        and the socket closed, which also ends async_handle_connection.
+        """
+        websocket = charge_point._connection
+        while True:
+            deadline = self.config.get(
+                CONF_LIVENESS_DEADLINE, DEFAULT_LIVENESS_DEADLINE
+            )
+            remaining = deadline - self.liveness.silence()
+            if remaining <= 0:
+                break
+            interval = min(LIVENESS_PING_INTERVAL, deadline / 2)
+            started = time.monotonic()
             try:
-                await self.charge_point.start()
-            except websockets.exceptions.ConnectionClosed:
-                _LOGGER.warning("Wallbox disconnected: %s", charge_point_id)
-                self.data["connected"] = False
-                self.async_set_updated_data(self.data)
-
-        # Start server
-        self.server = await websockets.serve(
-            on_connect,
-            "0.0.0.0",
-            self.config["port"],
-            subprotocols=["ocpp2.0.1"],
-            ssl=ssl_context,
-        )
+                pong = await websocket.ping()
+                await asyncio.wait_for(pong, timeout=min(interval, remaining))
+            except TimeoutError:
+                self.liveness.note_lost_ping()
+                continue
+            except ConnectionClosed:
+                return
+            self.liveness.note_pong(time.monotonic() - started)
+            self.async_update_state(
+                link_rtt=round(self.liveness.rtt * 1000, 1),
+                link_jitter=round(self.liveness.jitter * 1000, 1),
+            )
+            self._async_schedule_heartbeat_tuning()
+            await asyncio.sleep(interval)
 
-        _LOGGER.info("OCPP server started successfully")
+        _LOGGER.warning(
+            "💔 No sign of life from %s for %ss, closing the connection",
+            charge_point.id,
+            deadline,
+        )
+        if self.charge_point is charge_point:
+            self.async_update_state(connected=False)
+        await websocket.close()
+
+    @callback
+    def async_start_bootstrap(self, charge_point: WallboxChargePoint) -> None:
+        """Start the connect-time bootstrap once per connection."""
+        if charge_point is not self.charge_point or self._bootstrap_for is charge_point:
+            return
+        self._cancel_bootstrap()
+        self._bootstrap_for = charge_point
+        self._bootstrap_task = self.hass.async_create_task(self._async_bootstrap())
+        self.events.fire(EVENT_CONNECTED)
+
+    @callback
+    def _cancel_bootstrap(self) -> None:
+        """Stop a running bootstrap, e.g. because its socket dropped."""
+        if self._bootstrap_fallback is not None:
+            self._bootstrap_fallback.cancel()
+            self._bootstrap_fallback = None
+        if self._bootstrap_task is not None and not self._bootstrap_task.done():
+            _LOGGER.info("Cancelling connect bootstrap")
+            self._bootstrap_task.cancel()
+        self._bootstrap_task = None
+        self._bootstrap_for = None
+
+    async def _async_bootstrap(self) -> None:
+        """Bring the wallbox and our state up to date after a (re)connect.
+
+        Fresh meter values and transaction recovery go first so entities are
+        valid right away; the configuration batch and the TxDefaultProfile
+        (which must not race the configuration) follow.
+        """
+        if self._bootstrap_fallback is not None:
+            self._bootstrap_fallback.cancel()
+            self._bootstrap_fallback = None
+
+        _LOGGER.info("🚀 Running connect bootstrap...")
+        self.bootstrap_metrics = {}
+        steps = [
+            BootstrapStep("meter_values", self._request_meter_values_on_connect),
+            BootstrapStep("recover_transaction", self._recover_transaction_on_connect),
+            BootstrapStep("configure", self._configure_on_connect),
+            BootstrapStep("profiles", self.async_reconcile_profiles),
+            BootstrapStep(
+                "default_limit",
+                self._apply_default_limit_on_connect,
+                after=("configure", "profiles"),
+            ),
+        ]
+        await async_run_pipeline(steps, self.bootstrap_metrics)
+        _LOGGER.info(
+            "🚀 Connect bootstrap finished: %s",
+            ", ".join(
+                f"{name} {result.status} in {result.duration:.2f}s"
+                for name, result in self.bootstrap_metrics.items()
+            ),
+        )
 
-    async def _request_meter_values_on_connect(self) -> None:
+    async def _configure_on_connect(self) -> bool:
+        """Send every connect-time variable in one SetVariables call."""
+        heartbeat = self._heartbeat_variables()
+        variables = [
+            *_PAUSE_RESUME_VARIABLES,
+            *self._meter_sampling_variables(),
+            *heartbeat,
+        ]
+        results = await self._async_set_variables(variables)
+        self._note_heartbeat_result(heartbeat, results)
+        return bool(results)
+
+    async def _request_meter_values_on_connect(self) -> bool:
         """Request meter values after wallbox connects."""
-        # Wait for connection to stabilize
-        await asyncio.sleep(3)
-        if self.charge_point:
-            _LOGGER.info("Requesting meter values on connect...")
-            await self.async_trigger_meter_values()
+        if not self.charge_point:
+            return False
+        _LOGGER.info("Requesting meter values on connect...")
+        return await self.async_trigger_meter_values()
 
-    async def _recover_transaction_on_connect(self) -> None:
+    async def _recover_transaction_on_connect(self) -> bool:
         """Recover active transaction state after wallbox connects.
 
         After HA restart, current_transaction_id and id_token reset to None.
         Trigger a TransactionEvent so the wallbox reports any ongoing transaction.
         """
-        await asyncio.sleep(5)
         if not self.charge_point:
-            return
+            return False
 
         _LOGGER.info("🔄 Recovering transaction state on connect...")
         try:
             from ocpp.v201 import call as ocpp_call
             from ocpp.v201.enums import MessageTriggerEnumType
 
-            response = await asyncio.wait_for(
-                self.charge_point.call(
-                    ocpp_call.TriggerMessage(
-                        requested_message=MessageTriggerEnumType.transaction_event,
-                        evse={"id": 1, "connector_id": 1},
-                    )
-                ),
-                timeout=15.0,
+            response = await self.async_call(
+                ocpp_call.TriggerMessage(
+                    requested_message=MessageTriggerEnumType.transaction_event,
+                    evse={"id": 1, "connector_id": 1},
+                )
             )
 
             _LOGGER.info("Transaction recovery trigger response: %s", response.status)
@@ -722,19 +1552,52 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
                 _LOGGER.info(
                     "No active transaction to recover (response: %s)", response.status
                 )
+                # A transaction restored from before the restart has ended
+                if self.current_transaction_id is not None:
+                    self.current_transaction_id = None
+                    self.charge_point.current_transaction_id = None
+                    self.async_update_state(transaction_id=None)
+            return True
 
         except TimeoutError:
             _LOGGER.warning("Transaction recovery trigger timed out")
         except Exception as err:
             _LOGGER.warning("Could not recover transaction state: %s", err)
+        return False
 
     async def async_stop_server(self) -> None:
         """Stop the OCPP server."""
+        self._cancel_bootstrap()
+        self.limit_queue.cancel()
+        if self.control is not None:
+            self.control.async_stop()
+            self.control = None
+        if self._publish_timer is not None:
+            self._async_flush_publish()
+        if self.store is not None:
+            await self.store.async_flush()
+        if self.sessions is not None:
+            await self.sessions.async_flush()
         if self.server:
-            self.server.close()
-            await self.server.wait_closed()
+            await async_release_server(
+                self.hass, self.config["port"], self.config[CONF_CHARGE_POINT_ID]
+            )
+            self.server = None
+            # Other wallboxes may still be on the shared listener
+            if self.charge_point:
+                await self.charge_point._connection.close()
             _LOGGER.info("OCPP server stopped")
 
+    async def async_call(self, request: Any) -> Any:
+        """Send an OCPP call to the connected wallbox.
+
+        Uses the action's timeout and retry policy (see commands.py).
+
+        Raises:
+            TimeoutError: No response, after retries for idempotent actions
+        """
+        return await self.commands.async_call(self.charge_point, request)
+
     async def async_start_charging(
         self, status_callback=None, allow_nuke: bool = True
     ) -> dict:
@@ -743,14 +1606,18 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
         If there's an existing transaction, uses SetChargingProfile to resume.
         If no transaction, uses RequestStartTransaction to create one.
 
-        NUKE OPTION: If all attempts fail and allow_nuke=True, reboots the wallbox
-        as a last resort (~60 seconds downtime).
+        ESCALATION: If the start fails and allow_nuke=True, climbs the
+        escalation ladder (retry, clear profiles, end a stuck transaction).
+        The wallbox is only rebooted (~60 seconds downtime) if it stopped
+        answering.
 
         Returns a dict with:
             - success: bool
             - message: str (user-friendly message)
             - action: str (what was done)
         """
+        # Profiles change outside the limit queue
+        self.limit_queue.invalidate()
         _LOGGER.info("🟢 START CHARGING REQUESTED")
 
         result = {
@@ -804,7 +1671,12 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
         if status_callback:
             await status_callback("Starting charging session...")
 
+        # A 0 A station cap from a pause escalation would block the session
+        await self._async_remove_zero_profile()
+
         _LOGGER.info("📤 Sending RequestStartTransaction...")
+        # TransactionEvent(Started) may arrive before the response
+        started = self.events.expect(EVENT_TRANSACTION_STARTED)
         try:
             # Use configured RFID token if available, otherwise no authorization
             rfid_token = self.config.get("rfid_token", "")
@@ -821,15 +1693,12 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
                     type=IdTokenEnumType.no_authorization,
                 )
 
-            response = await asyncio.wait_for(
-                self.charge_point.call(
-                    call.RequestStartTransaction(
-                        id_token=id_token,
-                        remote_start_id=int(datetime.utcnow().timestamp()),
-                        evse_id=1,
-                    )
-                ),
-                timeout=15.0,
+            response = await self.async_call(
+                call.RequestStartTransaction(
+                    id_token=id_token,
+                    remote_start_id=int(datetime.utcnow().timestamp()),
+                    evse_id=1,
+                )
             )
 
             _LOGGER.info("RequestStartTransaction response: %s", response.status)
@@ -838,11 +1707,19 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
                 # Store the transaction ID from response if available
                 if hasattr(response, "transaction_id") and response.transaction_id:
                     self.current_transaction_id = response.transaction_id
-                    self.data["transaction_id"] = response.transaction_id
+                    self.async_update_state(transaction_id=response.transaction_id)
                     _LOGGER.info("New transaction ID: %s", response.transaction_id)
-
-                # Wait for transaction to establish, then send SetChargingProfile to enable current
-                await asyncio.sleep(2)
+                else:
+                    # The ID comes with TransactionEvent(Started)
+                    try:
+                        await asyncio.wait_for(
+                            started, timeout=TRANSACTION_START_TIMEOUT
+                        )
+                    except TimeoutError:
+                        _LOGGER.warning(
+                            "No TransactionEvent(Started) within %ss",
+                            TRANSACTION_START_TIMEOUT,
+                        )
 
                 max_current = self.data.get(
                     "current_limit",
@@ -881,22 +1758,17 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
                             charging_schedule=[schedule],
                         )
 
-                        profile_response = await asyncio.wait_for(
-                            self.charge_point.call(
-                                call.SetChargingProfile(
-                                    evse_id=1, charging_profile=profile
-                                )
-                            ),
-                            timeout=15.0,
+                        profile_response = await self.async_call(
+                            call.SetChargingProfile(evse_id=1, charging_profile=profile)
                         )
                         _LOGGER.info(
                             "SetChargingProfile response: %s", profile_response.status
                         )
+                        if profile_response.status == "Accepted":
+                            self.profiles.record(1, profile)
 
-                        # Wait for charging to ramp up and request meter values
-                        _LOGGER.info("⏳ Waiting 5 seconds for charging to ramp up...")
-                        await asyncio.sleep(5)
-                        await self.async_trigger_meter_values()
+                        # Refresh the readings once the car draws current
+                        asyncio.create_task(self._async_refresh_when_charging())
 
                 except Exception as e:
                     _LOGGER.warning(
@@ -912,56 +1784,58 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
                 )
                 result["action"] = "rejected"
 
-                # 💣 NUKE OPTION: If everything failed and nuke is allowed, reboot wallbox
-                if allow_nuke:
-                    _LOGGER.warning(
-                        "💣 NUKE OPTION: All start methods failed, rebooting wallbox..."
-                    )
-                    if status_callback:
-                        await status_callback(
-                            "💣 NUKE: Rebooting wallbox (last resort)..."
-                        )
+        except TimeoutError:
+            result["message"] = "Command timed out - wallbox not responding"
+            _LOGGER.error("RequestStartTransaction timed out!")
+        except Exception as err:
+            result["message"] = f"Error: {err!s}"
+            _LOGGER.error("Failed to start charging: %s", err)
+        finally:
+            started.cancel()
 
-                    nuke_result = await self.async_reset_wallbox(status_callback)
-                    if nuke_result["success"]:
-                        result["message"] = (
-                            "💣 Wallbox rebooting (~60s). Charging will auto-start."
-                        )
-                        result["action"] = "nuked"
-                        result["success"] = (
-                            True  # Consider it success since reboot works
-                        )
-                    else:
-                        result["message"] = (
-                            f"All methods failed. Nuke also failed: {nuke_result['message']}"
-                        )
+        # 🪜 Escalate step by step; reboot only if the wallbox is unresponsive
+        if not result["success"] and allow_nuke:
+            return await self._async_escalate_start(result, status_callback)
 
-            return result
+        return result
+
+    async def _async_escalate_start(self, failed: dict, status_callback=None) -> dict:
+        """Start charging after a failed start, one rung at a time.
+
+        Retry, clear all profiles and retry, end a stuck transaction and
+        retry - and only reboot if the wallbox stopped answering.
+        """
+        outcome = failed
+
+        async def retry() -> bool:
+            nonlocal outcome
+            outcome = await self.async_start_charging(status_callback, allow_nuke=False)
+            return outcome["success"]
+
+        async def clear_profiles() -> bool:
+            return await self._async_clear_all_profiles() and await retry()
 
-        except TimeoutError:
-            result["message"] = "Command timed out - wallbox not responding"
-            _LOGGER.error("RequestStartTransaction timed out!")
-        except Exception as err:
-            result["message"] = f"Error: {err!s}"
-            _LOGGER.error("Failed to start charging: %s", err)
+        async def stop_transaction() -> bool:
+            return await self._async_request_stop_transaction() and await retry()
 
-        # 💣 NUKE OPTION: If we got here due to exception and nuke is allowed
-        if not result["success"] and allow_nuke:
-            _LOGGER.warning(
-                "💣 NUKE OPTION: Start failed with error, rebooting wallbox..."
-            )
-            if status_callback:
-                await status_callback("💣 NUKE: Rebooting wallbox (last resort)...")
+        async def reset() -> bool:
+            return await self._async_reset_rung(status_callback)
 
-            nuke_result = await self.async_reset_wallbox(status_callback)
-            if nuke_result["success"]:
-                result["message"] = (
-                    "💣 Wallbox rebooting (~60s). Charging will auto-start."
-                )
-                result["action"] = "nuked"
-                result["success"] = True
+        rungs = [
+            Rung(RUNG_RETRY, retry),
+            Rung(RUNG_CLEAR_PROFILES, clear_profiles),
+            Rung(RUNG_STOP_TRANSACTION, stop_transaction),
+            Rung(RUNG_RESET, reset),
+        ]
+        rung = await async_escalate(rungs, self._escalation_steps(), self.breaker)
 
-        return result
+        if rung == RUNG_RESET:
+            return {
+                "success": True,  # Consider it success since reboot works
+                "message": "💣 Wallbox rebooting (~60s). Charging will auto-start.",
+                "action": "nuked",
+            }
+        return outcome
 
     async def async_reset_wallbox(self, status_callback=None) -> dict:
         """Reset the wallbox to clear stuck transaction state.
@@ -971,6 +1845,9 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
         2. Reboots the wallbox (~60 seconds)
         3. After reboot, a new transaction auto-starts if cable is plugged in
         """
+        # Profiles change outside the limit queue
+        self.limit_queue.invalidate()
+        self.profiles.invalidate()
         _LOGGER.info("🔄 RESET WALLBOX REQUESTED")
 
         result = {
@@ -987,10 +1864,7 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
             await status_callback("Sending reset command to wallbox...")
 
         try:
-            response = await asyncio.wait_for(
-                self.charge_point.call(call.Reset(type=ResetEnumType.immediate)),
-                timeout=15.0,
-            )
+            response = await self.async_call(call.Reset(type=ResetEnumType.immediate))
 
             _LOGGER.info("Reset response: %s", response.status)
 
@@ -1001,10 +1875,8 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
                 )
 
                 # Mark as disconnected since it will reboot
-                self.data["connected"] = False
                 self.current_transaction_id = None
-                self.data["transaction_id"] = None
-                self.async_set_updated_data(self.data)
+                self.async_update_state(connected=False, transaction_id=None)
             else:
                 result["message"] = f"Reset rejected: {response.status}"
 
@@ -1039,41 +1911,37 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
         if status_callback:
             await status_callback("Transaction stuck - resetting wallbox...")
 
-        reset_result = await self.async_reset_wallbox(status_callback)
-
-        if not reset_result["success"]:
-            return reset_result
-
-        # Wait for reboot
-        if status_callback:
-            await status_callback("Wallbox rebooting - please wait ~60 seconds...")
-
-        _LOGGER.info("⏳ Waiting for wallbox to reboot...")
-
-        # Wait in chunks so we can update status
-        for i in range(12):  # 12 x 5 = 60 seconds
-            await asyncio.sleep(5)
-            remaining = 60 - (i + 1) * 5
-            if status_callback and remaining > 0:
-                await status_callback(f"Wallbox rebooting - {remaining}s remaining...")
-
-        # Wait for reconnection
-        if status_callback:
-            await status_callback("Waiting for wallbox to reconnect...")
-
-        # Wait up to 30 more seconds for reconnection
-        for i in range(6):
-            await asyncio.sleep(5)
-            if self.data.get("connected") and self.current_transaction_id:
-                _LOGGER.info("✅ Wallbox reconnected with new transaction")
-                break
+        # The rebooted wallbox reconnects as a new connection
+        reconnected = self.events.expect(EVENT_CONNECTED)
+        try:
+            reset_result = await self.async_reset_wallbox(status_callback)
+
+            if not reset_result["success"]:
+                return reset_result
+
+            _LOGGER.info("⏳ Waiting for wallbox to reboot and reconnect...")
+
+            # Wait in chunks so we can update status
+            deadline = time.monotonic() + RECONNECT_TIMEOUT
+            while not reconnected.done():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if status_callback:
+                    await status_callback(
+                        f"Wallbox rebooting - up to {remaining:.0f}s remaining..."
+                    )
+                await asyncio.wait({reconnected}, timeout=min(5, remaining))
+        finally:
+            reconnected.cancel()
 
-        if not self.data.get("connected"):
+        if reconnected.cancelled() or not self.data.get("connected"):
             return {
                 "success": False,
                 "message": "Wallbox did not reconnect after reset. Check the wallbox.",
                 "action": "reconnect_failed",
             }
+        _LOGGER.info("✅ Wallbox reconnected after reset")
 
         # Now try to start again
         if status_callback:
@@ -1081,6 +1949,24 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
 
         return await self.async_start_charging(status_callback)
 
+    async def _async_refresh_when_charging(self) -> None:
+        """Request meter values as soon as the car draws current.
+
+        Replaces a fixed wait for the ramp-up: the wallbox reports the change
+        to Charging in a TransactionEvent.
+        """
+        if self.data.get("charging_state") != "Charging":
+            try:
+                await self.events.wait(
+                    EVENT_CHARGING_STATE_CHANGED, CHARGING_START_TIMEOUT, to="Charging"
+                )
+            except TimeoutError:
+                _LOGGER.debug(
+                    "Not charging after %ss, requesting meter values anyway",
+                    CHARGING_START_TIMEOUT,
+                )
+        await self.async_trigger_meter_values()
+
     async def async_refresh_transaction_id(self) -> str | None:
         """Query the wallbox to get/verify the current transaction ID.
 
@@ -1100,13 +1986,8 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
         )
 
         try:
-            response = await asyncio.wait_for(
-                self.charge_point.call(
-                    call.GetTransactionStatus(
-                        transaction_id=self.current_transaction_id
-                    )
-                ),
-                timeout=10.0,
+            response = await self.async_call(
+                call.GetTransactionStatus(transaction_id=self.current_transaction_id)
             )
 
             _LOGGER.info(
@@ -1147,9 +2028,13 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
         This pauses charging without ending the transaction!
         Much better than RequestStopTransaction which creates stuck states.
 
-        NUKE OPTION: If pause fails and allow_nuke=True, reboots the wallbox
-        as a last resort to stop charging (~60 seconds downtime).
+        ESCALATION: If the pause fails and allow_nuke=True, climbs the
+        escalation ladder (retry, clear profiles, 0 A station cap, end the
+        transaction). The wallbox is only rebooted (~60 seconds downtime) if
+        it stopped answering.
         """
+        # Profiles change outside the limit queue
+        self.limit_queue.invalidate()
         _LOGGER.info("⏸️ PAUSE CHARGING - SetChargingProfile(0A)")
 
         result = {"success": False, "message": "", "action": "failed"}
@@ -1187,45 +2072,18 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
         )
 
         try:
-            # First clear ALL existing profiles to ensure clean state (like resume does)
-            _LOGGER.info("Clearing ALL charging profiles first...")
-            try:
-                clear_response = await asyncio.wait_for(
-                    self.charge_point.call(call.ClearChargingProfile()), timeout=10.0
-                )
-                _LOGGER.info("ClearChargingProfile response: %s", clear_response.status)
-            except Exception as e:
-                _LOGGER.debug("ClearChargingProfile failed (OK to ignore): %s", e)
-
-            start_time = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
-
-            schedule = ChargingScheduleType(
-                id=1,
-                start_schedule=start_time,
-                charging_rate_unit=ChargingRateUnitEnumType.amps,
-                charging_schedule_period=[
-                    ChargingSchedulePeriodType(start_period=0, limit=0.0)
-                ],
-            )
+            profile = self._pause_profile()
 
-            # Use stackLevel=0 for highest priority (same as resume)
-            profile = ChargingProfileType(
-                id=999,
-                stack_level=0,
-                charging_profile_purpose=ChargingProfilePurposeEnumType.tx_profile,
-                charging_profile_kind=ChargingProfileKindEnumType.absolute,
-                transaction_id=self.current_transaction_id,
-                charging_schedule=[schedule],
-            )
+            # Only clear what would reject or override the pause profile
+            await self._async_clear_conflicting_profiles(1, profile)
 
-            response = await asyncio.wait_for(
-                self.charge_point.call(
-                    call.SetChargingProfile(evse_id=1, charging_profile=profile)
-                ),
-                timeout=15.0,
+            response = await self.async_call(
+                call.SetChargingProfile(evse_id=1, charging_profile=profile)
             )
 
             _LOGGER.info("Pause response: %s", response.status)
+            if response.status == "Accepted":
+                self.profiles.record(1, profile)
 
             # Log additional status info if available
             if hasattr(response, "status_info") and response.status_info:
@@ -1239,79 +2097,166 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
                 result["success"] = True
                 result["message"] = "Charging paused"
                 result["action"] = "paused"
-            else:
-                reason = ""
-                if hasattr(response, "status_info") and response.status_info:
-                    reason = f" ({response.status_info.get('reason_code', '')})"
-
-                # 💣 NUKE OPTION: If pause rejected and nuke is allowed, reboot wallbox
-                if allow_nuke:
-                    _LOGGER.warning(
-                        "💣 NUKE OPTION: Pause rejected (%s), rebooting wallbox to force stop!",
-                        response.status,
-                    )
-                    nuke_result = await self.async_reset_wallbox()
-                    if nuke_result["success"]:
-                        result["success"] = True
-                        result["message"] = (
-                            "💣 Wallbox rebooting (~60s) to force stop charging"
-                        )
-                        result["action"] = "nuked"
-                    else:
-                        result["message"] = (
-                            f"Pause rejected and reboot failed: {nuke_result['message']}"
-                        )
-                        result["action"] = "nuke_failed"
-                else:
-                    result["message"] = f"Pause rejected: {response.status}{reason}"
+                return result
 
-            return result
+            reason = ""
+            if hasattr(response, "status_info") and response.status_info:
+                reason = f" ({response.status_info.get('reason_code', '')})"
+            result["message"] = f"Pause rejected: {response.status}{reason}"
 
         except TimeoutError:
             _LOGGER.error("Pause command timed out!")
-            # 💣 NUKE OPTION: If timeout and nuke is allowed, reboot wallbox
-            if allow_nuke:
-                _LOGGER.warning(
-                    "💣 NUKE OPTION: Pause timed out, rebooting wallbox to force stop!"
-                )
-                nuke_result = await self.async_reset_wallbox()
-                if nuke_result["success"]:
-                    result["success"] = True
-                    result["message"] = (
-                        "💣 Wallbox rebooting (~60s) to force stop charging"
-                    )
-                    result["action"] = "nuked"
-                else:
-                    result["message"] = (
-                        f"Pause timed out and reboot failed: {nuke_result['message']}"
-                    )
-                    result["action"] = "nuke_failed"
-            else:
-                result["message"] = "Command timed out"
-            return result
+            result["message"] = "Command timed out"
 
         except Exception as err:
             _LOGGER.error("Failed to pause: %s", err)
-            # 💣 NUKE OPTION: If exception and nuke is allowed, reboot wallbox
-            if allow_nuke:
-                _LOGGER.warning(
-                    "💣 NUKE OPTION: Pause failed with error, rebooting wallbox to force stop!"
+            result["message"] = f"Error: {err!s}"
+
+        # 🪜 Escalate step by step; reboot only if the wallbox is unresponsive
+        if allow_nuke:
+            return await self._async_escalate_pause(result["message"])
+        return result
+
+    def _pause_profile(self) -> ChargingProfileType:
+        """Build the 0 A TxProfile that pauses the current transaction."""
+        start_time = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        schedule = ChargingScheduleType(
+            id=1,
+            start_schedule=start_time,
+            charging_rate_unit=ChargingRateUnitEnumType.amps,
+            charging_schedule_period=[
+                ChargingSchedulePeriodType(start_period=0, limit=0.0)
+            ],
+        )
+
+        # Use stackLevel=0 for highest priority (same as resume)
+        return ChargingProfileType(
+            id=999,
+            stack_level=0,
+            charging_profile_purpose=ChargingProfilePurposeEnumType.tx_profile,
+            charging_profile_kind=ChargingProfileKindEnumType.absolute,
+            transaction_id=self.current_transaction_id,
+            charging_schedule=[schedule],
+        )
+
+    def _escalation_steps(self) -> list[str]:
+        """Return the enabled rungs of the escalation ladder."""
+        return self.config.get(CONF_ESCALATION_STEPS, list(ESCALATION_STEPS))
+
+    async def _async_escalate_pause(self, failure: str) -> dict:
+        """Stop charging after a failed pause, one rung at a time.
+
+        Retry the pause, clear all profiles and retry, cap the station at
+        0 A, end the transaction - and only reboot if the wallbox stopped
+        answering (see escalation.py).
+        """
+
+        async def retry() -> bool:
+            profile = self._pause_profile()
+            response = await self.async_call(
+                call.SetChargingProfile(evse_id=1, charging_profile=profile)
+            )
+            if response.status != "Accepted":
+                return False
+            self.profiles.record(1, profile)
+            return True
+
+        async def clear_profiles() -> bool:
+            return await self._async_clear_all_profiles() and await retry()
+
+        rungs = [
+            Rung(RUNG_RETRY, retry),
+            Rung(RUNG_CLEAR_PROFILES, clear_profiles),
+            Rung(RUNG_ZERO_PROFILE, self._async_install_zero_profile),
+            Rung(RUNG_STOP_TRANSACTION, self._async_request_stop_transaction),
+            Rung(RUNG_RESET, self._async_reset_rung),
+        ]
+        rung = await async_escalate(rungs, self._escalation_steps(), self.breaker)
+
+        if rung is None:
+            return {
+                "success": False,
+                "message": f"{failure} - escalation didn't help",
+                "action": "failed",
+            }
+        if rung == RUNG_RESET:
+            return {
+                "success": True,
+                "message": "💣 Wallbox rebooting (~60s) to force stop charging",
+                "action": "nuked",
+            }
+        if rung == RUNG_STOP_TRANSACTION:
+            return {
+                "success": True,
+                "message": "Charging stopped (session ended)",
+                "action": "stopped",
+            }
+        return {
+            "success": True,
+            "message": f"Charging paused ({rung.replace('_', ' ')})",
+            "action": "paused",
+        }
+
+    async def _async_install_zero_profile(self) -> bool:
+        """Cap the whole station at 0 A, whatever transaction is running.
+
+        Removed again by the next start or resume.
+        """
+        profile = ChargingProfileType(
+            id=ZERO_PROFILE_ID,
+            stack_level=1,  # above the tariff schedule
+            charging_profile_purpose=ChargingProfilePurposeEnumType.charging_station_max_profile,
+            charging_profile_kind=ChargingProfileKindEnumType.absolute,
+            charging_schedule=[
+                ChargingScheduleType(
+                    id=1,
+                    start_schedule=datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    charging_rate_unit=ChargingRateUnitEnumType.amps,
+                    charging_schedule_period=[
+                        ChargingSchedulePeriodType(start_period=0, limit=0.0)
+                    ],
                 )
-                nuke_result = await self.async_reset_wallbox()
-                if nuke_result["success"]:
-                    result["success"] = True
-                    result["message"] = (
-                        "💣 Wallbox rebooting (~60s) to force stop charging"
-                    )
-                    result["action"] = "nuked"
-                else:
-                    result["message"] = (
-                        f"Pause error and reboot failed: {nuke_result['message']}"
-                    )
-                    result["action"] = "nuke_failed"
-            else:
-                result["message"] = f"Error: {err!s}"
-            return result
+            ],
+        )
+        response = await self.async_call(
+            call.SetChargingProfile(evse_id=0, charging_profile=profile)
+        )
+        if response.status != "Accepted":
+            return False
+        self.profiles.record(0, profile)
+        self.zero_profile_installed = True
+        return True
+
+    async def _async_remove_zero_profile(self) -> None:
+        """Lift the 0 A station cap left by a pause escalation."""
+        if not self.zero_profile_installed:
+            return
+        try:
+            response = await self.async_call(
+                call.ClearChargingProfile(charging_profile_id=ZERO_PROFILE_ID)
+            )
+        except Exception as err:
+            _LOGGER.warning("Failed to remove the 0 A station cap: %s", err)
+            return
+        if response.status in ("Accepted", "Unknown"):
+            self.profiles.remove(ZERO_PROFILE_ID)
+            self.zero_profile_installed = False
+
+    async def _async_request_stop_transaction(self) -> bool:
+        """End the current transaction (RequestStopTransaction)."""
+        if not self.current_transaction_id:
+            return False
+        response = await self.async_call(
+            call.RequestStopTransaction(transaction_id=self.current_transaction_id)
+        )
+        return response.status == RequestStartStopStatusEnumType.accepted
+
+    async def _async_reset_rung(self, status_callback=None) -> bool:
+        """Reboot the wallbox, the last rung of the ladder."""
+        if status_callback:
+            await status_callback("💣 NUKE: Rebooting wallbox (last resort)...")
+        return (await self.async_reset_wallbox(status_callback))["success"]
 
     async def async_resume_charging(self, current_limit: float | None = None) -> dict:
         """Resume charging via SetChargingProfile - EVCC-style.
@@ -1319,6 +2264,8 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
         Args:
             current_limit: Current limit in Amps. If None, uses the tracked user preference.
         """
+        # Profiles change outside the limit queue
+        self.limit_queue.invalidate()
         # Use tracked user preference if no limit specified
         if current_limit is None:
             current_limit = self.data.get(
@@ -1342,20 +2289,10 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
 
         _LOGGER.info("Using transaction_id: %s", self.current_transaction_id)
 
-        try:
-            # First clear ALL existing profiles to ensure clean state
-            _LOGGER.info("Clearing ALL charging profiles first...")
-            try:
-                # Clear without specifying ID = clear all profiles
-                clear_response = await asyncio.wait_for(
-                    self.charge_point.call(call.ClearChargingProfile()), timeout=10.0
-                )
-                _LOGGER.info(
-                    "ClearChargingProfile (all) response: %s", clear_response.status
-                )
-            except Exception as e:
-                _LOGGER.debug("ClearChargingProfile failed (OK to ignore): %s", e)
+        # A 0 A station cap from a pause escalation would override the resume
+        await self._async_remove_zero_profile()
 
+        try:
             start_time = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
 
             schedule = ChargingScheduleType(
@@ -1379,14 +2316,16 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
                 charging_schedule=[schedule],
             )
 
-            response = await asyncio.wait_for(
-                self.charge_point.call(
-                    call.SetChargingProfile(evse_id=1, charging_profile=profile)
-                ),
-                timeout=15.0,
+            # Only clear what would reject or override the resume profile
+            await self._async_clear_conflicting_profiles(1, profile)
+
+            response = await self.async_call(
+                call.SetChargingProfile(evse_id=1, charging_profile=profile)
             )
 
             _LOGGER.info("Resume response: %s", response.status)
+            if response.status == "Accepted":
+                self.profiles.record(1, profile)
 
             # Log additional status info if available
             if hasattr(response, "status_info") and response.status_info:
@@ -1400,12 +2339,8 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
                 result["success"] = True
                 result["message"] = f"Charging resumed at {current_limit}A"
 
-                # Trigger meter values refresh after 3 seconds so power reading updates
-                async def delayed_refresh():
-                    await asyncio.sleep(3)
-                    await self.async_trigger_meter_values()
-
-                asyncio.create_task(delayed_refresh())
+                # Refresh the readings once the car draws current again
+                asyncio.create_task(self._async_refresh_when_charging())
             else:
                 reason = ""
                 if hasattr(response, "status_info") and response.status_info:
@@ -1429,8 +2364,7 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
         Much better than RequestStopTransaction which puts the charger in Finishing
         state and prevents restart.
 
-        NUKE OPTION: If pause fails and allow_nuke=True, reboots the wallbox
-        as a last resort to stop charging (~60 seconds downtime).
+        ESCALATION: See async_pause_charging.
 
         Returns a dict with:
             - success: bool
@@ -1449,11 +2383,51 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
         stack_level: int,
         transaction_id: str | None = None,
     ) -> bool:
-        """Build and send a SetChargingProfile, returning True if accepted.
+        """Send a SetChargingProfile, returning True if accepted.
 
         Shared by the TxDefaultProfile (applies from the start of every session,
         no transaction needed) and TxProfile (active session) code paths.
+        Single-flight per profile ID: a caller asking for the same profile
+        that is already in flight (e.g. the connect bootstrap and the limit
+        queue both installing profile 998) awaits that request instead of
+        sending a duplicate.
         """
+        key = (float(limit), purpose, stack_level, transaction_id)
+        inflight = self._profiles_in_flight.get(profile_id)
+        if inflight is not None and inflight[0] == key:
+            _LOGGER.debug(
+                "Profile %s (%sA) already in flight, sharing it", profile_id, limit
+            )
+            return await asyncio.shield(inflight[1])
+
+        task = asyncio.ensure_future(
+            self._async_call_set_charging_profile(
+                limit,
+                purpose=purpose,
+                profile_id=profile_id,
+                stack_level=stack_level,
+                transaction_id=transaction_id,
+            )
+        )
+        self._profiles_in_flight[profile_id] = (key, task)
+
+        def _done(_task: asyncio.Future) -> None:
+            if self._profiles_in_flight.get(profile_id, (None, None))[1] is task:
+                del self._profiles_in_flight[profile_id]
+
+        task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    async def _async_call_set_charging_profile(
+        self,
+        limit: float,
+        *,
+        purpose: ChargingProfilePurposeEnumType,
+        profile_id: int,
+        stack_level: int,
+        transaction_id: str | None = None,
+    ) -> bool:
+        """Build and send a SetChargingProfile, returning True if accepted."""
         start_time = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
 
         schedule = ChargingScheduleType(
@@ -1486,16 +2460,14 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
             limit,
         )
 
-        response = await asyncio.wait_for(
-            self.charge_point.call(
-                call.SetChargingProfile(evse_id=1, charging_profile=profile)
-            ),
-            timeout=15.0,
+        response = await self.async_call(
+            call.SetChargingProfile(evse_id=1, charging_profile=profile)
         )
 
         status_str = str(response.status)
         accepted = status_str == "Accepted" or "accepted" in status_str.lower()
         if accepted:
+            self.profiles.record(1, profile)
             _LOGGER.info("✅ %s set to %sA - accepted by wallbox", purpose, limit)
         else:
             _LOGGER.warning(
@@ -1504,6 +2476,27 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
         return accepted
 
     async def async_set_current_limit(self, limit: float) -> bool:
+        """Set the charging current limit through the limit command queue.
+
+        Requests arriving while a limit is being sent are coalesced: only the
+        latest target is sent next, and a target identical to the last
+        accepted one for the same transaction is not sent again.
+
+        Returns:
+            True if the wallbox accepted the limit (or it was already applied)
+        """
+        return await self.limit_queue.async_submit(limit)
+
+    @callback
+    def _async_limit_queue_changed(self) -> None:
+        """Publish the limit queue depth and latency."""
+        latency = self.limit_queue.last_latency
+        self.async_update_state(
+            limit_queue_depth=self.limit_queue.depth,
+            limit_latency=round(latency * 1000) if latency is not None else None,
+        )
+
+    async def _async_send_current_limit(self, limit: float) -> bool:
         """Set charging current limit via SetChargingProfile.
 
         Sends a TxDefaultProfile so the limit also applies from the very start of
@@ -1515,7 +2508,8 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
             limit: Current limit in Amps (max = full speed)
 
         Returns:
-            True if at least one profile was accepted, False otherwise
+            True if the profile governing the limit was accepted: the TxProfile
+            during a session, the TxDefaultProfile otherwise
         """
         if not self.charge_point:
             _LOGGER.error("❌ No wallbox connected - cannot set current limit")
@@ -1527,44 +2521,225 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
             self.current_transaction_id,
         )
 
-        try:
-            # TxDefaultProfile persists across sessions and applies from the start
-            # of the next transaction - prevents the startup overshoot.
-            ok_default = await self._send_charging_profile(
-                limit,
-                purpose=ChargingProfilePurposeEnumType.tx_default_profile,
-                profile_id=998,
-                stack_level=0,
+        # The TxProfile goes first: it changes the running session after a
+        # single round trip. Each profile is awaited before the next is sent,
+        # so neither timeout covers the other's round trip.
+        profiles = []
+        if self.current_transaction_id:
+            # TxProfile takes effect immediately on the running session.
+            profiles.append(
+                {
+                    "purpose": ChargingProfilePurposeEnumType.tx_profile,
+                    "profile_id": 999,
+                    "stack_level": 1,
+                    "transaction_id": self.current_transaction_id,
+                }
             )
+        # TxDefaultProfile persists across sessions and applies from the start
+        # of the next transaction - prevents the startup overshoot.
+        profiles.append(
+            {
+                "purpose": ChargingProfilePurposeEnumType.tx_default_profile,
+                "profile_id": 998,
+                "stack_level": 0,
+            }
+        )
+        results = []
+        for profile in profiles:
+            try:
+                results.append(await self._send_charging_profile(limit, **profile))
+            except Exception as err:
+                results.append(err)
+
+        for result in results:
+            if isinstance(result, TimeoutError):
+                _LOGGER.error(
+                    "❌ Set current limit timed out - wallbox not responding!"
+                )
+            elif isinstance(result, Exception):
+                _LOGGER.error(
+                    "❌ Failed to set current limit: %s", result, exc_info=result
+                )
 
-            # TxProfile takes effect immediately on the running session.
-            ok_tx = False
-            if self.current_transaction_id:
-                ok_tx = await self._send_charging_profile(
-                    limit,
-                    purpose=ChargingProfilePurposeEnumType.tx_profile,
-                    profile_id=999,
-                    stack_level=1,
-                    transaction_id=self.current_transaction_id,
+        # The first profile governs: the running session only follows its
+        # TxProfile, a default accepted alone does not limit it
+        if results[0] is True:
+            # Track the new limit for future start/resume/connect operations
+            self.async_update_state(current_limit=limit)
+            # Watch the wallbox settle on the new limit
+            if self._poller.tighten():
+                self._async_poll_sooner()
+            return True
+
+        _LOGGER.warning(
+            "⚠️ Current limit %sA not applied (%s not accepted)",
+            limit,
+            "TxProfile" if len(results) > 1 else "TxDefaultProfile",
+        )
+        return False
+
+    async def async_reconcile_profiles(self) -> bool:
+        """Refresh the profile cache from the wallbox (GetChargingProfiles).
+
+        Returns True once the cache matches the wallbox.
+        """
+        if not self.charge_point:
+            return False
+        request_id, done = self.profiles.begin_report()
+        try:
+            response = await self.async_call(
+                call.GetChargingProfiles(
+                    request_id=request_id,
+                    charging_profile=ChargingProfileCriterionType(),
                 )
+            )
+            if response.status == "NoProfiles":
+                self.profiles.finish_report(request_id)
+            elif response.status == "Accepted":
+                # Filled in by on_report_charging_profiles
+                await asyncio.wait_for(done, timeout=PROFILE_REPORT_TIMEOUT)
+            else:
+                _LOGGER.warning("GetChargingProfiles rejected: %s", response.status)
+                return False
+        except Exception as err:
+            _LOGGER.warning("Could not read charging profiles: %s", err)
+            return False
 
-            if ok_default or ok_tx:
-                # Track the new limit for future start/resume/connect operations
-                self.data["current_limit"] = limit
-                self.async_set_updated_data(self.data)
-                return True
+        _LOGGER.debug(
+            "Charging profiles on wallbox: %s",
+            ", ".join(
+                f"{p.id} ({p.purpose}, stack {p.stack_level})"
+                for p in self.profiles.profiles
+            )
+            or "none",
+        )
+        return True
 
-            _LOGGER.warning(
-                "⚠️ Current limit %sA not applied (no profile accepted)", limit
+    async def _async_clear_conflicting_profiles(
+        self, evse_id: int, profile: ChargingProfileType
+    ) -> None:
+        """Clear installed profiles that would reject or override profile.
+
+        Usually nothing conflicts and no call is made. If the installed
+        profiles can't be read, everything is cleared as before.
+        """
+        if not self.profiles.known:
+            await self.async_reconcile_profiles()
+        if not self.profiles.known:
+            _LOGGER.info("Installed profiles unknown, clearing all first...")
+            await self._async_clear_all_profiles()
+            return
+
+        for conflict in self.profiles.conflicts(evse_id, profile):
+            if conflict.source != "CSO":
+                _LOGGER.warning(
+                    "Profile %s was installed by %s and can't be cleared",
+                    conflict.id,
+                    conflict.source,
+                )
+                continue
+            _LOGGER.info(
+                "Clearing conflicting profile %s (%s, stack %s)",
+                conflict.id,
+                conflict.purpose,
+                conflict.stack_level,
+            )
+            try:
+                clear_response = await self.async_call(
+                    call.ClearChargingProfile(charging_profile_id=conflict.id)
+                )
+            except Exception as e:
+                _LOGGER.debug("ClearChargingProfile failed (OK to ignore): %s", e)
+                continue
+            if clear_response.status in ("Accepted", "Unknown"):
+                self.profiles.remove(conflict.id)
+
+    async def _async_clear_all_profiles(self) -> bool:
+        """Clear every charging profile, then re-install the tariff schedule."""
+        try:
+            clear_response = await self.async_call(call.ClearChargingProfile())
+            _LOGGER.info(
+                "ClearChargingProfile (all) response: %s", clear_response.status
             )
+            self.profiles.remove()
+            self.zero_profile_installed = False
+        except Exception as e:
+            _LOGGER.debug("ClearChargingProfile failed (OK to ignore): %s", e)
+            return False
+        if self.charging_schedule is not None:
+            # Clearing all profiles removed the tariff schedule too
+            await self._async_install_schedule(self.charging_schedule)
+        return True
+
+    async def async_set_charging_schedule(
+        self,
+        periods: list[tuple[datetime, float]],
+        *,
+        end: datetime | None = None,
+        recurrency: str | None = None,
+    ) -> bool:
+        """Upload a multi-period schedule the wallbox follows by itself.
+
+        Sent once as a ChargingStationMaxProfile (see schedule.py), so the
+        limit changes at every period boundary without a round trip from HA.
+        Re-installed after a reconnect.
+
+        Raises:
+            ValueError: The periods don't form a valid schedule
+        """
+        profile = build_charging_profile(periods, end=end, recurrency=recurrency)
+        if not self.charge_point:
+            _LOGGER.error("No wallbox connected")
+            return False
+        if not await self._async_install_schedule(profile):
             return False
+        self.charging_schedule = profile
+        return True
 
+    async def async_clear_charging_schedule(self) -> bool:
+        """Remove the uploaded charging schedule from the wallbox."""
+        self.charging_schedule = None
+        if not self.charge_point:
+            return False
+        try:
+            response = await self.async_call(
+                call.ClearChargingProfile(charging_profile_id=SCHEDULE_PROFILE_ID)
+            )
+        except Exception as err:
+            _LOGGER.error("❌ Failed to clear charging schedule: %s", err)
+            return False
+        _LOGGER.info("🗓️ Charging schedule cleared: %s", response.status)
+        self.profiles.remove(SCHEDULE_PROFILE_ID)
+        # Unknown means there was nothing to clear
+        return str(response.status) in ("Accepted", "Unknown")
+
+    async def _async_install_schedule(self, profile: ChargingProfileType) -> bool:
+        """Send the schedule profile, returning True if accepted."""
+        periods = profile.charging_schedule[0].charging_schedule_period
+        try:
+            response = await self.async_call(
+                # Station-wide profiles go to EVSE 0
+                call.SetChargingProfile(evse_id=0, charging_profile=profile)
+            )
         except TimeoutError:
-            _LOGGER.error("❌ Set current limit timed out - wallbox not responding!")
+            _LOGGER.error("❌ Charging schedule upload timed out")
             return False
         except Exception as err:
-            _LOGGER.error("❌ Failed to set current limit: %s", err, exc_info=True)
+            _LOGGER.error("❌ Failed to upload charging schedule: %s", err)
+            return False
+
+        if str(response.status) != "Accepted":
+            _LOGGER.warning(
+                "⚠️ Charging schedule rejected by wallbox: %s", response.status
+            )
             return False
+        self.profiles.record(0, profile)
+        _LOGGER.info(
+            "🗓️ Charging schedule with %d periods installed from %s",
+            len(periods),
+            profile.charging_schedule[0].start_schedule,
+        )
+        return True
 
     async def async_apply_limit_on_transaction_start(self) -> None:
         """Push the configured limit right when a session starts (issue #15).
@@ -1578,21 +2753,23 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
         _LOGGER.info("🚀 Transaction started - applying %sA immediately", limit)
         await self.async_set_current_limit(limit)
 
-    async def _apply_default_limit_on_connect(self) -> None:
+    async def _apply_default_limit_on_connect(self) -> bool:
         """Install the TxDefaultProfile after the wallbox connects (issue #15).
 
         Ensures the very first session after a (re)connect already starts at the
-        configured limit instead of full power.
+        configured limit instead of full power. Runs after the configuration
+        step of the bootstrap.
         """
-        # Let the connection settle and the pause/resume config run first.
-        await asyncio.sleep(5)
         if not self.charge_point:
-            return
+            return False
         limit = self.data.get("current_limit")
+        if self.charging_schedule is not None:
+            # A rebooted wallbox has lost it; re-sending replaces it otherwise
+            await self._async_install_schedule(self.charging_schedule)
         if not limit:
-            return
+            return True
         try:
-            await self._send_charging_profile(
+            return await self._send_charging_profile(
                 limit,
                 purpose=ChargingProfilePurposeEnumType.tx_default_profile,
                 profile_id=998,
@@ -1601,6 +2778,7 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
         except Exception as err:
             # Best-effort - never let this block the connection handler.
             _LOGGER.warning("Could not install TxDefaultProfile on connect: %s", err)
+            return False
 
     async def async_trigger_meter_values(self) -> bool:
         """Trigger wallbox to send meter values immediately.
@@ -1618,14 +2796,11 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
             from ocpp.v201 import call as ocpp_call
             from ocpp.v201.enums import MessageTriggerEnumType
 
-            response = await asyncio.wait_for(
-                self.charge_point.call(
-                    ocpp_call.TriggerMessage(
-                        requested_message=MessageTriggerEnumType.meter_values,
-                        evse={"id": 1, "connector_id": 1},
-                    )
-                ),
-                timeout=15.0,
+            response = await self.async_call(
+                ocpp_call.TriggerMessage(
+                    requested_message=MessageTriggerEnumType.meter_values,
+                    evse={"id": 1, "connector_id": 1},
+                )
             )
 
             _LOGGER.info("TriggerMessage response: %s", response.status)
@@ -1660,9 +2835,8 @@ class BMWWallboxCoordinator(DataUpdateCoordinator):
                 variable=VariableType(name="StatusLedBrightness"),
             )
 
-            response = await asyncio.wait_for(
-                self.charge_point.call(call.SetVariables(set_variable_data=[set_var])),
-                timeout=15.0,
+            response = await self.async_call(
+                call.SetVariables(set_variable_data=[set_var])
             )
 
             # Check result
@@ -0,0 +1,43 @@
+"""Diagnostics support for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_RFID_TOKEN, DOMAIN
+from .coordinator import BMWWallboxCoordinator
+from .timeseries import TIERS
+
+TO_REDACT = {CONF_RFID_TOKEN, "id_token", "serial_number"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: BMWWallboxCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "config": async_redact_data(coordinator.config, TO_REDACT),
+        "device_info": async_redact_data(coordinator.device_info, TO_REDACT),
+        "data": async_redact_data(dict(coordinator.data), TO_REDACT),
+        "bootstrap": {
+            name: asdict(result)
+            for name, result in coordinator.bootstrap_metrics.items()
+        },
+        "meter_history": {
+            tier: coordinator.meter_history.as_dict(tier) for tier in TIERS
+        },
+        "commands": coordinator.commands.as_dict(),
+        "liveness": coordinator.liveness.as_dict(),
+    }
@@ -0,0 +1,137 @@
+"""Failure escalation for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+
+When pausing or starting fails, the coordinator climbs a ladder of
+increasingly drastic measures instead of rebooting the wallbox right away:
+
+    retry -> clear_profiles -> zero_profile -> stop_transaction -> reset
+
+Each rung only runs if the one before it didn't help, and the options
+decide which rungs are enabled. The last rung (Reset, about 60 s without
+the wallbox) is gated by a circuit breaker: it only fires if most recent
+OCPP calls went unanswered, i.e. the wallbox is truly unresponsive. A
+wallbox that answers - even with a rejection - is never rebooted.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Awaitable, Callable, Collection, Iterable
+from dataclasses import dataclass
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+RUNG_RETRY = "retry"
+RUNG_CLEAR_PROFILES = "clear_profiles"
+RUNG_ZERO_PROFILE = "zero_profile"
+RUNG_STOP_TRANSACTION = "stop_transaction"
+RUNG_RESET = "reset"
+# Ladder order; the options only enable or disable rungs
+ESCALATION_STEPS = (
+    RUNG_RETRY,
+    RUNG_CLEAR_PROFILES,
+    RUNG_ZERO_PROFILE,
+    RUNG_STOP_TRANSACTION,
+    RUNG_RESET,
+)
+
+# Profile ID of the 0 A ChargingStationMaxProfile (997 is the tariff schedule)
+ZERO_PROFILE_ID = 996
+
+
+class CircuitBreaker:
+    """Track recent OCPP call outcomes to tell a slow link from a dead wallbox.
+
+    Every attempt counts: answered (any status) or not (timeout, error).
+    The breaker is open once at least min_calls attempts within the last
+    window seconds were made and at least `threshold` of them failed.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        min_calls: int,
+        threshold: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a closed breaker."""
+        self.window = window
+        self.min_calls = min_calls
+        self.threshold = threshold
+        self._clock = clock
+        self._outcomes: deque[tuple[float, bool]] = deque()
+
+    def record(self, answered: bool) -> None:
+        """Record the outcome of one call attempt."""
+        self._outcomes.append((self._clock(), answered))
+        self._expire()
+
+    def reset(self) -> None:
+        """Forget all outcomes (e.g. on a new connection)."""
+        self._outcomes.clear()
+
+    def _expire(self) -> None:
+        """Drop outcomes older than the window."""
+        oldest = self._clock() - self.window
+        while self._outcomes and self._outcomes[0][0] < oldest:
+            self._outcomes.popleft()
+
+    @property
+    def calls(self) -> int:
+        """Return the number of attempts within the window."""
+        self._expire()
+        return len(self._outcomes)
+
+    @property
+    def failure_ratio(self) -> float:
+        """Return the share of failed attempts within the window."""
+        calls = self.calls
+        if not calls:
+            return 0.0
+        return sum(not answered for _, answered in self._outcomes) / calls
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if the wallbox looks unresponsive."""
+        return self.calls >= self.min_calls and self.failure_ratio >= self.threshold
+
+
+@dataclass(slots=True)
+class Rung:
+    """One measure of the ladder; run returns True if it fixed the problem."""
+
+    name: str
+    run: Callable[[], Awaitable[bool]]
+
+
+async def async_escalate(
+    rungs: Iterable[Rung], enabled: Collection[str], breaker: CircuitBreaker
+) -> str | None:
+    """Run the enabled rungs in order until one succeeds.
+
+    Returns the name of the rung that succeeded, or None. The reset rung is
+    skipped while the breaker is closed (the wallbox still answers).
+    """
+    for rung in rungs:
+        if rung.name not in enabled:
+            continue
+        if rung.name == RUNG_RESET and not breaker.is_open:
+            _LOGGER.warning(
+                "🪜 Not rebooting: the wallbox answered %.0f%% of %d recent calls",
+                (1 - breaker.failure_ratio) * 100,
+                breaker.calls,
+            )
+            continue
+        _LOGGER.warning("🪜 Escalating: %s", rung.name)
+        try:
+            if await rung.run():
+                _LOGGER.info("🪜 %s succeeded", rung.name)
+                return rung.name
+        except Exception as err:  # keep climbing
+            _LOGGER.warning("🪜 %s failed: %s", rung.name, err or type(err).__name__)
+    return None
@@ -0,0 +1,74 @@
+"""Awaitable wallbox events for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+
+Commands wait for the wallbox to confirm a change instead of sleeping for
+the worst case: the OCPP handlers fire events as messages arrive, and a
+command awaits the one it needs with a timeout.
+
+Register with expect() *before* sending the command; the confirming message
+often arrives before the command's own response.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+# Fired by the OCPP handlers; payload keys in parentheses
+EVENT_CONNECTED = "connected"  # wallbox (re)connected and accepts calls
+EVENT_TRANSACTION_STARTED = "transaction_started"  # (transaction_id)
+EVENT_CHARGING_STATE_CHANGED = "charging_state_changed"  # (previous, to)
+EVENT_METER_VALUES_RECEIVED = "meter_values_received"  # (power)
+
+
+class WallboxEvents:
+    """One-shot waiters for events fired by the OCPP handlers."""
+
+    def __init__(self) -> None:
+        """Initialize without waiters."""
+        self._waiters: dict[str, list[tuple[dict[str, Any], asyncio.Future]]] = {}
+
+    def expect(self, event: str, **match: Any) -> asyncio.Future[dict[str, Any]]:
+        """Return a future resolved with the payload of the next matching event.
+
+        Keyword arguments must equal the payload values, e.g.
+        expect(EVENT_CHARGING_STATE_CHANGED, to="Charging"). Cancel the future
+        if it is no longer needed.
+        """
+        future: asyncio.Future[dict[str, Any]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        waiters = self._waiters.setdefault(event, [])
+        entry = (match, future)
+        waiters.append(entry)
+        future.add_done_callback(lambda _: self._discard(event, entry))
+        return future
+
+    async def wait(self, event: str, timeout: float, **match: Any) -> dict[str, Any]:
+        """Wait for the next matching event.
+
+        Raises:
+            TimeoutError: The event didn't happen within timeout seconds
+        """
+        return await asyncio.wait_for(self.expect(event, **match), timeout)
+
+    def fire(self, event: str, **payload: Any) -> None:
+        """Resolve every waiter the event matches."""
+        for entry in list(self._waiters.get(event, ())):
+            match, future = entry
+            if not future.done() and all(
+                payload.get(key) == value for key, value in match.items()
+            ):
+                future.set_result(payload)
+                self._discard(event, entry)
+
+    def _discard(self, event: str, entry: tuple) -> None:
+        """Forget a resolved or cancelled waiter (once)."""
+        waiters = self._waiters.get(event)
+        if waiters and entry in waiters:
+            waiters.remove(entry)
+            if not waiters:
+                del self._waiters[event]
@@ -0,0 +1,132 @@
+"""Current limit command queue for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+
+Setting a limit costs two SetChargingProfile round trips. Dragging the slider
+or an automation tracking solar surplus can ask for many limits per second, so
+requests go through this queue: while one limit is being sent, newer requests
+only replace the pending target, and just the latest one is sent next. A
+target identical to the last accepted one (for the same transaction) is not
+sent again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LimitCommandQueue:
+    """Coalesce current limit updates so only the latest target is sent."""
+
+    def __init__(
+        self,
+        send: Callable[[float], Awaitable[bool]],
+        context: Callable[[], Hashable] = lambda: None,
+        on_change: Callable[[], None] = lambda: None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            send: Sends a limit to the wallbox, returns True if the profile
+                that governs it was accepted
+            context: State a sent limit is bound to (the transaction ID); a
+                limit is only skipped as identical within the same context
+            on_change: Called when depth or latency changed
+            clock: Time source for latency measurements
+        """
+        self._send = send
+        self._context = context
+        self._on_change = on_change
+        self._clock = clock
+        self._pending: float | None = None
+        self._waiters: list[asyncio.Future[bool]] = []
+        self._worker: asyncio.Task | None = None
+        self._last_accepted: tuple[float, Hashable] | None = None
+        self.last_latency: float | None = None  # seconds of the last send
+        self.submitted = 0
+        self.sent = 0
+        self.coalesced = 0
+        self.skipped = 0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of requests waiting to be sent."""
+        return len(self._waiters)
+
+    def invalidate(self) -> None:
+        """Forget the last accepted limit (profiles changed behind our back)."""
+        self._last_accepted = None
+
+    async def async_submit(self, limit: float) -> bool:
+        """Queue a limit and wait until it (or a newer one) has been handled.
+
+        Returns the result of the send that covered this request: True if the
+        wallbox accepted the latest target or it was already in place.
+        """
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._pending = limit
+        self._waiters.append(future)
+        self.submitted += 1
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._async_run())
+        self._on_change()
+        # A caller giving up must not cancel a send other callers wait for
+        return await asyncio.shield(future)
+
+    async def _async_run(self) -> None:
+        """Send the latest pending target until nothing is pending."""
+        waiters: list[asyncio.Future[bool]] = []
+        try:
+            while self._waiters:
+                limit = self._pending
+                waiters, self._waiters = self._waiters, []
+                self._pending = None
+                self.coalesced += len(waiters) - 1
+                result = await self._async_apply(limit)
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(result)
+                waiters = []
+                self._on_change()
+        except asyncio.CancelledError:
+            # Callers of the limit being sent; queued ones are cancelled in cancel()
+            for waiter in waiters:
+                waiter.cancel()
+            raise
+
+    async def _async_apply(self, limit: float) -> bool:
+        """Send a limit unless it is already in place."""
+        key = (limit, self._context())
+        if key == self._last_accepted:
+            self.skipped += 1
+            _LOGGER.debug("Current limit %sA already applied, not resending", limit)
+            return True
+
+        started = self._clock()
+        try:
+            accepted = await self._send(limit)
+        except Exception:
+            _LOGGER.exception("Sending current limit %sA failed", limit)
+            accepted = False
+        self.last_latency = self._clock() - started
+        self.sent += 1
+        self._last_accepted = key if accepted else None
+        return accepted
+
+    def cancel(self) -> None:
+        """Stop sending (e.g. when the entry unloads)."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        for waiter in self._waiters:
+            waiter.cancel()
+        self._waiters = []
+        self._pending = None
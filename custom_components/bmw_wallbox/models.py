@@ -0,0 +1,147 @@
+"""Typed wallbox state for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, MutableMapping
+from dataclasses import dataclass, fields
+from datetime import datetime
+from operator import attrgetter
+from typing import Any
+
+
+@dataclass(slots=True, eq=True)
+class WallboxState(MutableMapping[str, Any]):
+    """Snapshot of everything the integration knows about the wallbox.
+
+    This is what `coordinator.data` holds. Entities read fields as attributes
+    (`coordinator.data.power`); the mapping interface (`data["power"]`,
+    `data.get("power")`) is kept for backwards compatibility.
+
+    The coordinator never mutates a published snapshot: handlers work on a
+    `copy()` and swap it in with `async_set_updated_data()`, so readers never
+    see a half-applied OCPP message.
+    """
+
+    # Connection / transaction
+    connected: bool = False
+    charging_state: str = "Unknown"
+    transaction_id: str | None = None
+    connector_status: str = "Unknown"
+    evse_id: int = 1
+    connector_id: int = 1
+    phases_used: int | None = None  # until the wallbox reports it
+    last_heartbeat: datetime | None = None
+    event_type: str | None = None
+    trigger_reason: str | None = None
+    stopped_reason: str | None = None
+    sequence_number: int = 0
+    last_update: str | None = None
+    id_token: str | None = None
+    id_token_type: str | None = None
+    context: str | None = None
+    location: str | None = None
+    # Main measurements
+    power: float | None = 0.0
+    energy_total: float | None = None  # None until first valid reading
+    last_session_energy: float | None = None  # kWh, from the session ledger
+    current: float | None = 0.0
+    voltage: float | None = 0.0
+    # Additional power measurements
+    power_active_export: float | None = None
+    power_reactive_import: float | None = None
+    power_reactive_export: float | None = None
+    power_offered: float | None = None
+    power_factor: float | None = None
+    # Additional energy measurements
+    energy_active_export: float | None = None
+    energy_reactive_import: float | None = None
+    energy_reactive_export: float | None = None
+    # Per-phase measurements
+    current_l1: float | None = None
+    current_l2: float | None = None
+    current_l3: float | None = None
+    voltage_l1: float | None = None
+    voltage_l2: float | None = None
+    voltage_l3: float | None = None
+    # Other measurements
+    frequency: float | None = None
+    temperature: float | None = None
+    # Configurable settings
+    led_brightness: int = 46  # Default from capabilities report
+    current_limit: float | None = None
+    # Current limit command queue (see limits.py)
+    limit_queue_depth: int = 0
+    limit_latency: float | None = None  # ms of the last SetChargingProfile pair
+    # WebSocket link quality (see watchdog.py)
+    link_rtt: float | None = None  # ms, smoothed ping round trip
+    link_jitter: float | None = None  # ms
+
+    def copy(self) -> WallboxState:
+        """Return a shallow copy to build the next snapshot on."""
+        return WallboxState(*_get_values(self))
+
+    def evolve(self, **changes: Any) -> WallboxState:
+        """Return a copy with the given fields replaced."""
+        new = self.copy()
+        for key, value in changes.items():
+            new[key] = value
+        return new
+
+    def changed_keys(self, other: WallboxState | None) -> frozenset[str]:
+        """Return the fields whose value differs from `other`."""
+        if other is None:
+            return STATE_KEYS
+        return frozenset(
+            name
+            for name, mine, theirs in zip(
+                _STATE_KEY_ORDER, _get_values(self), _get_values(other), strict=True
+            )
+            if mine != theirs
+        )
+
+    # Mapping interface (backwards compatibility with the old dict)
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a field by name."""
+        if key not in STATE_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Set a field by name."""
+        if key not in STATE_KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        """Fields cannot be removed."""
+        raise TypeError("WallboxState fields cannot be deleted")
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over field names."""
+        return iter(_STATE_KEY_ORDER)
+
+    def __len__(self) -> int:
+        """Return the number of fields."""
+        return len(_STATE_KEY_ORDER)
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if `key` is a field name."""
+        return key in STATE_KEYS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field by name, or `default` for unknown names."""
+        if key not in STATE_KEYS:
+            return default
+        return getattr(self, key)
+
+
+_STATE_KEY_ORDER: tuple[str, ...] = tuple(f.name for f in fields(WallboxState))
+STATE_KEYS: frozenset[str] = frozenset(_STATE_KEY_ORDER)
+# Reads every field in declaration order in one C-level call
+_get_values = attrgetter(*_STATE_KEY_ORDER)
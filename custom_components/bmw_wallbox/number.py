@@ -51,6 +51,7 @@ class BMWWallboxCurrentLimitNumber(CoordinatorEntity, NumberEntity):
     _attr_mode = NumberMode.SLIDER
     _attr_icon = "mdi:current-ac"
     _attr_native_unit_of_measurement = UnitOfElectricCurrent.AMPERE
+    _data_keys = frozenset({"current_limit"})
 
     def __init__(
         self,
@@ -58,14 +59,10 @@ class BMWWallboxCurrentLimitNumber(CoordinatorEntity, NumberEntity):
         entry: ConfigEntry,
     ) -> None:
         """Initialize the number entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, self._data_keys)
         self._entry = entry
         self._attr_unique_id = f"{entry.entry_id}_{NUMBER_CURRENT_LIMIT}"
         self._attr_name = "Charging Current Limit"
-        self._attr_native_max_value = entry.options.get(
-            CONF_MAX_CURRENT,
-            entry.data.get(CONF_MAX_CURRENT, DEFAULT_MAX_CURRENT),
-        )
         # Device info for grouping
         self._attr_device_info = {
             "identifiers": {(DOMAIN, entry.data["charge_point_id"])},
@@ -76,16 +73,24 @@ class BMWWallboxCurrentLimitNumber(CoordinatorEntity, NumberEntity):
             "serial_number": coordinator.device_info.get("serial_number"),
         }
 
+    @property
+    def native_max_value(self) -> float:
+        """Return the configured maximum current (options apply live)."""
+        return self._entry.options.get(
+            CONF_MAX_CURRENT,
+            self._entry.data.get(CONF_MAX_CURRENT, DEFAULT_MAX_CURRENT),
+        )
+
     @property
     def native_value(self) -> float:
         """Return current limit value."""
-        return self.coordinator.data.get(
-            "current_limit",
-            self._entry.options.get(
+        limit = self.coordinator.data.current_limit
+        if limit is None:
+            return self._entry.options.get(
                 CONF_MAX_CURRENT,
                 self._entry.data.get(CONF_MAX_CURRENT, DEFAULT_MAX_CURRENT),
-            ),
-        )
+            )
+        return limit
 
     async def async_set_native_value(self, value: float) -> None:
         """Set new current limit.
@@ -96,8 +101,7 @@ class BMWWallboxCurrentLimitNumber(CoordinatorEntity, NumberEntity):
         int_value = int(value)
 
         # Update tracked value immediately (for UI responsiveness)
-        self.coordinator.data["current_limit"] = int_value
-        self.coordinator.async_set_updated_data(self.coordinator.data)
+        self.coordinator.async_update_state(current_limit=int_value)
 
         # If there's an active transaction, also send to wallbox
         if self.coordinator.current_transaction_id:
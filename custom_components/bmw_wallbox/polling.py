@@ -0,0 +1,96 @@
+"""Adaptive meter polling for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+
+The wallbox pushes MeterValues on its own, but not reliably on every model, so
+the coordinator falls back to TriggerMessage(MeterValues). This module decides
+when that round trip is worth it: only when the last pushed sample is older
+than the current interval. The interval tightens while power is ramping or
+right after a limit change, and backs off while power is stable.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import time
+
+# Never poll faster than this, even while ramping (seconds)
+POLL_MIN_INTERVAL = 5.0
+# Stable power: grow the interval up to this multiple of the configured one
+POLL_MAX_FACTOR = 6
+# Change in power between two pushed samples that counts as a ramp (W)
+POLL_RAMP_THRESHOLD = 500.0
+# How long to keep polling tightly after a ramp or limit change (seconds)
+POLL_SETTLE_TIME = 30.0
+
+
+class AdaptivePoller:
+    """Decide when the coordinator should ask the wallbox for meter values."""
+
+    def __init__(
+        self, base_interval: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Initialize with the configured polling interval in seconds."""
+        self._clock = clock
+        self.base_interval = base_interval
+        self.interval = base_interval
+        self.last_push: float | None = None
+        self._last_power: float | None = None
+        self._settle_until = 0.0
+
+    @property
+    def fast_interval(self) -> float:
+        """Return the interval used while power is changing."""
+        return min(self.base_interval, POLL_MIN_INTERVAL)
+
+    def set_base_interval(self, base_interval: float) -> None:
+        """Change the configured interval and restart from it."""
+        self.base_interval = base_interval
+        self.interval = base_interval
+
+    def data_age(self) -> float | None:
+        """Return seconds since the last pushed sample, or None if none yet."""
+        if self.last_push is None:
+            return None
+        return self._clock() - self.last_push
+
+    def is_stale(self) -> bool:
+        """Return True if the pushed data is older than the current interval."""
+        age = self.data_age()
+        return age is None or age >= self.interval
+
+    def note_push(self, power: float | None) -> bool:
+        """Record pushed meter values; return True if polling was tightened."""
+        self.last_push = self._clock()
+        previous, self._last_power = self._last_power, power
+        if (
+            previous is not None
+            and power is not None
+            and abs(power - previous) >= POLL_RAMP_THRESHOLD
+        ):
+            return self.tighten()
+        return False
+
+    def tighten(self) -> bool:
+        """Poll quickly for a while; return True if the interval shrank."""
+        self._settle_until = self._clock() + POLL_SETTLE_TIME
+        if self.interval <= self.fast_interval:
+            return False
+        self.interval = self.fast_interval
+        return True
+
+    def next_interval(self, active: bool) -> float:
+        """Return the delay until the next poll.
+
+        Outside a charging session the configured interval is used as is.
+        """
+        if not active:
+            self.interval = self.base_interval
+            self._last_power = None
+        elif self._clock() < self._settle_until:
+            self.interval = self.fast_interval
+        else:
+            self.interval = min(self.interval * 2, self.base_interval * POLL_MAX_FACTOR)
+        return self.interval
@@ -0,0 +1,197 @@
+"""Charging profile cache for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+
+Tracks which charging profiles are installed on the wallbox, so pause and
+resume only clear a profile when one would actually conflict with the one
+being sent instead of clearing everything first.
+
+The cache follows our own accepted SetChargingProfile/ClearChargingProfile
+calls and is checked against the wallbox with GetChargingProfiles: the
+wallbox answers with one or more ReportChargingProfiles messages, and once
+the last one (tbc false) arrived the reported profiles replace the cache.
+After a reconnect or reset the cache is unknown until the next report.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from ocpp.v201.datatypes import ChargingProfileType
+
+TX_PROFILE = "TxProfile"
+
+
+@dataclass(slots=True, frozen=True)
+class InstalledProfile:
+    """A charging profile installed on the wallbox."""
+
+    id: int
+    evse_id: int
+    purpose: str
+    stack_level: int
+    transaction_id: str | None = None
+    source: str = "CSO"  # ChargingLimitSource, only CSO profiles can be cleared
+
+    @classmethod
+    def from_profile(
+        cls, evse_id: int, profile: ChargingProfileType
+    ) -> InstalledProfile:
+        """Describe a profile we sent."""
+        return cls(
+            id=profile.id,
+            evse_id=evse_id,
+            purpose=str(profile.charging_profile_purpose),
+            stack_level=profile.stack_level,
+            transaction_id=profile.transaction_id,
+        )
+
+    @classmethod
+    def from_report(
+        cls, evse_id: int, profile: Mapping[str, Any], source: str
+    ) -> InstalledProfile:
+        """Describe a profile from a ReportChargingProfiles message."""
+        return cls(
+            id=profile["id"],
+            evse_id=evse_id,
+            purpose=str(profile["charging_profile_purpose"]),
+            stack_level=profile["stack_level"],
+            transaction_id=profile.get("transaction_id"),
+            source=str(source),
+        )
+
+
+class ProfileCache:
+    """Profiles installed on the wallbox, as far as we know."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize an unknown cache."""
+        self._clock = clock
+        self._profiles: dict[int, InstalledProfile] = {}
+        self.known = False
+        self.synced_at: float | None = None  # clock() of the last report
+        self.last_attempt: float | None = None  # clock() of the last request
+        self._request_id = 0
+        self._report: list[InstalledProfile] = []
+        self._report_done: asyncio.Future[None] | None = None
+        # Our own changes while a report is being collected (None = removed)
+        self._changes: dict[int, InstalledProfile | None] = {}
+
+    @property
+    def profiles(self) -> list[InstalledProfile]:
+        """Return the cached profiles."""
+        return list(self._profiles.values())
+
+    def invalidate(self) -> None:
+        """Forget the cache (reconnect or reset)."""
+        self._profiles.clear()
+        self.known = False
+
+    def record(self, evse_id: int, profile: ChargingProfileType) -> None:
+        """Add a profile the wallbox accepted (replaces the same ID)."""
+        installed = InstalledProfile.from_profile(evse_id, profile)
+        self._profiles[profile.id] = self._changes[profile.id] = installed
+
+    def remove(self, profile_id: int | None = None) -> None:
+        """Drop a cleared profile; None means all were cleared."""
+        if profile_id is None:
+            self._profiles.clear()
+            self.known = True  # nothing is left
+        else:
+            self._profiles.pop(profile_id, None)
+            self._changes[profile_id] = None
+
+    def end_transaction(self, transaction_id: str) -> None:
+        """Drop TxProfiles of an ended transaction (the wallbox removes them)."""
+        for installed in self.profiles:
+            if (
+                installed.purpose == TX_PROFILE
+                and installed.transaction_id == transaction_id
+            ):
+                del self._profiles[installed.id]
+
+    def conflicts(
+        self, evse_id: int, profile: ChargingProfileType
+    ) -> list[InstalledProfile]:
+        """Return installed profiles that would reject or override profile.
+
+        A different profile with the same purpose on the same EVSE conflicts
+        if its stack level is the same (the wallbox rejects the new one) or
+        higher (it takes precedence). TxProfiles of other transactions don't.
+        Sending the same ID replaces the installed profile, so it never
+        conflicts.
+        """
+        purpose = str(profile.charging_profile_purpose)
+        return [
+            installed
+            for installed in self._profiles.values()
+            if installed.id != profile.id
+            and installed.evse_id == evse_id
+            and installed.purpose == purpose
+            and installed.stack_level >= profile.stack_level
+            and (
+                purpose != TX_PROFILE
+                or installed.transaction_id in (None, profile.transaction_id)
+            )
+        ]
+
+    def is_due(self, interval: float) -> bool:
+        """Return True if the periodic check is due (after the first one)."""
+        return (
+            self.last_attempt is not None
+            and self._clock() - self.last_attempt >= interval
+        )
+
+    def begin_report(self) -> tuple[int, asyncio.Future[None]]:
+        """Start a GetChargingProfiles request; return its ID and completion."""
+        if self._report_done is not None and not self._report_done.done():
+            self._report_done.cancel()
+        self._request_id += 1
+        self._report = []
+        self._changes = {}
+        self._report_done = asyncio.get_running_loop().create_future()
+        self.last_attempt = self._clock()
+        return self._request_id, self._report_done
+
+    def add_report(
+        self,
+        request_id: int,
+        evse_id: int,
+        profiles: Iterable[Mapping[str, Any]],
+        source: str,
+        tbc: bool = False,
+    ) -> None:
+        """Collect a ReportChargingProfiles message; the last one syncs."""
+        if request_id != self._request_id or self._report_done is None:
+            return  # answer to an older request
+        self._report.extend(
+            InstalledProfile.from_report(evse_id, profile, source)
+            for profile in profiles
+        )
+        if not tbc:
+            self.finish_report(request_id)
+
+    def finish_report(self, request_id: int) -> None:
+        """Replace the cache with the collected report."""
+        if request_id != self._request_id:
+            return
+        profiles = {installed.id: installed for installed in self._report}
+        # A send that completed after the wallbox built its report is newer
+        for profile_id, installed in self._changes.items():
+            if installed is None:
+                profiles.pop(profile_id, None)
+            else:
+                profiles[profile_id] = installed
+        self._profiles = profiles
+        self._report = []
+        self._changes = {}
+        self.known = True
+        self.synced_at = self._clock()
+        if self._report_done is not None and not self._report_done.done():
+            self._report_done.set_result(None)
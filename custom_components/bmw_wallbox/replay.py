@@ -0,0 +1,58 @@
+"""Offline TransactionEvent replay for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+
+While the WiFi is down, the wallbox queues its TransactionEvents and sends
+them after reconnecting with offline=True, possibly after newer live events
+and sometimes twice (when our response got lost). The charge point collects
+such a burst, sorts it by timestamp and seq_no and applies it in one go.
+Whatever is older than the state already shown only goes to the meter
+history and the session ledger, never to the live view.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+
+class TransactionEventOrder:
+    """Remember the newest TransactionEvent applied to the live view."""
+
+    def __init__(self) -> None:
+        """Initialize without events."""
+        self.timestamp: datetime | None = None
+        self.transaction_id: str | None = None
+        self.seq_no: int | None = None
+
+    def is_stale(
+        self, timestamp: datetime, transaction_id: str | None, seq_no: int
+    ) -> bool:
+        """Return True if the event is not newer than the live view.
+
+        Within a transaction seq_no decides (repeats are stale too); across
+        transactions the timestamp does. A wallbox that rebooted during a
+        transaction starts seq_no over but may continue the transaction, so
+        a lower seq_no with a newer timestamp is not stale either.
+        """
+        if self.timestamp is None:
+            return False
+        if transaction_id is not None and transaction_id == self.transaction_id:
+            if seq_no < self.seq_no and timestamp > self.timestamp:
+                return False  # seq_no restarted
+            return seq_no <= self.seq_no
+        return timestamp < self.timestamp
+
+    def note_applied(
+        self, timestamp: datetime, transaction_id: str | None, seq_no: int
+    ) -> None:
+        """Record the event just applied to the live view."""
+        self.timestamp = timestamp
+        self.transaction_id = transaction_id
+        self.seq_no = seq_no
+
+
+def replay_order(event: dict) -> tuple[datetime, int]:
+    """Return the sort key of a queued event: timestamp, then seq_no."""
+    return event["event_time"], event["seq_no"]
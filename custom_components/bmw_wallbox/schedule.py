@@ -0,0 +1,145 @@
+"""Tariff-based charging schedules for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+
+Builds one ChargingStationMaxProfile with up to SCHEDULE_MAX_PERIODS periods
+from a list of (start, limit) or (start, price) entries. Once uploaded the
+wallbox switches between the periods by itself, so time-of-use charging
+doesn't depend on an automation firing at every tariff boundary.
+
+A ChargingStationMaxProfile caps every other profile, so the current limit
+slider and the session profiles keep working within the schedule: in each
+period the wallbox uses the lower of the two limits.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from datetime import UTC, datetime
+from typing import Any
+
+from ocpp.v201.datatypes import (
+    ChargingProfileType,
+    ChargingSchedulePeriodType,
+    ChargingScheduleType,
+)
+from ocpp.v201.enums import (
+    ChargingProfileKindEnumType,
+    ChargingProfilePurposeEnumType,
+    ChargingRateUnitEnumType,
+    RecurrencyKindEnumType,
+)
+
+# Profile ID of the schedule (998/999 are the current limit profiles)
+SCHEDULE_PROFILE_ID = 997
+# SmartChargingCtrlr.PeriodsPerSchedule reported by the wallbox
+SCHEDULE_MAX_PERIODS = 33
+
+RECURRENCY_DAILY = "daily"
+RECURRENCY_WEEKLY = "weekly"
+RECURRENCIES = {
+    RECURRENCY_DAILY: (RecurrencyKindEnumType.daily, 86400),
+    RECURRENCY_WEEKLY: (RecurrencyKindEnumType.weekly, 7 * 86400),
+}
+
+
+def tariff_periods(
+    entries: Iterable[Mapping[str, Any]],
+    max_limit: float,
+    max_price: float | None = None,
+) -> list[tuple[datetime, float]]:
+    """Turn tariff entries into (start, limit) periods.
+
+    Each entry has a `start` and either a `limit` (A) or a `price`. Priced
+    entries charge at max_limit up to max_price and are blocked (0 A) above.
+    """
+    periods = []
+    for entry in entries:
+        if "limit" in entry:
+            limit = min(float(entry["limit"]), max_limit)
+        elif "price" in entry:
+            if max_price is None:
+                raise ValueError("max_price is required for priced periods")
+            limit = max_limit if float(entry["price"]) <= max_price else 0.0
+        else:
+            raise ValueError(f"Period {entry} has neither a limit nor a price")
+        periods.append((entry["start"], limit))
+    return periods
+
+
+def _timestamp(value: datetime) -> str:
+    """Format a datetime the way the wallbox expects (UTC, seconds)."""
+    return value.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def build_charging_profile(
+    periods: Iterable[tuple[datetime, float]],
+    *,
+    end: datetime | None = None,
+    recurrency: str | None = None,
+    profile_id: int = SCHEDULE_PROFILE_ID,
+) -> ChargingProfileType:
+    """Build a ChargingStationMaxProfile from (start, limit) periods.
+
+    Each period lasts until the next one starts; the last one until `end`
+    (or indefinitely). Neighbouring periods with the same limit are merged.
+    With a recurrency the schedule repeats daily or weekly from its first
+    start, so it must fit in one day or week.
+
+    Raises:
+        ValueError: No periods, too many for the wallbox, or a recurring
+            schedule longer than its recurrence
+    """
+    ordered = sorted(periods, key=lambda period: period[0])
+    if not ordered:
+        raise ValueError("A charging schedule needs at least one period")
+
+    start = ordered[0][0]
+    schedule_periods: list[ChargingSchedulePeriodType] = []
+    for period_start, limit in ordered:
+        if schedule_periods and schedule_periods[-1].limit == float(limit):
+            continue
+        schedule_periods.append(
+            ChargingSchedulePeriodType(
+                start_period=int((period_start - start).total_seconds()),
+                limit=float(limit),
+            )
+        )
+    if len(schedule_periods) > SCHEDULE_MAX_PERIODS:
+        raise ValueError(
+            f"{len(schedule_periods)} periods, the wallbox supports at most "
+            f"{SCHEDULE_MAX_PERIODS}"
+        )
+
+    duration = None
+    if end is not None:
+        duration = int((end - start).total_seconds())
+        if duration <= schedule_periods[-1].start_period:
+            raise ValueError("The schedule must end after its last period starts")
+
+    profile_kwargs: dict[str, Any] = {}
+    kind = ChargingProfileKindEnumType.absolute
+    if recurrency is not None:
+        recurrency_kind, length = RECURRENCIES[recurrency]
+        if (duration or schedule_periods[-1].start_period) > length:
+            raise ValueError(f"A {recurrency} schedule must fit in {length} s")
+        kind = ChargingProfileKindEnumType.recurring
+        profile_kwargs["recurrency_kind"] = recurrency_kind
+
+    schedule = ChargingScheduleType(
+        id=1,
+        start_schedule=_timestamp(start),
+        duration=duration,
+        charging_rate_unit=ChargingRateUnitEnumType.amps,
+        charging_schedule_period=schedule_periods,
+    )
+    return ChargingProfileType(
+        id=profile_id,
+        stack_level=0,
+        charging_profile_purpose=ChargingProfilePurposeEnumType.charging_station_max_profile,
+        charging_profile_kind=kind,
+        charging_schedule=[schedule],
+        **profile_kwargs,
+    )
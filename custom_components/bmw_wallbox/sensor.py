@@ -15,8 +15,10 @@ from homeassistant.const import (
     UnitOfElectricPotential,
     UnitOfEnergy,
     UnitOfPower,
+    UnitOfTime,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -40,6 +42,7 @@ async def async_setup_entry(
             # === ENERGY & POWER (FOR CHARGING MONITORING) ===
             BMWWallboxPowerSensor(coordinator, entry),
             BMWWallboxEnergyTotalSensor(coordinator, entry),  # For Energy Dashboard
+            BMWWallboxLastSessionEnergySensor(coordinator, entry),
             # === ELECTRICAL MEASUREMENTS ===
             BMWWallboxCurrentSensor(coordinator, entry),
             BMWWallboxVoltageSensor(coordinator, entry),
@@ -53,6 +56,9 @@ async def async_setup_entry(
             BMWWallboxIDTokenSensor(coordinator, entry),
             BMWWallboxPhasesUsedSensor(coordinator, entry),
             BMWWallboxSequenceNumberSensor(coordinator, entry),
+            BMWWallboxLimitLatencySensor(coordinator, entry),
+            BMWWallboxLinkRttSensor(coordinator, entry),
+            BMWWallboxLinkJitterSensor(coordinator, entry),
         ]
     )
 
@@ -60,6 +66,10 @@ async def async_setup_entry(
 class BMWWallboxSensorBase(CoordinatorEntity, SensorEntity):
     """Base class for BMW Wallbox sensors."""
 
+    # coordinator.data keys this sensor reads; it is only refreshed when one
+    # of them changes (None = refresh on every update).
+    _data_keys: frozenset[str] | None = None
+
     def __init__(
         self,
         coordinator: BMWWallboxCoordinator,
@@ -68,7 +78,7 @@ class BMWWallboxSensorBase(CoordinatorEntity, SensorEntity):
         name: str,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, self._data_keys)
         self._attr_unique_id = f"{entry.entry_id}_{sensor_type}"
         self._attr_name = name
         self._attr_device_info = {
@@ -91,6 +101,8 @@ class BMWWallboxSensorBase(CoordinatorEntity, SensorEntity):
 class BMWWallboxStatusSensor(BMWWallboxSensorBase):
     """User-friendly status sensor showing clear charging status."""
 
+    _data_keys = frozenset({"connected", "charging_state", "power", "transaction_id"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "status", "Status")
         self._attr_icon = "mdi:ev-station"
@@ -99,10 +111,10 @@ class BMWWallboxStatusSensor(BMWWallboxSensorBase):
     def native_value(self) -> str:
         """Return user-friendly status based on current state."""
         # Check if wallbox is connected to Home Assistant via OCPP
-        wallbox_connected = self.coordinator.data.get("connected", False)
-        charging_state = self.coordinator.data.get("charging_state")
-        power = self.coordinator.data.get("power", 0)
-        transaction_id = self.coordinator.data.get("transaction_id")
+        wallbox_connected = self.coordinator.data.connected
+        charging_state = self.coordinator.data.charging_state
+        power = self.coordinator.data.power
+        transaction_id = self.coordinator.data.transaction_id
 
         # If wallbox is offline, show that clearly
         if not wallbox_connected:
@@ -154,10 +166,10 @@ class BMWWallboxStatusSensor(BMWWallboxSensorBase):
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return detailed attributes for power users."""
         return {
-            "ocpp_state": self.coordinator.data.get("charging_state"),
-            "power_w": self.coordinator.data.get("power"),
-            "transaction_id": self.coordinator.data.get("transaction_id"),
-            "wallbox_online": self.coordinator.data.get("connected"),
+            "ocpp_state": self.coordinator.data.charging_state,
+            "power_w": self.coordinator.data.power,
+            "transaction_id": self.coordinator.data.transaction_id,
+            "wallbox_online": self.coordinator.data.connected,
         }
 
 
@@ -169,6 +181,8 @@ class BMWWallboxStatusSensor(BMWWallboxSensorBase):
 class BMWWallboxPowerSensor(BMWWallboxSensorBase):
     """Current power draw sensor (W)."""
 
+    _data_keys = frozenset({"power"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "power", "Power")
         self._attr_device_class = SensorDeviceClass.POWER
@@ -180,7 +194,7 @@ class BMWWallboxPowerSensor(BMWWallboxSensorBase):
     @property
     def native_value(self) -> float | None:
         """Return power in watts."""
-        return self.coordinator.data.get("power")
+        return self.coordinator.data.power
 
 
 class BMWWallboxEnergyTotalSensor(BMWWallboxSensorBase):
@@ -190,6 +204,8 @@ class BMWWallboxEnergyTotalSensor(BMWWallboxSensorBase):
     Perfect for tracking lifetime energy consumption in the Energy Dashboard.
     """
 
+    _data_keys = frozenset({"energy_total"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "energy_total", "Energy Total")
         self._attr_device_class = SensorDeviceClass.ENERGY
@@ -201,12 +217,49 @@ class BMWWallboxEnergyTotalSensor(BMWWallboxSensorBase):
     @property
     def native_value(self) -> float | None:
         """Return energy in kWh."""
-        return self.coordinator.data.get("energy_total")
+        return self.coordinator.data.energy_total
+
+
+class BMWWallboxLastSessionEnergySensor(BMWWallboxSensorBase):
+    """Energy charged in the last finished session (kWh), from the session ledger."""
+
+    _data_keys = frozenset({"last_session_energy"})
+
+    def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
+        super().__init__(
+            coordinator, entry, "last_session_energy", "Last Session Energy"
+        )
+        self._attr_device_class = SensorDeviceClass.ENERGY
+        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+        self._attr_icon = "mdi:history"
+        self._attr_suggested_display_precision = 2
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the energy of the last finished session in kWh."""
+        return self.coordinator.data.last_session_energy
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return details of the last session."""
+        sessions = self.coordinator.sessions
+        session = sessions.last_session if sessions is not None else None
+        if session is None:
+            return None
+        return {
+            "transaction_id": session.transaction_id,
+            "started": session.started,
+            "ended": session.ended,
+            "duration": session.duration,
+            "stop_reason": session.stop_reason,
+        }
 
 
 class BMWWallboxCurrentSensor(BMWWallboxSensorBase):
     """Current sensor (A) - calculated from power when not directly reported."""
 
+    _data_keys = frozenset({"current", "current_l1", "current_l2", "current_l3"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "current", "Current")
         self._attr_device_class = SensorDeviceClass.CURRENT
@@ -218,7 +271,7 @@ class BMWWallboxCurrentSensor(BMWWallboxSensorBase):
     @property
     def native_value(self) -> float | None:
         """Return current in amperes (calculated from power if not reported)."""
-        value = self.coordinator.data.get("current")
+        value = self.coordinator.data.current
         if value is None or value == 0:
             return None
         return value
@@ -226,20 +279,23 @@ class BMWWallboxCurrentSensor(BMWWallboxSensorBase):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra attributes."""
+        data = self.coordinator.data
         attrs = {}
         # Show per-phase currents if available
-        if self.coordinator.data.get("current_l1"):
-            attrs["L1"] = self.coordinator.data.get("current_l1")
-        if self.coordinator.data.get("current_l2"):
-            attrs["L2"] = self.coordinator.data.get("current_l2")
-        if self.coordinator.data.get("current_l3"):
-            attrs["L3"] = self.coordinator.data.get("current_l3")
+        if data.current_l1:
+            attrs["L1"] = data.current_l1
+        if data.current_l2:
+            attrs["L2"] = data.current_l2
+        if data.current_l3:
+            attrs["L3"] = data.current_l3
         return attrs
 
 
 class BMWWallboxVoltageSensor(BMWWallboxSensorBase):
     """Voltage sensor (V) - uses typical grid voltage when not reported."""
 
+    _data_keys = frozenset({"voltage", "voltage_l1", "voltage_l2", "voltage_l3"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "voltage", "Voltage")
         self._attr_device_class = SensorDeviceClass.VOLTAGE
@@ -251,7 +307,7 @@ class BMWWallboxVoltageSensor(BMWWallboxSensorBase):
     @property
     def native_value(self) -> float | None:
         """Return voltage in volts (230V assumed if not reported)."""
-        value = self.coordinator.data.get("voltage")
+        value = self.coordinator.data.voltage
         if value is None or value == 0:
             return None
         return value
@@ -259,14 +315,15 @@ class BMWWallboxVoltageSensor(BMWWallboxSensorBase):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra attributes."""
+        data = self.coordinator.data
         attrs = {}
         # Show per-phase voltages if available
-        if self.coordinator.data.get("voltage_l1"):
-            attrs["L1"] = self.coordinator.data.get("voltage_l1")
-        if self.coordinator.data.get("voltage_l2"):
-            attrs["L2"] = self.coordinator.data.get("voltage_l2")
-        if self.coordinator.data.get("voltage_l3"):
-            attrs["L3"] = self.coordinator.data.get("voltage_l3")
+        if data.voltage_l1:
+            attrs["L1"] = data.voltage_l1
+        if data.voltage_l2:
+            attrs["L2"] = data.voltage_l2
+        if data.voltage_l3:
+            attrs["L3"] = data.voltage_l3
         return attrs
 
 
@@ -293,6 +350,8 @@ class BMWWallboxStateSensor(BMWWallboxSensorBase):
         "Faulted": "Faulted",
     }
 
+    _data_keys = frozenset({"connected", "charging_state", "transaction_id"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "state", "OCPP State")
         self._attr_icon = "mdi:state-machine"
@@ -301,10 +360,10 @@ class BMWWallboxStateSensor(BMWWallboxSensorBase):
     def native_value(self) -> str | None:
         """Return user-friendly OCPP state (may be stale if wallbox offline)."""
         # Show "Offline" if wallbox is disconnected
-        if not self.coordinator.data.get("connected", False):
+        if not self.coordinator.data.connected:
             return "Wallbox Offline"
 
-        raw_state = self.coordinator.data.get("charging_state")
+        raw_state = self.coordinator.data.charging_state
         return self.STATE_MAP.get(raw_state, raw_state)
 
     @property
@@ -327,14 +386,16 @@ class BMWWallboxStateSensor(BMWWallboxSensorBase):
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional attributes including raw OCPP state."""
         return {
-            "ocpp_state": self.coordinator.data.get("charging_state"),
-            "transaction_id": self.coordinator.data.get("transaction_id"),
+            "ocpp_state": self.coordinator.data.charging_state,
+            "transaction_id": self.coordinator.data.transaction_id,
         }
 
 
 class BMWWallboxConnectorStatusSensor(BMWWallboxSensorBase):
     """Connector status sensor - from StatusNotification."""
 
+    _data_keys = frozenset({"connector_status", "charging_state"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "connector_status", "Connector Status")
         self._attr_icon = "mdi:ev-plug-type2"
@@ -342,10 +403,10 @@ class BMWWallboxConnectorStatusSensor(BMWWallboxSensorBase):
     @property
     def native_value(self) -> str | None:
         """Return connector status."""
-        status = self.coordinator.data.get("connector_status")
+        status = self.coordinator.data.connector_status
         # Don't show "Unknown" - derive from charging state if needed
         if status == "Unknown":
-            charging_state = self.coordinator.data.get("charging_state")
+            charging_state = self.coordinator.data.charging_state
             if charging_state in [
                 "Charging",
                 "SuspendedEV",
@@ -373,6 +434,8 @@ class BMWWallboxConnectorStatusSensor(BMWWallboxSensorBase):
 class BMWWallboxTransactionIDSensor(BMWWallboxSensorBase):
     """Transaction ID sensor - useful for tracking charging sessions."""
 
+    _data_keys = frozenset({"transaction_id"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "transaction_id", "Transaction ID")
         self._attr_icon = "mdi:identifier"
@@ -380,12 +443,14 @@ class BMWWallboxTransactionIDSensor(BMWWallboxSensorBase):
     @property
     def native_value(self) -> str | None:
         """Return transaction ID."""
-        return self.coordinator.data.get("transaction_id")
+        return self.coordinator.data.transaction_id
 
 
 class BMWWallboxStoppedReasonSensor(BMWWallboxSensorBase):
     """Stopped reason sensor - shows why charging stopped."""
 
+    _data_keys = frozenset({"stopped_reason"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "stopped_reason", "Stopped Reason")
         self._attr_icon = "mdi:information"
@@ -393,7 +458,7 @@ class BMWWallboxStoppedReasonSensor(BMWWallboxSensorBase):
     @property
     def native_value(self) -> str | None:
         """Return stopped reason."""
-        return self.coordinator.data.get("stopped_reason")
+        return self.coordinator.data.stopped_reason
 
 
 # ============================================================================
@@ -404,6 +469,8 @@ class BMWWallboxStoppedReasonSensor(BMWWallboxSensorBase):
 class BMWWallboxEventTypeSensor(BMWWallboxSensorBase):
     """Event type sensor (Started, Updated, Ended)."""
 
+    _data_keys = frozenset({"event_type"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "event_type", "Event Type")
         self._attr_icon = "mdi:calendar-clock"
@@ -411,12 +478,14 @@ class BMWWallboxEventTypeSensor(BMWWallboxSensorBase):
     @property
     def native_value(self) -> str | None:
         """Return event type."""
-        return self.coordinator.data.get("event_type")
+        return self.coordinator.data.event_type
 
 
 class BMWWallboxTriggerReasonSensor(BMWWallboxSensorBase):
     """Trigger reason sensor (e.g., MeterValuePeriodic, ChargingStateChanged)."""
 
+    _data_keys = frozenset({"trigger_reason"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "trigger_reason", "Trigger Reason")
         self._attr_icon = "mdi:information"
@@ -424,7 +493,7 @@ class BMWWallboxTriggerReasonSensor(BMWWallboxSensorBase):
     @property
     def native_value(self) -> str | None:
         """Return trigger reason."""
-        return self.coordinator.data.get("trigger_reason")
+        return self.coordinator.data.trigger_reason
 
 
 # ============================================================================
@@ -435,6 +504,8 @@ class BMWWallboxTriggerReasonSensor(BMWWallboxSensorBase):
 class BMWWallboxIDTokenSensor(BMWWallboxSensorBase):
     """ID Token sensor (RFID card identifier)."""
 
+    _data_keys = frozenset({"id_token", "id_token_type"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "id_token", "ID Token")
         self._attr_icon = "mdi:card-account-details"
@@ -442,19 +513,21 @@ class BMWWallboxIDTokenSensor(BMWWallboxSensorBase):
     @property
     def native_value(self) -> str | None:
         """Return ID token."""
-        return self.coordinator.data.get("id_token")
+        return self.coordinator.data.id_token
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return ID token type."""
         return {
-            "type": self.coordinator.data.get("id_token_type", "Unknown"),
+            "type": self.coordinator.data.id_token_type,
         }
 
 
 class BMWWallboxPhasesUsedSensor(BMWWallboxSensorBase):
     """Phases used sensor - number of phases currently in use."""
 
+    _data_keys = frozenset({"phases_used"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "phases_used", "Phases Used")
         self._attr_icon = "mdi:sine-wave"
@@ -463,12 +536,14 @@ class BMWWallboxPhasesUsedSensor(BMWWallboxSensorBase):
     @property
     def native_value(self) -> int | None:
         """Return number of phases used."""
-        return self.coordinator.data.get("phases_used")
+        return self.coordinator.data.phases_used
 
 
 class BMWWallboxSequenceNumberSensor(BMWWallboxSensorBase):
     """Sequence number sensor - transaction event sequence."""
 
+    _data_keys = frozenset({"sequence_number"})
+
     def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, "sequence_number", "Sequence Number")
         self._attr_icon = "mdi:counter"
@@ -477,4 +552,74 @@ class BMWWallboxSequenceNumberSensor(BMWWallboxSensorBase):
     @property
     def native_value(self) -> int | None:
         """Return sequence number."""
-        return self.coordinator.data.get("sequence_number")
+        return self.coordinator.data.sequence_number
+
+
+class BMWWallboxLimitLatencySensor(BMWWallboxSensorBase):
+    """Round trip of the last current limit update (ms), with the queue depth."""
+
+    _data_keys = frozenset({"limit_latency", "limit_queue_depth"})
+
+    def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
+        super().__init__(
+            coordinator, entry, "limit_latency", "Current Limit Command Latency"
+        )
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_icon = "mdi:timer-outline"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the latency of the last SetChargingProfile pair in ms."""
+        return self.coordinator.data.limit_latency
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the number of limit updates waiting to be sent."""
+        return {"queue_depth": self.coordinator.data.limit_queue_depth}
+
+
+class BMWWallboxLinkRttSensor(BMWWallboxSensorBase):
+    """Smoothed WebSocket ping round trip to the wallbox (ms)."""
+
+    _data_keys = frozenset({"link_rtt"})
+
+    def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
+        super().__init__(coordinator, entry, "link_rtt", "Connection Round Trip")
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_icon = "mdi:lan-pending"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the smoothed ping round trip in ms."""
+        return self.coordinator.data.link_rtt
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the ping counters of the current connection."""
+        liveness = self.coordinator.liveness
+        return {"pings": liveness.pings, "lost_pings": liveness.lost_pings}
+
+
+class BMWWallboxLinkJitterSensor(BMWWallboxSensorBase):
+    """Variation of the WebSocket ping round trip to the wallbox (ms)."""
+
+    _data_keys = frozenset({"link_jitter"})
+
+    def __init__(self, coordinator: BMWWallboxCoordinator, entry: ConfigEntry) -> None:
+        super().__init__(coordinator, entry, "link_jitter", "Connection Jitter")
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_icon = "mdi:lan-pending"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the ping round trip jitter in ms."""
+        return self.coordinator.data.link_jitter
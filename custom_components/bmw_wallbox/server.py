@@ -0,0 +1,317 @@
+"""Shared OCPP WebSocket server for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+
+Every config entry on the same port shares one TLS listener. Wallboxes connect
+to `wss://<host>:<port>/<charge_point_id>` and are routed by that path to the
+coordinator of the matching config entry. A port with a single entry accepts
+any path (installations from before shared listeners may use an ID that
+differs from the configured one). With several entries, unknown IDs are
+rejected during the WebSocket handshake, before any OCPP traffic, and a
+repair issue tells the user which ID the wallbox used.
+
+TLS contexts are cached per certificate/key pair and reused across entries and
+reloads. When the files change on disk (e.g. a Let's Encrypt renewal) a new
+context is loaded and new handshakes switch to it without restarting the
+listener.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from functools import partial
+from http import HTTPStatus
+import logging
+import os
+import ssl
+from typing import TYPE_CHECKING, Any
+from urllib.parse import unquote, urlsplit
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.event import async_track_time_interval
+import websockets
+
+from .const import DATA_SERVERS, DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import BMWWallboxCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# How often a running listener checks its certificate files for renewal
+TLS_CHECK_INTERVAL = timedelta(hours=1)
+
+# (cert path, key path) -> ((cert mtime, key mtime), context). Module level so
+# it survives config entry reloads; certificates are only parsed when changed.
+_TLS_CONTEXTS: dict[tuple[str, str], tuple[tuple[int, int], ssl.SSLContext]] = {}
+
+
+def _tls_mtimes(ssl_cert: str, ssl_key: str) -> tuple[int, int]:
+    """Return the modification times of the certificate and key files."""
+    return os.stat(ssl_cert).st_mtime_ns, os.stat(ssl_key).st_mtime_ns
+
+
+def _load_tls_context(ssl_cert: str, ssl_key: str) -> ssl.SSLContext:
+    """Build a server TLS context (blocking, run in the executor)."""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(ssl_cert, ssl_key)
+    context.sni_callback = partial(_use_latest_tls_context, (ssl_cert, ssl_key))
+    return context
+
+
+def _use_latest_tls_context(
+    paths: tuple[str, str],
+    ssl_object: ssl.SSLObject,
+    server_name: str | None,
+    context: ssl.SSLContext,
+) -> None:
+    """Switch a handshake on an outdated context to the newest certificate.
+
+    The listener keeps the context it was started with; this callback runs
+    early in every handshake and swaps in the current one from the cache.
+    """
+    cached = _TLS_CONTEXTS.get(paths)
+    if cached is not None and cached[1] is not context:
+        ssl_object.context = cached[1]
+
+
+async def async_get_ssl_context(
+    hass: HomeAssistant, ssl_cert: str, ssl_key: str
+) -> ssl.SSLContext:
+    """Return the TLS context for a certificate, reloading it if it changed."""
+    paths = (ssl_cert, ssl_key)
+    mtimes = await hass.async_add_executor_job(_tls_mtimes, ssl_cert, ssl_key)
+    cached = _TLS_CONTEXTS.get(paths)
+    if cached is not None and cached[0] == mtimes:
+        return cached[1]
+
+    context = await hass.async_add_executor_job(_load_tls_context, ssl_cert, ssl_key)
+    _TLS_CONTEXTS[paths] = (mtimes, context)
+    if cached is not None:
+        _LOGGER.info("🔐 Certificate %s changed on disk, reloaded", ssl_cert)
+    return context
+
+
+def charge_point_id_from_path(path: str) -> str:
+    """Return the charge point ID from a WebSocket request path.
+
+    The ID is the last path segment, so both `/DE*BMW*123` and
+    `/ocpp/DE*BMW*123` resolve to `DE*BMW*123`.
+    """
+    return unquote(urlsplit(path).path.rstrip("/").rsplit("/", 1)[-1])
+
+
+class OCPPServer:
+    """One TLS WebSocket listener shared by every wallbox on a port."""
+
+    def __init__(
+        self, hass: HomeAssistant, port: int, ssl_cert: str, ssl_key: str
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.port = port
+        self.ssl_cert = ssl_cert
+        self.ssl_key = ssl_key
+        self.charge_points: dict[str, BMWWallboxCoordinator] = {}
+        self._mismatches_logged: set[str] = set()
+        self._server = None
+        self._lock = asyncio.Lock()
+        self._unsub_tls_check: CALLBACK_TYPE | None = None
+
+    def register(
+        self, charge_point_id: str, coordinator: BMWWallboxCoordinator
+    ) -> None:
+        """Route connections for charge_point_id to coordinator."""
+        if charge_point_id in self.charge_points:
+            raise ValueError(
+                f"Charge point {charge_point_id} is already registered on port {self.port}"
+            )
+        self.charge_points[charge_point_id] = coordinator
+        # The new entry may be the one the rejected wallbox was looking for
+        ir.async_delete_issue(self.hass, DOMAIN, self.issue_id)
+
+    @property
+    def issue_id(self) -> str:
+        """Return the repair issue ID for rejected connections on this port."""
+        return f"unknown_charge_point_{self.port}"
+
+    def route(self, path: str) -> tuple[str, BMWWallboxCoordinator | None]:
+        """Return the charge point ID of a request path and its coordinator.
+
+        A port with a single entry takes every connection, whatever its path.
+        """
+        charge_point_id = charge_point_id_from_path(path)
+        coordinator = self.charge_points.get(charge_point_id)
+        if coordinator is None and len(self.charge_points) == 1:
+            [(configured, coordinator)] = self.charge_points.items()
+            if charge_point_id not in self._mismatches_logged:
+                self._mismatches_logged.add(charge_point_id)
+                _LOGGER.warning(
+                    "Wallbox connected on port %s as %r, but the configured "
+                    "charge point ID is %r; routing it there anyway (only "
+                    "needed to match when several wallboxes share the port)",
+                    self.port,
+                    charge_point_id,
+                    configured,
+                )
+        return charge_point_id, coordinator
+
+    def unregister(self, charge_point_id: str) -> None:
+        """Stop routing connections for charge_point_id."""
+        self.charge_points.pop(charge_point_id, None)
+
+    async def async_start(self) -> None:
+        """Bind the listener if it is not running yet."""
+        async with self._lock:
+            if self._server is not None:
+                # Another entry on this port (re)loaded; use the chance to
+                # pick up a renewed certificate
+                await self._async_check_tls()
+                return
+
+            ssl_context = await async_get_ssl_context(
+                self.hass, self.ssl_cert, self.ssl_key
+            )
+
+            self._server = await websockets.serve(
+                self._on_connect,
+                "0.0.0.0",
+                self.port,
+                subprotocols=["ocpp2.0.1"],
+                ssl=ssl_context,
+                process_request=self._process_request,
+                # Each coordinator pings its wallbox itself (see watchdog.py)
+                ping_interval=None,
+            )
+            _LOGGER.info("OCPP server listening on port %s", self.port)
+            self._unsub_tls_check = async_track_time_interval(
+                self.hass, self._async_check_tls, TLS_CHECK_INTERVAL
+            )
+
+    async def async_stop(self) -> None:
+        """Close the listener and every connection on it."""
+        async with self._lock:
+            if self._server is None:
+                return
+            if self._unsub_tls_check is not None:
+                self._unsub_tls_check()
+                self._unsub_tls_check = None
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            ir.async_delete_issue(self.hass, DOMAIN, self.issue_id)
+            _LOGGER.info("OCPP server on port %s stopped", self.port)
+
+    async def _async_check_tls(self, _now: datetime | None = None) -> None:
+        """Pick up renewed certificate files without restarting the listener."""
+        try:
+            await async_get_ssl_context(self.hass, self.ssl_cert, self.ssl_key)
+        except (OSError, ssl.SSLError) as err:
+            # Files may be mid-rotation; keep serving the current certificate
+            _LOGGER.warning(
+                "Could not reload certificate %s, keeping the current one: %s",
+                self.ssl_cert,
+                err,
+            )
+
+    async def _process_request(self, connection_or_path: Any, request: Any) -> Any:
+        """Reject handshakes for charge point IDs no config entry owns.
+
+        Supports both websockets APIs: the asyncio implementation passes
+        (connection, request), the legacy one passes (path, request_headers).
+        """
+        legacy = isinstance(connection_or_path, str)
+        path = connection_or_path if legacy else request.path
+        charge_point_id, coordinator = self.route(path)
+        if coordinator is not None:
+            return None
+
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            self.issue_id,
+            is_fixable=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="unknown_charge_point",
+            translation_placeholders={
+                "port": str(self.port),
+                "charge_point_id": charge_point_id,
+                "configured": ", ".join(self.charge_points) or "none",
+            },
+        )
+        _LOGGER.warning(
+            "Rejected connection on port %s from unknown charge point %r "
+            "(configured: %s)",
+            self.port,
+            charge_point_id,
+            ", ".join(self.charge_points) or "none",
+        )
+        body = f"Unknown charge point: {charge_point_id}\n"
+        if legacy:
+            return HTTPStatus.NOT_FOUND, [], body.encode()
+        return connection_or_path.respond(HTTPStatus.NOT_FOUND, body)
+
+    async def _on_connect(self, websocket) -> None:
+        """Hand a new wallbox connection to its coordinator."""
+        # Get path from websocket for newer websockets library
+        path = (
+            websocket.request.path if hasattr(websocket, "request") else websocket.path
+        )
+        charge_point_id, coordinator = self.route(path)
+        if coordinator is None:
+            # Entry was unloaded between the handshake and now
+            await websocket.close()
+            return
+        await coordinator.async_handle_connection(charge_point_id, websocket)
+
+
+async def async_get_server(
+    hass: HomeAssistant,
+    port: int,
+    ssl_cert: str,
+    ssl_key: str,
+    charge_point_id: str,
+    coordinator: BMWWallboxCoordinator,
+) -> OCPPServer:
+    """Register a coordinator on the shared server for port, starting it if needed."""
+    servers: dict[int, OCPPServer] = hass.data.setdefault(DATA_SERVERS, {})
+    server = servers.get(port)
+    if server is None:
+        server = servers[port] = OCPPServer(hass, port, ssl_cert, ssl_key)
+    elif (server.ssl_cert, server.ssl_key) != (ssl_cert, ssl_key):
+        _LOGGER.warning(
+            "Port %s is already serving certificate %s; ignoring %s for %s",
+            port,
+            server.ssl_cert,
+            ssl_cert,
+            charge_point_id,
+        )
+
+    server.register(charge_point_id, coordinator)
+    try:
+        await server.async_start()
+    except Exception:
+        server.unregister(charge_point_id)
+        if not server.charge_points:
+            servers.pop(port, None)
+        raise
+    return server
+
+
+async def async_release_server(
+    hass: HomeAssistant, port: int, charge_point_id: str
+) -> None:
+    """Unregister a charge point, closing the server when it was the last one."""
+    servers: dict[int, OCPPServer] = hass.data.get(DATA_SERVERS, {})
+    server = servers.get(port)
+    if server is None:
+        return
+
+    server.unregister(charge_point_id)
+    if not server.charge_points:
+        servers.pop(port, None)
+        await server.async_stop()
@@ -0,0 +1,265 @@
+"""Services for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+import voluptuous as vol
+
+from .const import CONF_CHARGE_POINT_ID, CONF_MAX_CURRENT, DEFAULT_MAX_CURRENT, DOMAIN
+from .schedule import RECURRENCIES, tariff_periods
+from .timeseries import TIER_RAW, TIERS
+
+if TYPE_CHECKING:
+    from .coordinator import BMWWallboxCoordinator
+
+SERVICE_GET_SESSIONS = "get_sessions"
+SERVICE_GET_METER_HISTORY = "get_meter_history"
+SERVICE_SET_CHARGING_SCHEDULE = "set_charging_schedule"
+SERVICE_CLEAR_CHARGING_SCHEDULE = "clear_charging_schedule"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_SINCE = "since"
+ATTR_LIMIT = "limit"
+ATTR_KEY = "key"
+ATTR_TIER = "tier"
+ATTR_PERIODS = "periods"
+ATTR_START = "start"
+ATTR_PRICE = "price"
+ATTR_MAX_PRICE = "max_price"
+ATTR_END = "end"
+ATTR_RECURRENCY = "recurrency"
+
+GET_SESSIONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_SINCE): cv.datetime,
+        vol.Optional(ATTR_LIMIT): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+GET_METER_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_KEY, default="power"): cv.string,
+        vol.Optional(ATTR_TIER, default=TIER_RAW): vol.In(TIERS),
+        vol.Optional(ATTR_SINCE): cv.datetime,
+    }
+)
+
+PERIOD_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Exclusive(ATTR_LIMIT, "period"): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Exclusive(ATTR_PRICE, "period"): vol.Coerce(float),
+    },
+    extra=vol.REMOVE_EXTRA,
+)
+
+SET_CHARGING_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_PERIODS): vol.All(
+            cv.ensure_list, [PERIOD_SCHEMA], vol.Length(min=1)
+        ),
+        vol.Optional(ATTR_MAX_PRICE): vol.Coerce(float),
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_RECURRENCY): vol.In(list(RECURRENCIES)),
+    }
+)
+
+CLEAR_CHARGING_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+
+def _coordinators(
+    hass: HomeAssistant, entry_id: str | None
+) -> dict[str, BMWWallboxCoordinator]:
+    """Return the coordinators a service call targets (all if no entry given)."""
+    coordinators: dict[str, BMWWallboxCoordinator] = hass.data.get(DOMAIN, {})
+    if entry_id is None:
+        return coordinators
+    if entry_id not in coordinators:
+        raise ServiceValidationError(f"No BMW Wallbox config entry {entry_id}")
+    return {entry_id: coordinators[entry_id]}
+
+
+def get_sessions(hass: HomeAssistant, data: dict[str, Any]) -> ServiceResponse:
+    """Return finished charging sessions, newest first."""
+    since = data.get(ATTR_SINCE)
+    if since is not None:
+        since = dt_util.as_utc(since)
+
+    sessions = []
+    for entry_id, coordinator in _coordinators(
+        hass, data.get(ATTR_CONFIG_ENTRY_ID)
+    ).items():
+        if coordinator.sessions is None:
+            continue
+        sessions.extend(
+            {
+                "config_entry_id": entry_id,
+                "charge_point_id": coordinator.config[CONF_CHARGE_POINT_ID],
+                **session.as_dict(),
+            }
+            for session in coordinator.sessions.sessions(
+                since=since, limit=data.get(ATTR_LIMIT)
+            )
+        )
+
+    sessions.sort(key=lambda session: session["started"], reverse=True)
+    if ATTR_LIMIT in data:
+        sessions = sessions[: data[ATTR_LIMIT]]
+    return {"sessions": sessions}
+
+
+def get_meter_history(hass: HomeAssistant, data: dict[str, Any]) -> ServiceResponse:
+    """Return the meter history of one data key (e.g. power) in a tier.
+
+    Raw points are [time, value]; 1m/15m points are [time, min, max, avg].
+    A `since` without a timezone is local time.
+    """
+    since = data.get(ATTR_SINCE)
+    if since is not None:
+        since = dt_util.as_utc(since).timestamp()
+    key = data.get(ATTR_KEY, "power")
+    tier = data.get(ATTR_TIER, TIER_RAW)
+
+    return {
+        "series": [
+            {
+                "config_entry_id": entry_id,
+                "charge_point_id": coordinator.config[CONF_CHARGE_POINT_ID],
+                "key": key,
+                "tier": tier,
+                "points": [
+                    [dt_util.utc_from_timestamp(point[0]).isoformat(), *point[1:]]
+                    for point in coordinator.meter_history.items(key, tier, since)
+                ],
+            }
+            for entry_id, coordinator in _coordinators(
+                hass, data.get(ATTR_CONFIG_ENTRY_ID)
+            ).items()
+        ]
+    }
+
+
+async def set_charging_schedule(hass: HomeAssistant, data: dict[str, Any]) -> None:
+    """Upload a multi-period charging schedule built from limits or prices.
+
+    Times without a timezone are local time.
+    """
+    entries = [
+        {**period, ATTR_START: dt_util.as_utc(period[ATTR_START])}
+        for period in data[ATTR_PERIODS]
+    ]
+    end = data.get(ATTR_END)
+    if end is not None:
+        end = dt_util.as_utc(end)
+
+    for coordinator in _coordinators(hass, data.get(ATTR_CONFIG_ENTRY_ID)).values():
+        max_limit = coordinator.config.get(CONF_MAX_CURRENT, DEFAULT_MAX_CURRENT)
+        try:
+            periods = tariff_periods(entries, max_limit, data.get(ATTR_MAX_PRICE))
+            accepted = await coordinator.async_set_charging_schedule(
+                periods, end=end, recurrency=data.get(ATTR_RECURRENCY)
+            )
+        except ValueError as err:
+            raise ServiceValidationError(str(err)) from err
+        if not accepted:
+            raise HomeAssistantError(
+                f"Wallbox {coordinator.config[CONF_CHARGE_POINT_ID]} did not "
+                "accept the charging schedule"
+            )
+
+
+async def clear_charging_schedule(hass: HomeAssistant, data: dict[str, Any]) -> None:
+    """Remove the uploaded charging schedule."""
+    for coordinator in _coordinators(hass, data.get(ATTR_CONFIG_ENTRY_ID)).values():
+        if not await coordinator.async_clear_charging_schedule():
+            raise HomeAssistantError(
+                f"Could not clear the charging schedule of wallbox "
+                f"{coordinator.config[CONF_CHARGE_POINT_ID]}"
+            )
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services (once for all entries)."""
+    if hass.services.has_service(DOMAIN, SERVICE_GET_SESSIONS):
+        return
+
+    async def async_get_sessions(call: ServiceCall) -> ServiceResponse:
+        """Handle the get_sessions service."""
+        return get_sessions(hass, call.data)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SESSIONS,
+        async_get_sessions,
+        schema=GET_SESSIONS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_get_meter_history(call: ServiceCall) -> ServiceResponse:
+        """Handle the get_meter_history service."""
+        return get_meter_history(hass, call.data)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_METER_HISTORY,
+        async_get_meter_history,
+        schema=GET_METER_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_set_charging_schedule(call: ServiceCall) -> None:
+        """Handle the set_charging_schedule service."""
+        await set_charging_schedule(hass, call.data)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_CHARGING_SCHEDULE,
+        async_set_charging_schedule,
+        schema=SET_CHARGING_SCHEDULE_SCHEMA,
+    )
+
+    async def async_clear_charging_schedule(call: ServiceCall) -> None:
+        """Handle the clear_charging_schedule service."""
+        await clear_charging_schedule(hass, call.data)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CLEAR_CHARGING_SCHEDULE,
+        async_clear_charging_schedule,
+        schema=CLEAR_CHARGING_SCHEDULE_SCHEMA,
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the integration services once the last entry is unloaded."""
+    hass.services.async_remove(DOMAIN, SERVICE_GET_SESSIONS)
+    hass.services.async_remove(DOMAIN, SERVICE_GET_METER_HISTORY)
+    hass.services.async_remove(DOMAIN, SERVICE_SET_CHARGING_SCHEDULE)
+    hass.services.async_remove(DOMAIN, SERVICE_CLEAR_CHARGING_SCHEDULE)
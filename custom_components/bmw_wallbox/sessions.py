@@ -0,0 +1,294 @@
+"""Charging session history for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+
+A small ledger of finished charging sessions built from TransactionEvent
+Started/Updated/Ended: start and stop energy register, duration, stop reason
+and a downsampled power curve. It lives in `.storage/bmw_wallbox.<entry_id>.sessions`
+and keeps the last MAX_SESSIONS sessions, so per-session reports don't need to
+scan weeks of recorder history.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Write-behind delay for the ledger file (seconds)
+SAVE_DELAY = 60
+# Finished sessions kept; the oldest is dropped when a new one is added
+MAX_SESSIONS = 500
+# Initial power curve resolution (seconds per point)
+CURVE_RESOLUTION = 60
+# Longest curve kept per session; beyond this the resolution is halved
+MAX_CURVE_POINTS = 240
+
+
+@dataclass(slots=True)
+class ChargingSession:
+    """One charging session (transaction) as recorded by the ledger.
+
+    `power_curve` holds the average power (W) of consecutive `curve_step`
+    second buckets from `started`; None marks buckets without samples.
+    """
+
+    transaction_id: str
+    started: str  # ISO 8601
+    start_energy: float | None  # kWh register at start
+    stop_energy: float | None = None  # kWh register at stop (latest while active)
+    ended: str | None = None  # ISO 8601, None while active
+    last_seen: str | None = None  # ISO 8601 of the latest event
+    stop_reason: str | None = None
+    curve_step: int = CURVE_RESOLUTION
+    power_curve: list[int | None] = field(default_factory=list)
+    # Current, not yet complete curve bucket (not stored)
+    _bucket: int = field(default=0, repr=False, compare=False)
+    _bucket_sum: float = field(default=0.0, repr=False, compare=False)
+    _bucket_count: int = field(default=0, repr=False, compare=False)
+
+    @property
+    def energy(self) -> float | None:
+        """Return the energy charged in kWh."""
+        if self.start_energy is None or self.stop_energy is None:
+            return None
+        return round(max(self.stop_energy - self.start_energy, 0.0), 3)
+
+    @property
+    def duration(self) -> float | None:
+        """Return the session length in seconds (None while active)."""
+        if self.ended is None:
+            return None
+        return (
+            dt_util.parse_datetime(self.ended) - dt_util.parse_datetime(self.started)
+        ).total_seconds()
+
+    def add_sample(self, timestamp: datetime, power: float | None) -> None:
+        """Add a power reading to the downsampled curve."""
+        if power is None:
+            return
+        offset = (timestamp - dt_util.parse_datetime(self.started)).total_seconds()
+        bucket = max(int(offset // self.curve_step), 0)
+        if bucket < self._bucket:
+            return  # late sample for an already closed bucket
+        if bucket != self._bucket and self._bucket_count:
+            self._close_bucket()
+        self._bucket = max(bucket, self._bucket)
+        self._bucket_sum += power
+        self._bucket_count += 1
+
+    def finish(self) -> None:
+        """Flush the open curve bucket once the session has ended."""
+        if self._bucket_count:
+            self._close_bucket()
+
+    def _close_bucket(self) -> None:
+        """Append the open bucket, padding gaps and halving resolution if full."""
+        gap = self._bucket - len(self.power_curve)
+        self.power_curve.extend([None] * max(gap, 0))
+        self.power_curve.append(round(self._bucket_sum / self._bucket_count))
+        self._bucket_sum, self._bucket_count = 0.0, 0
+        while len(self.power_curve) > MAX_CURVE_POINTS:
+            self._halve_resolution()
+
+    def _halve_resolution(self) -> None:
+        """Merge neighbouring curve points, doubling curve_step."""
+        merged: list[int | None] = []
+        for i in range(0, len(self.power_curve), 2):
+            pair = [p for p in self.power_curve[i : i + 2] if p is not None]
+            merged.append(round(sum(pair) / len(pair)) if pair else None)
+        self.power_curve = merged
+        self.curve_step *= 2
+        self._bucket //= 2
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stored representation plus derived energy and duration."""
+        return {
+            **self.to_storage(),
+            "energy": self.energy,
+            "duration": self.duration,
+        }
+
+    def to_storage(self) -> dict[str, Any]:
+        """Return the fields written to the ledger file."""
+        return {
+            key: value for key, value in asdict(self).items() if not key.startswith("_")
+        }
+
+    @classmethod
+    def from_storage(cls, data: dict[str, Any]) -> ChargingSession:
+        """Rebuild a session from the ledger file."""
+        return cls(**data)
+
+
+class SessionLedger:
+    """Bounded, append-only history of charging sessions."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the ledger for a config entry."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.sessions"
+        )
+        self._sessions: deque[ChargingSession] = deque(maxlen=MAX_SESSIONS)
+        self.active: ChargingSession | None = None
+        self._save_pending = False
+
+    @property
+    def last_session(self) -> ChargingSession | None:
+        """Return the most recently finished session."""
+        return self._sessions[-1] if self._sessions else None
+
+    async def async_load(self) -> None:
+        """Load the ledger (empty on first setup)."""
+        stored = await self._store.async_load() or {}
+        self._sessions.extend(
+            ChargingSession.from_storage(s) for s in stored.get("sessions", [])
+        )
+        if stored.get("active"):
+            self.active = ChargingSession.from_storage(stored["active"])
+
+    @callback
+    def async_handle_event(
+        self,
+        event_type: str,
+        transaction_id: str | None,
+        timestamp: datetime,
+        energy: float | None,
+        power: float | None,
+        stop_reason: str | None = None,
+    ) -> ChargingSession | None:
+        """Record a TransactionEvent; return the session it finished, if any."""
+        if not transaction_id:
+            return None
+
+        active = self.active
+        if active is not None and active.transaction_id != transaction_id:
+            # Missed the Ended event (e.g. HA was down); close at its last data
+            _LOGGER.debug("Closing session %s without Ended", active.transaction_id)
+            self._finish(active)
+            active = None
+
+        if active is None:
+            if event_type == "Ended":
+                # Started/Updated never seen: nothing meaningful to record
+                return None
+            # Started, or Updated for a session that began before HA did
+            active = self.active = ChargingSession(
+                transaction_id=transaction_id,
+                started=timestamp.isoformat(),
+                start_energy=energy,
+            )
+
+        active.last_seen = timestamp.isoformat()
+        if energy is not None:
+            if active.start_energy is None:
+                active.start_energy = energy
+            active.stop_energy = energy
+        active.add_sample(timestamp, power)
+
+        if event_type == "Ended":
+            active.ended = timestamp.isoformat()
+            active.stop_reason = stop_reason
+            return self._finish(active)
+
+        self._async_schedule_save()
+        return None
+
+    @callback
+    def async_add_late_sample(
+        self,
+        transaction_id: str | None,
+        timestamp: datetime,
+        energy: float | None,
+        power: float | None,
+    ) -> None:
+        """Add a reading that arrived after newer ones (offline replay).
+
+        Only the active session is updated: the energy range widens to cover
+        the reading, the power curve takes it if its bucket is still open.
+        """
+        active = self.active
+        if active is None or active.transaction_id != transaction_id:
+            return
+        if energy is not None:
+            if active.start_energy is None or energy < active.start_energy:
+                active.start_energy = energy
+            if active.stop_energy is None or energy > active.stop_energy:
+                active.stop_energy = energy
+        active.add_sample(timestamp, power)
+        self._async_schedule_save()
+
+    def sessions(
+        self,
+        since: datetime | None = None,
+        limit: int | None = None,
+    ) -> list[ChargingSession]:
+        """Return finished sessions, newest first.
+
+        Args:
+            since: Only sessions that started at or after this time
+            limit: Return at most this many sessions
+        """
+        result = []
+        for session in reversed(self._sessions):
+            if limit is not None and len(result) >= limit:
+                break
+            if since is not None and dt_util.parse_datetime(session.started) < since:
+                break  # sessions are appended in start order
+            result.append(session)
+        return result
+
+    def _finish(self, session: ChargingSession) -> ChargingSession:
+        """Move the active session to the ledger."""
+        session.finish()
+        if session.ended is None:
+            session.ended = session.last_seen or session.started
+        self._sessions.append(session)
+        self.active = None
+        self._async_schedule_save()
+        _LOGGER.info(
+            "🧾 Session %s finished: %s kWh in %s s (%s)",
+            session.transaction_id,
+            session.energy,
+            session.duration,
+            session.stop_reason,
+        )
+        return session
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Write the ledger after SAVE_DELAY, batching events in between."""
+        # Store restarts the delay on every call; don't re-arm a pending write
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the ledger file contents."""
+        self._save_pending = False
+        return {
+            "sessions": [s.to_storage() for s in self._sessions],
+            "active": self.active.to_storage() if self.active else None,
+        }
+
+    async def async_flush(self) -> None:
+        """Write the ledger now (e.g. when the entry unloads)."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Delete the ledger when the entry is removed."""
+        await self._store.async_remove()
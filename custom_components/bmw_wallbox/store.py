@@ -0,0 +1,81 @@
+"""Persistent wallbox state for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+
+After a Home Assistant restart the wallbox takes a few seconds to reconnect and
+report again. Until then the coordinator would start from empty values - a gap
+in the Energy dashboard and no transaction to target with a current limit.
+This keeps the last energy register, transaction ID, current limit and device
+info in `.storage/bmw_wallbox.<entry_id>` so they are known at setup.
+
+Writes are batched: changes are collected in memory and written at most once
+per SAVE_DELAY (and on Home Assistant shutdown), never per meter sample.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+# Write-behind delay: changes within this window are written together (seconds)
+SAVE_DELAY = 60
+
+# coordinator.data keys that survive a restart
+PERSISTED_KEYS = ("energy_total", "transaction_id", "current_limit")
+
+
+class WallboxStore:
+    """Write-behind store for the state a wallbox entry restores at setup."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store for a config entry."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+        self._data: dict[str, Any] = {}
+        self._save_pending = False
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """Return the state as last loaded or updated."""
+        return self._data
+
+    async def async_load(self) -> dict[str, Any]:
+        """Load the stored state (empty on first setup)."""
+        self._data = await self._store.async_load() or {}
+        return self._data
+
+    @callback
+    def async_update(self, **values: Any) -> None:
+        """Record new values and schedule a write if anything changed."""
+        if all(self._data.get(key) == value for key, value in values.items()):
+            return
+        self._data.update(values)
+        # Don't re-arm a pending write: Store restarts the delay on every
+        # call, which would postpone it forever while samples keep coming
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data for a scheduled write."""
+        self._save_pending = False
+        return self._data
+
+    async def async_flush(self) -> None:
+        """Write pending changes now (e.g. when the entry unloads)."""
+        if self._save_pending:
+            self._save_pending = False
+            await self._store.async_save(self._data)
+
+    async def async_remove(self) -> None:
+        """Delete the stored state when the entry is removed."""
+        await self._store.async_remove()
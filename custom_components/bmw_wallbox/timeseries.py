@@ -0,0 +1,235 @@
+"""In-memory meter history for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+
+Entities only show the latest reading, so a spike between two state writes is
+lost. The coordinator keeps every sampled value here instead: per data key a
+raw ring plus 1-minute and 15-minute min/max/avg tiers. Everything is stored
+in preallocated `array('d')` rings, so memory is fixed per series and adding
+a sample allocates no objects.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+# Tier names used by diagnostics and the get_meter_history service
+TIER_RAW = "raw"
+TIER_1MIN = "1m"
+TIER_15MIN = "15m"
+TIERS = (TIER_RAW, TIER_1MIN, TIER_15MIN)
+
+# Ring sizes per series
+RAW_CAPACITY = 720  # ~2 h of 10 s samples
+MINUTE_CAPACITY = 1440  # 24 h
+QUARTER_CAPACITY = 672  # 7 days
+
+
+def _ring(capacity: int) -> array:
+    """Return a zero-filled array of doubles."""
+    return array("d", bytes(8 * capacity))
+
+
+class RingBuffer:
+    """Fixed-size ring of (timestamp, value) pairs."""
+
+    __slots__ = ("_next", "_size", "_times", "_values", "capacity")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty ring."""
+        self.capacity = capacity
+        self._times = _ring(capacity)
+        self._values = _ring(capacity)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored samples."""
+        return self._size
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Store a sample, overwriting the oldest one when full."""
+        i = self._next
+        self._times[i] = timestamp
+        self._values[i] = value
+        self._next = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def _indices(self) -> range:
+        """Return the positions of the stored samples, oldest first."""
+        start = (self._next - self._size) % self.capacity
+        return range(start, start + self._size)
+
+    def items(self, since: float | None = None) -> list[tuple[float, float]]:
+        """Return (timestamp, value) pairs, oldest first."""
+        cap = self.capacity
+        return [
+            (self._times[i % cap], self._values[i % cap])
+            for i in self._indices()
+            if since is None or self._times[i % cap] >= since
+        ]
+
+
+class AggregateRing:
+    """Fixed-size ring of min/max/avg per time bucket of `width` seconds."""
+
+    __slots__ = (
+        "_avgs",
+        "_bucket",
+        "_count",
+        "_max",
+        "_maxs",
+        "_min",
+        "_mins",
+        "_next",
+        "_size",
+        "_sum",
+        "_times",
+        "capacity",
+        "width",
+    )
+
+    def __init__(self, width: float, capacity: int) -> None:
+        """Initialize an empty ring."""
+        self.width = width
+        self.capacity = capacity
+        self._times = _ring(capacity)
+        self._mins = _ring(capacity)
+        self._maxs = _ring(capacity)
+        self._avgs = _ring(capacity)
+        self._next = 0
+        self._size = 0
+        # Bucket still being filled
+        self._bucket: float | None = None
+        self._count = 0
+        self._sum = self._min = self._max = 0.0
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Fold a sample into its bucket, closing the previous one if needed."""
+        bucket = timestamp - timestamp % self.width
+        if bucket != self._bucket:
+            if self._bucket is not None and bucket < self._bucket:
+                return  # late sample for an already closed bucket
+            self._close()
+            self._bucket = bucket
+            self._count = 0
+            self._sum = 0.0
+            self._min = self._max = value
+        self._count += 1
+        self._sum += value
+        if value < self._min:
+            self._min = value
+        elif value > self._max:
+            self._max = value
+
+    def _close(self) -> None:
+        """Move the open bucket into the ring."""
+        if not self._count:
+            return
+        i = self._next
+        self._times[i] = self._bucket
+        self._mins[i] = self._min
+        self._maxs[i] = self._max
+        self._avgs[i] = self._sum / self._count
+        self._next = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def items(
+        self, since: float | None = None
+    ) -> list[tuple[float, float, float, float]]:
+        """Return (bucket start, min, max, avg), oldest first.
+
+        The bucket still being filled is included as the last entry.
+        """
+        cap = self.capacity
+        start = (self._next - self._size) % cap
+        result = [
+            (
+                self._times[i % cap],
+                self._mins[i % cap],
+                self._maxs[i % cap],
+                self._avgs[i % cap],
+            )
+            for i in range(start, start + self._size)
+            if since is None or self._times[i % cap] >= since
+        ]
+        if self._count and (since is None or self._bucket >= since):
+            result.append((self._bucket, self._min, self._max, self._sum / self._count))
+        return result
+
+
+class MeasurandSeries:
+    """Raw samples plus 1-minute and 15-minute aggregates for one data key."""
+
+    __slots__ = ("minute", "quarter", "raw")
+
+    def __init__(self) -> None:
+        """Initialize the rings."""
+        self.raw = RingBuffer(RAW_CAPACITY)
+        self.minute = AggregateRing(60, MINUTE_CAPACITY)
+        self.quarter = AggregateRing(900, QUARTER_CAPACITY)
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Record a sample in every tier."""
+        self.raw.append(timestamp, value)
+        self.minute.add(timestamp, value)
+        self.quarter.add(timestamp, value)
+
+    def items(self, tier: str, since: float | None = None) -> list[tuple[float, ...]]:
+        """Return the points of a tier (see TIERS)."""
+        if tier == TIER_RAW:
+            return self.raw.items(since)
+        if tier == TIER_1MIN:
+            return self.minute.items(since)
+        if tier == TIER_15MIN:
+            return self.quarter.items(since)
+        raise ValueError(f"Unknown tier {tier!r}, expected one of {TIERS}")
+
+
+class MeterHistory:
+    """Per data key meter history kept by the coordinator.
+
+    Series are created on the first sample of a key; the keys come from the
+    fixed measurand dispatch table, so the number of series is bounded too.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty history."""
+        self._series: dict[str, MeasurandSeries] = {}
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if samples were recorded for key."""
+        return key in self._series
+
+    def keys(self) -> list[str]:
+        """Return the data keys with recorded samples."""
+        return list(self._series)
+
+    def add(self, key: str, timestamp: float, value: float) -> None:
+        """Record a sample (timestamp in seconds since the epoch)."""
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = MeasurandSeries()
+        series.add(timestamp, value)
+
+    def items(
+        self, key: str, tier: str = TIER_RAW, since: float | None = None
+    ) -> list[tuple[float, ...]]:
+        """Return the points recorded for key in a tier, oldest first.
+
+        Raw points are (timestamp, value); aggregate points are
+        (bucket start, min, max, avg).
+        """
+        series = self._series.get(key)
+        if series is None:
+            return []
+        return series.items(tier, since)
+
+    def as_dict(self, tier: str = TIER_RAW) -> dict[str, Any]:
+        """Return every series in a tier, for diagnostics."""
+        return {key: self.items(key, tier) for key in self._series}
@@ -0,0 +1,104 @@
+"""Connection liveness for the BMW Wallbox integration.
+
+Author: João Belo
+Independent open-source project for BMW-branded Delta Electronics wallboxes.
+Not affiliated with BMW, Delta Electronics, or any other company.
+
+A wallbox that loses power or network leaves a half-open TCP connection
+behind: nothing arrives, but nothing closes either. The coordinator pings
+the WebSocket regularly and counts every incoming OCPP message (heartbeats
+included) and every pong as a sign of life. Once the wallbox stayed silent
+for the configured deadline, the coordinator marks it offline and closes the
+socket, so automations see it go offline within the deadline instead of
+whenever TCP gives up.
+
+The pong round trips also give the link quality: a smoothed RTT and its
+jitter, estimated like TCP's SRTT and RTP's interarrival jitter.
+
+Heartbeats are only needed while nothing else arrives. While the wallbox
+streams MeterValues and TransactionEvents, the coordinator stretches the
+heartbeat interval (OCPPCommCtrlr.HeartbeatInterval) to spare the wallbox's
+WiFi; once the traffic stops, it goes back to the short idle interval.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import time
+from typing import Any
+
+# Gains of the exponential averages (RFC 6298 SRTT, RFC 3550 jitter)
+RTT_GAIN = 1 / 8
+JITTER_GAIN = 1 / 16
+
+# Other traffic makes heartbeats redundant if it arrived within this many
+# idle heartbeat intervals
+HEARTBEAT_TRAFFIC_FACTOR = 2
+
+
+class LivenessMonitor:
+    """Track signs of life and ping round trips of the current connection."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize without a connection."""
+        self._clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        """Start over for a new connection."""
+        self.last_seen = self._clock()
+        self.last_rtt: float | None = None
+        self.rtt: float | None = None  # smoothed, seconds
+        self.jitter: float | None = None  # seconds
+        self.pings = 0
+        self.lost_pings = 0
+        self.last_traffic: float | None = None
+
+    def note_alive(self) -> None:
+        """Record that something arrived from the wallbox."""
+        self.last_seen = self._clock()
+
+    def note_traffic(self) -> None:
+        """Record a message that proves liveness as well as a heartbeat."""
+        self.last_traffic = self._clock()
+
+    def heartbeat_interval(self, idle: int, busy: int) -> int:
+        """Return the heartbeat interval that fits the current traffic."""
+        if (
+            self.last_traffic is not None
+            and self._clock() - self.last_traffic < HEARTBEAT_TRAFFIC_FACTOR * idle
+        ):
+            return max(idle, busy)
+        return idle
+
+    def note_pong(self, rtt: float) -> None:
+        """Record the round trip of an answered ping."""
+        self.note_alive()
+        self.pings += 1
+        if self.last_rtt is None:
+            self.rtt = rtt
+            self.jitter = 0.0
+        else:
+            self.rtt += RTT_GAIN * (rtt - self.rtt)
+            self.jitter += JITTER_GAIN * (abs(rtt - self.last_rtt) - self.jitter)
+        self.last_rtt = rtt
+
+    def note_lost_ping(self) -> None:
+        """Record a ping that got no pong in time."""
+        self.pings += 1
+        self.lost_pings += 1
+
+    def silence(self) -> float:
+        """Return seconds since the wallbox was last heard from."""
+        return self._clock() - self.last_seen
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the link statistics for diagnostics."""
+        return {
+            "silence": round(self.silence(), 1),
+            "rtt": self.rtt,
+            "last_rtt": self.last_rtt,
+            "jitter": self.jitter,
+            "pings": self.pings,
+            "lost_pings": self.lost_pings,
+        }
@@ -4,25 +4,27 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from custom_components.bmw_wallbox.models import WallboxState
+
 
 @pytest.fixture
 def mock_coordinator():
     """Mock BMWWallboxCoordinator."""
     coordinator = MagicMock()
-    coordinator.data = {
-        "connected": True,
-        "charging_state": "Charging",
-        "power": 7000.0,
-        "energy_total": 25.5,
-        "current": 30.0,
-        "voltage": 230.0,
-        "transaction_id": "test-transaction-123",
-        "connector_status": "Charging",
-        "evse_id": 1,
-        "connector_id": 1,
-        "phases_used": 1,
-        "current_limit": 32.0,
-    }
+    coordinator.data = WallboxState(
+        connected=True,
+        charging_state="Charging",
+        power=7000.0,
+        energy_total=25.5,
+        current=30.0,
+        voltage=230.0,
+        transaction_id="test-transaction-123",
+        connector_status="Charging",
+        evse_id=1,
+        connector_id=1,
+        phases_used=1,
+        current_limit=32.0,
+    )
     coordinator.device_info = {
         "model": "EIAW-E22KTSE6B04",
         "vendor": "BMW",
@@ -38,6 +40,9 @@ def mock_coordinator():
     )
     coordinator.async_set_current_limit = AsyncMock(return_value=True)
     coordinator.async_set_updated_data = MagicMock()
+    coordinator.async_update_state = MagicMock(
+        side_effect=lambda **changes: coordinator.data.update(changes)
+    )
     # For entity availability
     coordinator.last_update_success = True
     return coordinator
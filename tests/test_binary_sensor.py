@@ -74,25 +74,27 @@ async def test_connected_binary_sensor_off(
 async def test_connected_binary_sensor_stale_heartbeat(
     hass: HomeAssistant, mock_coordinator, mock_config_entry
 ) -> None:
-    """Test connected binary sensor with stale heartbeat."""
-    # Heartbeat older than 30 seconds
+    """A late heartbeat alone doesn't mark the wallbox offline."""
+    # The liveness watchdog still hears pongs and other messages
+    mock_coordinator.data["connected"] = True
     mock_coordinator.data["last_heartbeat"] = datetime.utcnow() - timedelta(seconds=35)
 
     sensor = BMWWallboxConnectedBinarySensor(mock_coordinator, mock_config_entry)
 
-    assert sensor.is_on is False
+    assert sensor.is_on is True
 
 
 async def test_connected_binary_sensor_recent_heartbeat(
     hass: HomeAssistant, mock_coordinator, mock_config_entry
 ) -> None:
-    """Test connected binary sensor with recent heartbeat."""
-    # Heartbeat within 30 seconds
+    """A recent heartbeat doesn't keep a dropped wallbox online."""
+    # The liveness watchdog closed the connection
+    mock_coordinator.data["connected"] = False
     mock_coordinator.data["last_heartbeat"] = datetime.utcnow() - timedelta(seconds=10)
 
     sensor = BMWWallboxConnectedBinarySensor(mock_coordinator, mock_config_entry)
 
-    assert sensor.is_on is True
+    assert sensor.is_on is False
 
 
 async def test_connected_binary_sensor_attributes(
@@ -0,0 +1,113 @@
+"""Test the BMW Wallbox connect bootstrap pipeline."""
+
+import asyncio
+
+import pytest
+
+from custom_components.bmw_wallbox.bootstrap import (
+    STEP_FAILED,
+    STEP_OK,
+    BootstrapStep,
+    async_run_pipeline,
+)
+
+
+async def test_steps_wait_for_their_dependencies() -> None:
+    """Test a step only starts after the steps it depends on."""
+    order = []
+    first_may_finish = asyncio.Event()
+
+    async def first():
+        await first_may_finish.wait()
+        order.append("first")
+
+    async def second():
+        order.append("second")
+
+    async def independent():
+        order.append("independent")
+        first_may_finish.set()
+
+    results = await async_run_pipeline(
+        [
+            BootstrapStep("first", first),
+            BootstrapStep("second", second, after=("first",)),
+            BootstrapStep("independent", independent),
+        ]
+    )
+
+    assert order == ["independent", "first", "second"]
+    assert list(results) == ["independent", "first", "second"]
+    assert all(r.status == STEP_OK for r in results.values())
+
+
+async def test_failures_are_recorded_and_do_not_block() -> None:
+    """Test failed steps are reported and later steps still run."""
+
+    async def boom():
+        raise RuntimeError("wallbox said no")
+
+    async def rejected():
+        return False
+
+    async def after():
+        return True
+
+    results = await async_run_pipeline(
+        [
+            BootstrapStep("boom", boom),
+            BootstrapStep("rejected", rejected),
+            BootstrapStep("after", after, after=("boom", "rejected")),
+        ]
+    )
+
+    assert results["boom"].status == STEP_FAILED
+    assert results["rejected"].status == STEP_FAILED
+    assert results["after"].status == STEP_OK
+
+
+async def test_step_timings() -> None:
+    """Test start offsets and durations come from the clock."""
+    ticks = iter([0.0, 0.1, 0.4])
+
+    async def step():
+        return None
+
+    results = await async_run_pipeline(
+        [BootstrapStep("only", step)], clock=lambda: next(ticks)
+    )
+
+    assert results["only"].started == pytest.approx(0.1)
+    assert results["only"].duration == pytest.approx(0.3)
+
+
+async def test_cancel_stops_running_steps() -> None:
+    """Test cancelling the pipeline cancels the step in progress."""
+    step_started = asyncio.Event()
+    step_cancelled = asyncio.Event()
+
+    async def forever():
+        step_started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            step_cancelled.set()
+            raise
+
+    task = asyncio.create_task(async_run_pipeline([BootstrapStep("wait", forever)]))
+    await step_started.wait()
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert step_cancelled.is_set()
+
+
+async def test_unknown_dependency_rejected() -> None:
+    """Test a dependency must name an earlier step."""
+
+    async def step():
+        return None
+
+    with pytest.raises(ValueError, match="unknown step"):
+        await async_run_pipeline([BootstrapStep("a", step, after=("b",))])
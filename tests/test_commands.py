@@ -0,0 +1,162 @@
+"""Tests for the OCPP command executor."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from ocpp.exceptions import NotSupportedError
+from ocpp.v201 import call
+from ocpp.v201.enums import ResetEnumType
+import pytest
+from websockets.exceptions import ConnectionClosed
+
+from custom_components.bmw_wallbox.commands import (
+    POLICIES,
+    CommandExecutor,
+    CommandPolicy,
+    CommandStats,
+)
+
+QUICK = {
+    "TriggerMessage": CommandPolicy(timeout=0.01, attempts=3, backoff=1.0),
+    "Reset": CommandPolicy(timeout=0.01),
+}
+TRIGGER = call.TriggerMessage(requested_message="MeterValues")
+RESET = call.Reset(type=ResetEnumType.immediate)
+
+
+async def _hang(request):
+    await asyncio.Event().wait()
+
+
+def _executor() -> tuple[CommandExecutor, AsyncMock]:
+    sleep = AsyncMock()
+    return CommandExecutor(QUICK, sleep=sleep, jitter=lambda: 0.5), sleep
+
+
+async def test_idempotent_action_retried_after_timeout() -> None:
+    """A lost answer is retried with a growing, jittered delay."""
+    executor, sleep = _executor()
+    answer = MagicMock(status="Accepted")
+    charge_point = MagicMock()
+    charge_point.call = AsyncMock(side_effect=[TimeoutError, TimeoutError, answer])
+
+    assert await executor.async_call(charge_point, TRIGGER) is answer
+
+    assert charge_point.call.await_count == 3
+    assert [c.args[0] for c in sleep.await_args_list] == [0.5, 1.0]
+    stats = executor.stats["TriggerMessage"]
+    assert (stats.calls, stats.answered, stats.timeouts, stats.retries) == (1, 1, 2, 2)
+    assert stats.success_rate == 1.0
+
+
+async def test_non_idempotent_action_not_retried() -> None:
+    """Reset is sent once; the timeout reaches the caller."""
+    executor, sleep = _executor()
+    charge_point = MagicMock()
+    charge_point.call = AsyncMock(side_effect=_hang)
+
+    with pytest.raises(TimeoutError):
+        await executor.async_call(charge_point, RESET)
+
+    assert charge_point.call.await_count == 1
+    sleep.assert_not_awaited()
+    assert executor.stats["Reset"].failed == 1
+    assert executor.stats["Reset"].success_rate == 0.0
+
+
+async def test_errors_are_not_retried() -> None:
+    """Only timeouts are retried; other errors are raised right away."""
+    executor, _ = _executor()
+    charge_point = MagicMock()
+    charge_point.call = AsyncMock(side_effect=ValueError("bad payload"))
+
+    with pytest.raises(ValueError, match="bad payload"):
+        await executor.async_call(charge_point, TRIGGER)
+    assert charge_point.call.await_count == 1
+
+
+async def test_only_wallbox_failures_feed_the_breaker() -> None:
+    """Local errors are not recorded; a CALLERROR counts as an answer."""
+    outcomes = []
+    executor = CommandExecutor(QUICK, on_attempt=outcomes.append)
+    charge_point = MagicMock()
+    charge_point.call = AsyncMock(
+        side_effect=[
+            ValueError("bad payload"),
+            NotSupportedError(),
+            ConnectionClosed(None, None),
+        ]
+    )
+
+    for error in (ValueError, NotSupportedError, ConnectionClosed):
+        with pytest.raises(error):
+            await executor.async_call(charge_point, RESET)
+
+    assert outcomes == [True, False]
+    assert executor.stats["Reset"].failed == 3
+
+
+async def test_queued_calls_do_not_time_out() -> None:
+    """The timeout of a call starts when it is its turn on the connection."""
+    outcomes = []
+    executor = CommandExecutor(
+        {"TriggerMessage": CommandPolicy(timeout=0.05)}, on_attempt=outcomes.append
+    )
+    answer = MagicMock(status="Accepted")
+    busy = asyncio.Lock()  # like the OCPP library's call lock
+
+    async def slow(request):
+        async with busy:
+            await asyncio.sleep(0.03)
+        return answer
+
+    charge_point = MagicMock()
+    charge_point.call = AsyncMock(side_effect=slow)
+
+    results = await asyncio.gather(
+        *(executor.async_call(charge_point, TRIGGER) for _ in range(4))
+    )
+
+    assert results == [answer] * 4
+    assert outcomes == [True] * 4
+    stats = executor.stats["TriggerMessage"]
+    assert stats.timeouts == 0
+    assert stats.last_latency < 0.05
+
+
+async def test_cancelled_caller_is_not_retried() -> None:
+    """Cancelling the caller cancels the attempt and counts as cancelled."""
+    executor = CommandExecutor()
+    charge_point = MagicMock()
+    charge_point.call = AsyncMock(side_effect=_hang)
+
+    task = asyncio.ensure_future(executor.async_call(charge_point, TRIGGER))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert charge_point.call.await_count == 1
+    assert executor.stats["TriggerMessage"].cancelled == 1
+
+
+def test_latency_histogram() -> None:
+    """Latencies land in buckets; percentiles report the bucket bound."""
+    stats = CommandStats()
+    assert stats.percentile(0.5) is None
+    for latency in (0.02, 0.03, 0.2, 0.3, 4.0, 30.0):
+        stats.record_latency(latency)
+
+    assert stats.percentile(0.5) == 0.25
+    assert stats.percentile(0.95) == float("inf")
+    histogram = stats.as_dict()["histogram"]
+    assert histogram["<=0.05"] == 2
+    assert histogram[">15.0"] == 1
+    assert stats.last_latency == 30.0
+
+
+def test_policies_only_retry_idempotent_actions() -> None:
+    """Starting a transaction or resetting is never sent twice."""
+    assert POLICIES["RequestStartTransaction"].attempts == 1
+    assert POLICIES["Reset"].attempts == 1
+    assert POLICIES["SetChargingProfile"].attempts > 1
@@ -174,6 +174,9 @@ async def test_options_flow_shows_current_values(hass: HomeAssistant) -> None:
     assert "rfid_token" in schema_dict
     assert "max_current" in schema_dict
     assert "scan_interval" in schema_dict
+    assert "publish_window" in schema_dict
+    assert "meter_interval" in schema_dict
+    assert "escalation_steps" in schema_dict
 
 
 async def test_options_flow_updates_values(hass: HomeAssistant) -> None:
@@ -0,0 +1,238 @@
+"""Tests for the grid-following current control."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.bmw_wallbox.const import (
+    CONF_CONTROL_GRID_TARGET,
+    CONF_CONTROL_SOURCE,
+    CONTROL_MIN_DWELL,
+)
+from custom_components.bmw_wallbox.control import CurrentController
+from custom_components.bmw_wallbox.coordinator import BMWWallboxCoordinator
+from custom_components.bmw_wallbox.models import WallboxState
+
+SOURCE = "sensor.grid_power"
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _coordinator(limit: float = 16.0, power: float = 3680.0) -> MagicMock:
+    """Coordinator charging single-phase at 230 V."""
+    coordinator = MagicMock()
+    coordinator.config = {"max_current": 32}
+    coordinator.data = WallboxState(
+        current_limit=limit, power=power, voltage=230.0, phases_used=1
+    )
+    coordinator.charge_point = MagicMock()
+    coordinator.current_transaction_id = "tx-1"
+    coordinator.async_set_current_limit = AsyncMock(return_value=True)
+    return coordinator
+
+
+def _controller(hass, coordinator, grid_target=0, clock=None):
+    controller = CurrentController(
+        hass, coordinator, SOURCE, grid_target, clock=clock or FakeClock()
+    )
+    controller.async_start()
+    return controller
+
+
+async def test_import_lowers_limit_on_state_change(hass: HomeAssistant) -> None:
+    """Importing from the grid lowers the limit as soon as the sensor changes."""
+    coordinator = _coordinator(limit=16.0, power=3680.0)
+    controller = _controller(hass, coordinator)
+
+    # 920 W import: 3680 - 920 = 2760 W available = 12 A
+    hass.states.async_set(SOURCE, "920", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+
+    coordinator.async_set_current_limit.assert_awaited_once_with(12)
+    controller.async_stop()
+
+
+async def test_unknown_phases_assume_three(hass: HomeAssistant) -> None:
+    """Without a reported phase count the lowest (three-phase) current is used."""
+    coordinator = _coordinator(limit=16.0, power=11040.0)
+    coordinator.data = WallboxState(current_limit=16.0, power=11040.0, voltage=230.0)
+    controller = _controller(hass, coordinator)
+
+    # 2070 W import: 11040 - 2070 = 8970 W available = 13 A on three phases
+    hass.states.async_set(SOURCE, "2070", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+
+    coordinator.async_set_current_limit.assert_awaited_once_with(13)
+    controller.async_stop()
+
+
+async def test_stop_cancels_pending_limit(hass: HomeAssistant) -> None:
+    """A limit still being sent when control stops is dropped."""
+    coordinator = _coordinator(limit=16.0, power=3680.0)
+    coordinator.async_set_current_limit = AsyncMock(side_effect=asyncio.Future)
+    controller = _controller(hass, coordinator)
+
+    hass.states.async_set(SOURCE, "920", {"unit_of_measurement": "W"})
+    await asyncio.sleep(0)
+    send = controller._send
+    assert send is not None
+    assert not send.done()
+
+    controller.async_stop()
+    await hass.async_block_till_done()
+
+    assert send.cancelled()
+    assert controller._send is None
+
+
+async def test_kilowatt_source(hass: HomeAssistant) -> None:
+    """A source reporting kW is converted to W."""
+    coordinator = _coordinator(limit=16.0, power=3680.0)
+    controller = _controller(hass, coordinator)
+
+    hass.states.async_set(SOURCE, "0.92", {"unit_of_measurement": "kW"})
+    await hass.async_block_till_done()
+
+    coordinator.async_set_current_limit.assert_awaited_once_with(12)
+    controller.async_stop()
+
+
+async def test_load_balancing_target(hass: HomeAssistant) -> None:
+    """A positive grid target allows importing up to that power."""
+    coordinator = _coordinator(limit=16.0, power=3680.0)
+    controller = _controller(hass, coordinator, grid_target=5000)
+
+    # House draws 6000 W in total: 1000 W over the target -> 3680 - 1000 W
+    hass.states.async_set(SOURCE, "6000", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+
+    coordinator.async_set_current_limit.assert_awaited_once_with(11)
+    controller.async_stop()
+
+
+async def test_small_surplus_is_ignored(hass: HomeAssistant) -> None:
+    """Raising needs more than the hysteresis margin of headroom."""
+    coordinator = _coordinator(limit=16.0, power=3680.0)
+    controller = _controller(hass, coordinator)
+
+    # 300 W export = 1.3 A headroom, minus 0.5 A margin -> still 16 A
+    hass.states.async_set(SOURCE, "-300", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+
+    coordinator.async_set_current_limit.assert_not_awaited()
+    controller.async_stop()
+
+
+async def test_raise_waits_for_dwell(hass: HomeAssistant) -> None:
+    """After a change the limit is only raised again once the dwell passed."""
+    clock = FakeClock()
+    coordinator = _coordinator(limit=16.0, power=3680.0)
+    controller = _controller(hass, coordinator, clock=clock)
+
+    hass.states.async_set(SOURCE, "920", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    coordinator.data.current_limit = 12.0
+    coordinator.data.power = 2760.0
+
+    clock.now += 5
+    hass.states.async_set(SOURCE, "-2300", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    assert coordinator.async_set_current_limit.await_count == 1
+    assert controller._timer is not None
+
+    clock.now += CONTROL_MIN_DWELL
+    controller._timer.cancel()
+    controller._async_timer_fired()
+    await hass.async_block_till_done()
+
+    # 2760 + 2300 W = 22 A, minus the margin -> 21 A
+    coordinator.async_set_current_limit.assert_awaited_with(21)
+    controller.async_stop()
+
+
+async def test_reductions_are_rate_bounded(hass: HomeAssistant) -> None:
+    """A second reduction within the update interval waits for the timer."""
+    clock = FakeClock()
+    coordinator = _coordinator(limit=16.0, power=3680.0)
+    controller = _controller(hass, coordinator, clock=clock)
+
+    hass.states.async_set(SOURCE, "920", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    coordinator.data.current_limit = 12.0
+
+    clock.now += 0.2
+    hass.states.async_set(SOURCE, "2000", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+
+    assert coordinator.async_set_current_limit.await_count == 1
+    assert controller._timer is not None
+    controller.async_stop()
+    assert controller._timer is None
+
+
+async def test_limit_clamped_to_minimum_and_maximum(hass: HomeAssistant) -> None:
+    """The target never leaves the 6 A .. max current range."""
+    coordinator = _coordinator(limit=16.0, power=3680.0)
+    controller = _controller(hass, coordinator)
+
+    hass.states.async_set(SOURCE, "9000", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    coordinator.async_set_current_limit.assert_awaited_once_with(6)
+
+    assert controller.target_current(-20000) > 32
+    controller.async_stop()
+
+
+async def test_idle_or_unknown_source_does_nothing(hass: HomeAssistant) -> None:
+    """No session or an unavailable sensor leaves the limit alone."""
+    coordinator = _coordinator()
+    coordinator.current_transaction_id = None
+    controller = _controller(hass, coordinator)
+
+    hass.states.async_set(SOURCE, "5000", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+
+    coordinator.current_transaction_id = "tx-1"
+    hass.states.async_set(SOURCE, "unavailable")
+    await hass.async_block_till_done()
+
+    coordinator.async_set_current_limit.assert_not_awaited()
+    controller.async_stop()
+
+
+async def test_coordinator_starts_and_stops_control(hass: HomeAssistant) -> None:
+    """The coordinator follows the control options."""
+    config = {
+        "port": 9000,
+        "ssl_cert": "/ssl/fullchain.pem",
+        "ssl_key": "/ssl/privkey.pem",
+        "charge_point_id": "DE*BMW*TEST123",
+        "max_current": 32,
+    }
+    coordinator = BMWWallboxCoordinator(hass, config)
+    coordinator._async_update_control()
+    assert coordinator.control is None
+
+    coordinator.config = {**config, CONF_CONTROL_SOURCE: SOURCE}
+    coordinator._async_update_control()
+    control = coordinator.control
+    assert control.source == SOURCE
+    assert control.grid_target == 0
+
+    coordinator.config[CONF_CONTROL_GRID_TARGET] = 4000
+    coordinator._async_update_control()
+    assert coordinator.control is not control
+    assert coordinator.control.grid_target == 4000
+
+    coordinator.config = config
+    coordinator._async_update_control()
+    assert coordinator.control is None
@@ -1,14 +1,19 @@
 """Test BMW Wallbox coordinator."""
 
+import asyncio
 from datetime import datetime
+import logging
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from ocpp.v201.enums import ChargingProfilePurposeEnumType
 import pytest
+from websockets.exceptions import ConnectionClosed
 
 from custom_components.bmw_wallbox.coordinator import (
+    _MEASURAND_DISPATCH,
     BMWWallboxCoordinator,
     WallboxChargePoint,
+    _apply_sampled_values,
     _compute_live_current,
 )
 
@@ -80,6 +85,98 @@ async def test_coordinator_async_update_data(coordinator):
     assert result["power"] == 5000.0
 
 
+# ==============================================================================
+# KEY-SCOPED LISTENER TESTS
+# ==============================================================================
+
+
+async def test_key_listener_only_fires_for_its_keys(coordinator):
+    """A listener scoped to "power" ignores updates that only touch other keys."""
+    coordinator.publish_window = 0
+    power_updates = MagicMock()
+    any_updates = MagicMock()
+    coordinator.async_add_key_listener(power_updates, {"power"})
+    coordinator.async_add_listener(any_updates)
+
+    # First publish: everything is new
+    coordinator.async_set_updated_data(coordinator.data)
+    assert power_updates.call_count == 1
+
+    coordinator.data["sequence_number"] = 42
+    coordinator.async_set_updated_data(coordinator.data)
+    assert power_updates.call_count == 1
+    assert any_updates.call_count == 2
+    assert coordinator.dirty_keys == frozenset({"sequence_number"})
+
+    coordinator.data["power"] = 3680.0
+    coordinator.async_set_updated_data(coordinator.data)
+    assert power_updates.call_count == 2
+
+
+async def test_key_listener_notified_on_availability_change(coordinator):
+    """Availability changes reach every listener, even with no dirty keys."""
+    listener = MagicMock()
+    coordinator.async_add_key_listener(listener, {"power"})
+    coordinator.async_set_updated_data(coordinator.data)
+    listener.reset_mock()
+
+    coordinator.last_update_success = False
+    coordinator.async_update_listeners()
+
+    listener.assert_called_once()
+
+
+async def test_meter_updates_coalesced_into_one_publish(coordinator):
+    """A burst of meter-only updates is published once, after the window."""
+    listener = MagicMock()
+    coordinator.async_add_key_listener(listener, {"power", "voltage"})
+    coordinator.async_set_updated_data(coordinator.data)
+    listener.reset_mock()
+
+    coordinator.async_update_state(power=3680.0)
+    coordinator.async_update_state(voltage=230.0)
+
+    listener.assert_not_called()
+    coordinator.hass.loop.call_later.assert_called_once()
+    delay, flush = coordinator.hass.loop.call_later.call_args.args
+    assert delay == 0.25
+
+    flush()
+
+    listener.assert_called_once()
+    assert coordinator.dirty_keys == frozenset({"power", "voltage"})
+
+
+async def test_state_transition_bypasses_publish_window(coordinator):
+    """charging_state changes publish at once, flushing pending meter updates."""
+    listener = MagicMock()
+    coordinator.async_add_key_listener(listener, {"power", "charging_state"})
+    coordinator.async_set_updated_data(coordinator.data)
+    listener.reset_mock()
+    timer = coordinator.hass.loop.call_later.return_value
+
+    coordinator.async_update_state(power=3680.0)
+    listener.assert_not_called()
+
+    coordinator.async_update_state(charging_state="Charging")
+
+    listener.assert_called_once()
+    timer.cancel.assert_called_once()
+    assert coordinator.dirty_keys == frozenset({"power", "charging_state"})
+
+
+async def test_publish_window_configurable(hass, config):
+    """A publish window of 0 disables coalescing."""
+    coordinator = BMWWallboxCoordinator(hass, {**config, "publish_window": 0})
+    listener = MagicMock()
+    coordinator.async_add_key_listener(listener, {"power"})
+
+    coordinator.async_update_state(power=3680.0)
+
+    listener.assert_called_once()
+    hass.loop.call_later.assert_not_called()
+
+
 # ==============================================================================
 # OCPP MESSAGE HANDLER TESTS
 # ==============================================================================
@@ -99,6 +196,7 @@ async def test_boot_notification_handler(charge_point):
     )
 
     assert response.status == "Accepted"
+    assert response.interval == charge_point.coordinator.heartbeat_interval == 10
     assert charge_point.coordinator.device_info["model"] == "EIAW-E22KTSE6B04"
     assert charge_point.coordinator.device_info["vendor"] == "BMW"
     assert charge_point.coordinator.device_info["serial_number"] == "TEST123"
@@ -407,7 +505,9 @@ async def test_async_start_charging_new_transaction(coordinator):
     coordinator.charge_point = mock_charge_point
     coordinator.current_transaction_id = None
 
-    result = await coordinator.async_start_charging()
+    # Patch create_task to avoid a lingering meter values refresh
+    with patch("asyncio.create_task"):
+        result = await coordinator.async_start_charging()
 
     assert result["success"] is True
     assert result["action"] == "started"
@@ -424,6 +524,12 @@ async def test_async_start_charging_no_wallbox(coordinator):
     assert "not connected" in result["message"]
 
 
+def _profiles_in_sync(coordinator, *profiles):
+    """Fill the profile cache as if the wallbox reported these profiles."""
+    request_id, _ = coordinator.profiles.begin_report()
+    coordinator.profiles.add_report(request_id, 1, profiles, "CSO")
+
+
 async def test_async_pause_charging(coordinator):
     """Test pause charging."""
     mock_charge_point = MagicMock()
@@ -436,6 +542,7 @@ async def test_async_pause_charging(coordinator):
     coordinator.charge_point = mock_charge_point
     coordinator.current_transaction_id = "test-tx-123"
     coordinator.data["power"] = 7000.0
+    _profiles_in_sync(coordinator)
 
     result = await coordinator.async_pause_charging()
 
@@ -463,48 +570,40 @@ async def test_async_pause_charging_already_paused(coordinator):
     assert "already paused" in result["message"].lower()
 
 
-async def test_async_pause_charging_nuke_on_rejection(coordinator):
-    """Test pause triggers NUKE (reboot) when SetChargingProfile is rejected."""
-    mock_charge_point = MagicMock()
-
-    # First call: TriggerMessage (meter refresh before pause check)
-    # Second call: GetTransactionStatus (refresh)
-    # Third call: ClearChargingProfile
-    # Fourth call: SetChargingProfile (rejected)
-    # Fifth call: Reset (NUKE)
-    call_count = 0
+async def test_async_pause_charging_escalates_on_rejection(coordinator):
+    """A rejected pause climbs the ladder but never reboots a wallbox that answers."""
+    sent = []
 
     async def mock_call(request):
-        nonlocal call_count
-        call_count += 1
-
-        if call_count <= 3:
-            # TriggerMessage, GetTransactionStatus, and ClearChargingProfile
-            mock_resp = MagicMock()
-            mock_resp.ongoing_indicator = True
-            mock_resp.status = "Accepted"
-            return mock_resp
-        if call_count == 4:
-            # SetChargingProfile - REJECTED!
-            mock_resp = MagicMock()
-            mock_resp.status = "Rejected"
-            mock_resp.status_info = None
-            return mock_resp
-        # Reset - accepted
+        action = type(request).__name__
+        sent.append(action)
         mock_resp = MagicMock()
-        mock_resp.status = "Accepted"
+        mock_resp.ongoing_indicator = True
+        mock_resp.status_info = None
+        # Every pause profile and the 0 A cap are rejected
+        mock_resp.status = "Rejected" if action == "SetChargingProfile" else "Accepted"
         return mock_resp
 
+    mock_charge_point = MagicMock()
     mock_charge_point.call = mock_call
     coordinator.charge_point = mock_charge_point
     coordinator.current_transaction_id = "test-tx-123"
     coordinator.data["power"] = 7000.0
+    _profiles_in_sync(coordinator)
 
     result = await coordinator.async_pause_charging(allow_nuke=True)
 
     assert result["success"] is True
-    assert result["action"] == "nuked"
-    assert "reboot" in result["message"].lower() or "💣" in result["message"]
+    assert result["action"] == "stopped"
+    assert sent[2:] == [
+        "SetChargingProfile",  # pause
+        "SetChargingProfile",  # retry
+        "ClearChargingProfile",  # clear all ...
+        "SetChargingProfile",  # ... and retry
+        "SetChargingProfile",  # 0 A station cap
+        "RequestStopTransaction",
+    ]
+    assert "Reset" not in sent
 
 
 async def test_async_pause_charging_no_nuke_when_disabled(coordinator):
@@ -517,8 +616,8 @@ async def test_async_pause_charging_no_nuke_when_disabled(coordinator):
         nonlocal call_count
         call_count += 1
 
-        if call_count <= 3:
-            # TriggerMessage, GetTransactionStatus, ClearChargingProfile
+        if call_count <= 2:
+            # TriggerMessage, GetTransactionStatus
             mock_resp = MagicMock()
             mock_resp.ongoing_indicator = True
             mock_resp.status = "Accepted"
@@ -533,48 +632,43 @@ async def test_async_pause_charging_no_nuke_when_disabled(coordinator):
     coordinator.charge_point = mock_charge_point
     coordinator.current_transaction_id = "test-tx-123"
     coordinator.data["power"] = 7000.0
+    _profiles_in_sync(coordinator)
 
     result = await coordinator.async_pause_charging(allow_nuke=False)
 
     assert result["success"] is False
     assert "rejected" in result["message"].lower()
-    # Should NOT have called Reset (only 4 calls: trigger + tx_status + clear + set)
-    assert call_count == 4
+    # Should NOT have called Reset (only 3 calls: trigger + tx_status + set)
+    assert call_count == 3
 
 
 async def test_async_pause_charging_nuke_on_timeout(coordinator):
-    """Test pause triggers NUKE when command times out."""
-    mock_charge_point = MagicMock()
-
-    call_count = 0
+    """Pause reboots the wallbox once it stopped answering altogether."""
+    sent = []
 
     async def mock_call(request):
-        nonlocal call_count
-        call_count += 1
-
-        if call_count <= 3:
-            # TriggerMessage, GetTransactionStatus, ClearChargingProfile
-            mock_resp = MagicMock()
-            mock_resp.ongoing_indicator = True
-            mock_resp.status = "Accepted"
-            return mock_resp
-        if call_count == 4:
-            # SetChargingProfile - TIMEOUT!
+        action = type(request).__name__
+        sent.append(action)
+        if action not in ("TriggerMessage", "GetTransactionStatus", "Reset"):
             raise TimeoutError("Connection timed out")
-        # Reset - accepted
         mock_resp = MagicMock()
+        mock_resp.ongoing_indicator = True
         mock_resp.status = "Accepted"
         return mock_resp
 
+    mock_charge_point = MagicMock()
     mock_charge_point.call = mock_call
     coordinator.charge_point = mock_charge_point
+    coordinator.commands._jitter = lambda: 0
     coordinator.current_transaction_id = "test-tx-123"
     coordinator.data["power"] = 7000.0
+    _profiles_in_sync(coordinator)
 
     result = await coordinator.async_pause_charging(allow_nuke=True)
 
     assert result["success"] is True
     assert result["action"] == "nuked"
+    assert sent[-2:] == ["RequestStopTransaction", "Reset"]
 
 
 async def test_async_resume_charging(coordinator):
@@ -588,6 +682,7 @@ async def test_async_resume_charging(coordinator):
 
     coordinator.charge_point = mock_charge_point
     coordinator.current_transaction_id = "test-tx-123"
+    _profiles_in_sync(coordinator)
 
     # Patch create_task to avoid lingering tasks from delayed_refresh
     with patch("asyncio.create_task"):
@@ -694,6 +789,55 @@ async def test_async_set_led_brightness(coordinator):
     assert result is True
 
 
+async def test_configure_meter_sampling(coordinator):
+    """One batched SetVariables sets the push interval and supported measurands."""
+    coordinator.charge_point = MagicMock()
+    response = MagicMock()
+    response.set_variable_result = [
+        {
+            "attribute_status": "Accepted",
+            "component": {"name": "SampledDataCtrlr"},
+            "variable": {"name": "TxUpdatedInterval"},
+        },
+        {
+            "attribute_status": "Rejected",
+            "component": {"name": "AlignedDataCtrlr"},
+            "variable": {"name": "Interval"},
+        },
+    ]
+    coordinator.charge_point.call = AsyncMock(return_value=response)
+
+    results = await coordinator.async_configure_meter_sampling()
+
+    coordinator.charge_point.call.assert_awaited_once()
+    request = coordinator.charge_point.call.call_args.args[0]
+    values = {
+        (d.component.name, d.variable.name): d.attribute_value
+        for d in request.set_variable_data
+    }
+    assert values[("SampledDataCtrlr", "TxUpdatedInterval")] == "10"
+    assert values[("SampledDataCtrlr", "TxUpdatedMeasurands")] == (
+        "Current.Import,Energy.Active.Import.Register,Power.Active.Import,Voltage"
+    )
+    assert values[("AlignedDataCtrlr", "Measurands")] == (
+        "Energy.Active.Import.Register"
+    )
+    assert results == {
+        "SampledDataCtrlr.TxUpdatedInterval": "Accepted",
+        "AlignedDataCtrlr.Interval": "Rejected",
+    }
+
+
+async def test_configure_meter_sampling_disabled(hass, config):
+    """A meter interval of 0 leaves the wallbox configuration alone."""
+    coordinator = BMWWallboxCoordinator(hass, {**config, "meter_interval": 0})
+    coordinator.charge_point = MagicMock()
+    coordinator.charge_point.call = AsyncMock()
+
+    assert await coordinator.async_configure_meter_sampling() == {}
+    coordinator.charge_point.call.assert_not_called()
+
+
 async def test_async_set_led_brightness_clamps_value(coordinator):
     """Test LED brightness is clamped to 0-100 range."""
     mock_charge_point = MagicMock()
@@ -773,6 +917,80 @@ async def test_trigger_meter_values_error(coordinator):
     assert result is False
 
 
+# ==============================================================================
+# MEASURAND DISPATCH TESTS
+# ==============================================================================
+
+
+def test_measurand_dispatch_resolves_units_at_build_time():
+    """Unit scaling is part of the table, not worked out per sample."""
+    key, convert = _MEASURAND_DISPATCH[("Energy.Active.Import.Register", None, "kWh")]
+    assert key == "energy_total"
+    assert convert("25.5") == 25.5
+
+    key, convert = _MEASURAND_DISPATCH[("Power.Active.Import", None, "kW")]
+    assert key == "power"
+    assert convert("7.2") == 7200.0
+
+
+def test_measurand_dispatch_phase_aliases():
+    """ "L1" and "L1-N" address the same conductor for current and voltage."""
+    for measurand, key in (("Current.Import", "current_l1"), ("Voltage", "voltage_l1")):
+        assert _MEASURAND_DISPATCH[(measurand, "L1", None)][0] == key
+        assert _MEASURAND_DISPATCH[(measurand, "L1-N", None)][0] == key
+
+
+def test_apply_sampled_values_units_and_unknowns():
+    """Explicit units are honoured and unknown measurands are skipped."""
+    data = {"energy_total": None}
+    meter_value = [
+        {
+            "sampled_value": [
+                {
+                    "measurand": "Power.Active.Import",
+                    "value": "3.5",
+                    "unit_of_measure": {"unit": "kW"},
+                },
+                {
+                    "measurand": "Energy.Active.Import.Register",
+                    "value": "12.25",
+                    "unit_of_measure": {"unit": "kWh"},
+                },
+                {"measurand": "SoC", "value": "80"},
+                {"measurand": "Current.Import", "value": "16"},
+            ]
+        }
+    ]
+
+    reported = _apply_sampled_values(data, meter_value)
+
+    assert data["power"] == 3500.0
+    assert data["energy_total"] == 12.25
+    assert "SoC" not in data
+    assert reported == 16.0
+
+
+async def test_transaction_event_accepts_neutral_phase_labels(charge_point):
+    """TransactionEvent handles "L1-N" currents exactly like MeterValues."""
+    await charge_point.on_transaction_event(
+        event_type="Updated",
+        timestamp=datetime.utcnow().isoformat(),
+        trigger_reason="MeterValuePeriodic",
+        seq_no=3,
+        transaction_info={"transaction_id": "tx-1", "charging_state": "Charging"},
+        meter_value=[
+            {
+                "sampled_value": [
+                    {"measurand": "Current.Import", "value": "9.5", "phase": "L1-N"},
+                ]
+            }
+        ],
+    )
+
+    assert charge_point.coordinator.data["current_l1"] == 9.5
+    assert charge_point.coordinator.data["current"] == 9.5
+
+
 # ==============================================================================
 # LIVE CURRENT CALCULATION TESTS (issue #15 - stale Current sensor)
 # ==============================================================================
@@ -851,6 +1069,8 @@ async def test_meter_values_current_not_stale(charge_point):
 
     await charge_point.on_meter_values(evse_id=1, meter_value=meter_value)
 
+    # Handlers publish a new snapshot rather than mutating the old one
+    data = charge_point.coordinator.data
     # Should reflect the fresh per-phase reading, not the stale non-phased 30.4
     assert data["current_l1"] == 9.0
     assert data["current"] == 9.0
@@ -871,6 +1091,7 @@ async def test_transaction_event_ended_resets_live_readings(charge_point):
         transaction_info={"transaction_id": "tx-1", "charging_state": "Available"},
     )
 
+    data = charge_point.coordinator.data
     assert data["current"] == 0
     assert data["power"] == 0
     assert data["current_l1"] == 0
@@ -925,6 +1146,127 @@ async def test_set_current_limit_without_transaction_uses_default_only(coordinat
     assert coordinator.data["current_limit"] == 10.0
 
 
+async def test_set_current_limit_sends_tx_profile_first(coordinator):
+    """The active session's TxProfile is sent before the TxDefaultProfile."""
+    mock_cp = MagicMock()
+    mock_response = MagicMock()
+    mock_response.status = "Accepted"
+    mock_cp.call = AsyncMock(return_value=mock_response)
+    coordinator.charge_point = mock_cp
+    coordinator.current_transaction_id = "tx-123"
+
+    await coordinator.async_set_current_limit(12.0)
+
+    assert _profile_purposes(mock_cp.call) == [
+        ChargingProfilePurposeEnumType.tx_profile,
+        ChargingProfilePurposeEnumType.tx_default_profile,
+    ]
+
+
+async def test_set_current_limit_sends_profiles_one_after_the_other(coordinator):
+    """The TxDefaultProfile waits for the TxProfile's answer (own timeouts)."""
+    release = asyncio.Event()
+    mock_response = MagicMock()
+    mock_response.status = "Accepted"
+
+    async def call(msg):
+        if msg.charging_profile.id == 999:
+            await release.wait()
+        return mock_response
+
+    coordinator.charge_point = MagicMock()
+    coordinator.charge_point.call = AsyncMock(side_effect=call)
+    coordinator.current_transaction_id = "tx-123"
+
+    task = asyncio.create_task(coordinator.async_set_current_limit(11.0))
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert coordinator.charge_point.call.await_count == 1
+
+    release.set()
+    assert await task is True
+    assert _profile_purposes(coordinator.charge_point.call) == [
+        ChargingProfilePurposeEnumType.tx_profile,
+        ChargingProfilePurposeEnumType.tx_default_profile,
+    ]
+
+
+async def test_set_current_limit_accepted_if_tx_profile_accepted(coordinator):
+    """A timed-out TxDefaultProfile doesn't fail the limit of the session."""
+    mock_response = MagicMock()
+    mock_response.status = "Accepted"
+
+    async def call(msg):
+        if msg.charging_profile.id == 998:
+            raise TimeoutError
+        return mock_response
+
+    coordinator.charge_point = MagicMock()
+    coordinator.charge_point.call = AsyncMock(side_effect=call)
+    coordinator.current_transaction_id = "tx-123"
+
+    assert await coordinator.async_set_current_limit(9.0) is True
+    assert coordinator.data["current_limit"] == 9.0
+
+
+async def test_set_current_limit_needs_tx_profile_during_session(coordinator):
+    """A default accepted alone doesn't limit the session; the limit is resent."""
+    accepted = MagicMock(status="Accepted")
+    rejected = MagicMock(status="Rejected")
+
+    async def call(msg):
+        return rejected if msg.charging_profile.id == 999 else accepted
+
+    coordinator.charge_point = MagicMock()
+    coordinator.charge_point.call = AsyncMock(side_effect=call)
+    coordinator.current_transaction_id = "tx-123"
+    coordinator.data["current_limit"] = 32.0
+
+    assert await coordinator.async_set_current_limit(9.0) is False
+    assert coordinator.data["current_limit"] == 32.0
+
+    coordinator.charge_point.call.side_effect = None
+    coordinator.charge_point.call.return_value = accepted
+    assert await coordinator.async_set_current_limit(9.0) is True
+    assert coordinator.limit_queue.skipped == 0
+    assert coordinator.charge_point.call.await_count == 4
+
+
+async def test_send_charging_profile_single_flight(coordinator):
+    """Overlapping callers of the same profile share one SetChargingProfile."""
+    release = asyncio.Event()
+    mock_response = MagicMock()
+    mock_response.status = "Accepted"
+
+    async def call(msg):
+        await release.wait()
+        return mock_response
+
+    coordinator.charge_point = MagicMock()
+    coordinator.charge_point.call = AsyncMock(side_effect=call)
+
+    def send(limit):
+        return coordinator._send_charging_profile(
+            limit,
+            purpose=ChargingProfilePurposeEnumType.tx_default_profile,
+            profile_id=998,
+            stack_level=0,
+        )
+
+    first = asyncio.create_task(send(16.0))
+    second = asyncio.create_task(send(16.0))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(first, second) == [True, True]
+    assert coordinator.charge_point.call.await_count == 1
+    assert coordinator._profiles_in_flight == {}
+
+    # A different limit for the same profile is a new request
+    assert await send(10.0) is True
+    assert coordinator.charge_point.call.await_count == 2
+
+
 async def test_set_current_limit_no_wallbox(coordinator):
     """Setting the limit fails cleanly when the wallbox is not connected."""
     coordinator.charge_point = None
@@ -943,3 +1285,339 @@ async def test_apply_limit_on_transaction_start(coordinator):
     await coordinator.async_apply_limit_on_transaction_start()
 
     coordinator.async_set_current_limit.assert_called_once_with(13.0)
+
+
+async def test_reconnect_replaces_previous_connection(coordinator):
+    """A reconnect closes the old socket, which can't then mark us offline."""
+    old_closed = asyncio.Event()
+
+    async def old_recv():
+        await old_closed.wait()
+        raise ConnectionClosed(None, None)
+
+    old_ws = MagicMock(recv=old_recv)
+    old_ws.close = AsyncMock(side_effect=old_closed.set)
+    new_ws = MagicMock(recv=asyncio.Event().wait)
+
+    coordinator.data["phases_used"] = 3
+    old_task = asyncio.create_task(
+        coordinator.async_handle_connection("DE*BMW*TEST123", old_ws)
+    )
+    await asyncio.sleep(0)
+    new_task = asyncio.create_task(
+        coordinator.async_handle_connection("DE*BMW*TEST123", new_ws)
+    )
+    await old_task
+
+    old_ws.close.assert_awaited_once()
+    assert coordinator.charge_point._connection is new_ws
+    assert coordinator.data.connected is True
+    assert coordinator.data.phases_used is None  # reported again by the wallbox
+    new_task.cancel()
+
+
+async def test_requires_reload_only_for_server_settings(coordinator, config):
+    """Only port, certificates and charge point ID need a reload."""
+    assert not coordinator.requires_reload({**config, "max_current": 16})
+    assert not coordinator.requires_reload({**config, "rfid_token": "NEW"})
+    assert coordinator.requires_reload({**config, "port": 9001})
+    assert coordinator.requires_reload({**config, "ssl_cert": "/ssl/new.pem"})
+
+
+async def test_apply_options_in_place(coordinator, config):
+    """Options are applied live and every entity is refreshed once."""
+    listener = MagicMock()
+    coordinator.async_add_key_listener(listener, {"power"})
+
+    await coordinator.async_apply_options(
+        {**config, "scan_interval": 30, "rfid_token": "NEW", "publish_window": 0}
+    )
+
+    assert coordinator.update_interval.total_seconds() == 30
+    assert coordinator.config["rfid_token"] == "NEW"
+    assert coordinator.publish_window == 0
+    listener.assert_called_once()
+
+
+async def test_apply_options_lowers_limit_on_wallbox(coordinator, config):
+    """Lowering max_current below the active limit sends the new limit."""
+    coordinator.charge_point = MagicMock()
+    coordinator.async_set_current_limit = AsyncMock(return_value=True)
+
+    await coordinator.async_apply_options({**config, "max_current": 16})
+
+    coordinator.async_set_current_limit.assert_awaited_once_with(16)
+
+
+async def test_apply_options_lowers_limit_offline(coordinator, config):
+    """Without a wallbox the tracked limit is still clamped."""
+    await coordinator.async_apply_options({**config, "max_current": 16})
+
+    assert coordinator.data.current_limit == 16
+
+
+async def test_apply_options_keeps_limit_below_new_max(coordinator, config):
+    """Raising max_current leaves the active limit alone."""
+    coordinator.async_set_current_limit = AsyncMock()
+
+    await coordinator.async_apply_options({**config, "max_current": 40})
+
+    assert coordinator.data.current_limit == 32
+    coordinator.async_set_current_limit.assert_not_called()
+
+
+async def test_update_skips_trigger_when_meter_values_fresh(coordinator):
+    """No TriggerMessage round trip right after the wallbox pushed data."""
+    coordinator.charge_point = MagicMock()
+    coordinator.current_transaction_id = "tx-1"
+    coordinator.async_trigger_meter_values = AsyncMock()
+
+    await coordinator._async_update_data()
+    coordinator.async_trigger_meter_values.assert_awaited_once()
+
+    coordinator.async_note_meter_values(7000.0)
+    await coordinator._async_update_data()
+    coordinator.async_trigger_meter_values.assert_awaited_once()
+
+
+async def test_update_interval_adapts_to_session(coordinator):
+    """Polling backs off during a steady session and resets when idle."""
+    coordinator.charge_point = MagicMock()
+    coordinator.current_transaction_id = "tx-1"
+    coordinator.async_trigger_meter_values = AsyncMock()
+
+    await coordinator._async_update_data()
+    assert coordinator.update_interval.total_seconds() == 20
+
+    coordinator.current_transaction_id = None
+    await coordinator._async_update_data()
+    assert coordinator.update_interval.total_seconds() == 10
+
+
+async def test_meter_values_push_recorded(charge_point):
+    """MeterValues from the wallbox count as fresh data for the poller."""
+    await charge_point.on_meter_values(
+        evse_id=1,
+        meter_value=[
+            {
+                "timestamp": datetime.utcnow().isoformat(),
+                "sampled_value": [
+                    {"measurand": "Power.Active.Import", "value": 7000.0}
+                ],
+            }
+        ],
+    )
+
+    assert not charge_point.coordinator._poller.is_stale()
+
+
+async def test_bootstrap_starts_once_per_connection(charge_point):
+    """Boot/Heartbeat/StatusNotification start the bootstrap only once."""
+    coordinator = charge_point.coordinator
+    coordinator.charge_point = charge_point
+
+    charge_point.after_heartbeat()
+    charge_point.after_status_notification()
+
+    coordinator.hass.async_create_task.assert_called_once()
+    coordinator.hass.async_create_task.call_args.args[0].close()
+
+
+async def test_bootstrap_ignores_stale_connection(coordinator, charge_point):
+    """A message from a replaced connection does not start a bootstrap."""
+    coordinator.charge_point = MagicMock()
+
+    charge_point.after_boot_notification()
+
+    coordinator.hass.async_create_task.assert_not_called()
+
+
+async def test_bootstrap_batches_configuration(coordinator):
+    """The bootstrap sends one SetVariables and records per-step timings."""
+    coordinator.charge_point = MagicMock()
+    response = MagicMock()
+    response.set_variable_result = [
+        {
+            "attribute_status": "Accepted",
+            "component": {"name": "SampledDataCtrlr"},
+            "variable": {"name": "TxUpdatedInterval"},
+        }
+    ]
+    coordinator.charge_point.call = AsyncMock(return_value=response)
+    coordinator.async_trigger_meter_values = AsyncMock(return_value=True)
+    coordinator._send_charging_profile = AsyncMock(return_value=True)
+    coordinator.async_reconcile_profiles = AsyncMock(return_value=True)
+
+    with patch("asyncio.sleep", AsyncMock()) as sleep:
+        await coordinator._async_bootstrap()
+
+    sleep.assert_not_called()
+    set_variables = [
+        c.args[0]
+        for c in coordinator.charge_point.call.call_args_list
+        if hasattr(c.args[0], "set_variable_data")
+    ]
+    assert len(set_variables) == 1
+    names = {
+        (d.component.name, d.variable.name) for d in set_variables[0].set_variable_data
+    }
+    assert ("TxCtrlr", "StopTxOnEVSideDisconnect") in names
+    assert ("SampledDataCtrlr", "TxUpdatedInterval") in names
+    coordinator._send_charging_profile.assert_awaited_once()
+    assert list(coordinator.bootstrap_metrics) == [
+        "meter_values",
+        "profiles",
+        "recover_transaction",
+        "configure",
+        "default_limit",
+    ]
+    assert all(r.status == "ok" for r in coordinator.bootstrap_metrics.values())
+
+
+async def test_bootstrap_cancelled_on_disconnect(coordinator):
+    """Dropping the socket cancels a bootstrap still waiting on the wallbox."""
+    closed = asyncio.Event()
+
+    async def recv():
+        await closed.wait()
+        raise ConnectionClosed(None, None)
+
+    websocket = MagicMock(recv=recv)
+    coordinator.hass.async_create_task = asyncio.create_task
+    triggered = asyncio.Event()
+
+    async def trigger_never_answered():
+        triggered.set()
+        await asyncio.Event().wait()
+
+    coordinator.async_trigger_meter_values = trigger_never_answered
+
+    connection = asyncio.create_task(
+        coordinator.async_handle_connection("DE*BMW*TEST123", websocket)
+    )
+    await asyncio.sleep(0)
+    coordinator.async_start_bootstrap(coordinator.charge_point)
+    bootstrap = coordinator._bootstrap_task
+    await triggered.wait()
+
+    closed.set()
+    await connection
+
+    with pytest.raises(asyncio.CancelledError):
+        await bootstrap
+    assert coordinator._bootstrap_task is None
+
+
+# ==============================================================================
+# TELEMETRY LOGGING TESTS
+# ==============================================================================
+
+_TELEMETRY_METER_VALUE = [
+    {
+        "timestamp": "2026-01-01T12:00:00Z",
+        "sampled_value": [
+            {"measurand": "Power.Active.Import", "value": 7200.0},
+            {"measurand": "Current.Import", "value": 10.4, "phase": "L1"},
+        ],
+    }
+]
+
+
+async def test_telemetry_summary_logs_one_line(charge_point, caplog):
+    """Summary mode logs one line per message and no per-sample trace."""
+    caplog.set_level(logging.DEBUG, logger="custom_components.bmw_wallbox")
+
+    await charge_point.on_meter_values(evse_id=1, meter_value=_TELEMETRY_METER_VALUE)
+
+    records = [r for r in caplog.records if "MeterValues" in r.getMessage()]
+    assert len(records) == 1
+    assert "2 sample(s)" in records[0].getMessage()
+
+
+async def test_telemetry_off_logs_nothing(charge_point, caplog):
+    """Off mode keeps the meter hot path silent."""
+    caplog.set_level(logging.DEBUG, logger="custom_components.bmw_wallbox")
+    charge_point.coordinator.telemetry_log.mode = "off"
+
+    await charge_point.on_meter_values(evse_id=1, meter_value=_TELEMETRY_METER_VALUE)
+
+    assert not [r for r in caplog.records if "MeterValues" in r.getMessage()]
+
+
+async def test_telemetry_full_trace_rate_limited(charge_point, caplog):
+    """Full mode traces samples at most once per TELEMETRY_TRACE_INTERVAL."""
+    caplog.set_level(logging.DEBUG, logger="custom_components.bmw_wallbox")
+    charge_point.coordinator.telemetry_log.mode = "full"
+
+    await charge_point.on_meter_values(evse_id=1, meter_value=_TELEMETRY_METER_VALUE)
+    await charge_point.on_meter_values(evse_id=1, meter_value=_TELEMETRY_METER_VALUE)
+
+    traces = [r for r in caplog.records if "samples:" in r.getMessage()]
+    assert len(traces) == 1
+    assert "Current.Import=10.4[L1]" in traces[0].getMessage()
+
+
+async def test_telemetry_full_trace_needs_debug_logging(coordinator, caplog):
+    """Full mode builds no trace unless the logger has DEBUG enabled."""
+    caplog.set_level(logging.INFO, logger="custom_components.bmw_wallbox")
+    coordinator.telemetry_log.mode = "full"
+
+    assert coordinator.telemetry_log.trace_enabled() is False
+
+
+async def test_telemetry_mode_applied_from_options(coordinator, config):
+    """The telemetry mode changes without a reload."""
+    assert coordinator.telemetry_log.mode == "summary"
+
+    await coordinator.async_apply_options({**config, "telemetry_logging": "off"})
+
+    assert coordinator.telemetry_log.mode == "off"
+
+
+async def test_transaction_event_records_session(charge_point):
+    """Ended events finish a ledger session and publish its energy."""
+    ledger = MagicMock()
+    ledger.async_handle_event.return_value = MagicMock(energy=12.5)
+    charge_point.coordinator.sessions = ledger
+
+    await charge_point.on_transaction_event(
+        event_type="Ended",
+        timestamp="2026-01-01T22:00:00Z",
+        trigger_reason="EVDeparted",
+        seq_no=9,
+        transaction_info={"transaction_id": "tx-1", "stopped_reason": "EVDisconnected"},
+    )
+
+    args = ledger.async_handle_event.call_args.args
+    assert args[:2] == ("Ended", "tx-1")
+    assert args[2].tzinfo is not None
+    assert args[5] == "EVDisconnected"
+    assert charge_point.coordinator.data.last_session_energy == 12.5
+
+
+async def test_meter_values_recorded_in_history(charge_point):
+    """Every sampled value lands in the meter history at its own timestamp."""
+    await charge_point.on_meter_values(
+        evse_id=1,
+        meter_value=[
+            {
+                "timestamp": "2026-01-01T00:00:00Z",
+                "sampled_value": [
+                    {"measurand": "Power.Active.Import", "value": 7200.0},
+                    {"measurand": "Current.Import", "value": 10.4, "phase": "L1"},
+                ],
+            },
+            {
+                "timestamp": "2026-01-01T00:00:05Z",
+                "sampled_value": [
+                    {"measurand": "Power.Active.Import", "value": 11000.0},
+                ],
+            },
+        ],
+    )
+
+    history = charge_point.coordinator.meter_history
+    assert [value for _, value in history.items("power")] == [7200.0, 11000.0]
+    assert history.items("current_l1") == [(1_767_225_600.0, 10.4)]
+    # The spike survives in the 1-minute tier even though power is 11 kW now
+    assert history.items("power", "1m")[0][1:3] == (7200.0, 11000.0)
@@ -0,0 +1,159 @@
+"""Tests for the failure escalation ladder and circuit breaker."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.bmw_wallbox.commands import POLICIES, CommandPolicy
+from custom_components.bmw_wallbox.coordinator import BMWWallboxCoordinator
+from custom_components.bmw_wallbox.escalation import (
+    ESCALATION_STEPS,
+    RUNG_CLEAR_PROFILES,
+    RUNG_RESET,
+    RUNG_RETRY,
+    RUNG_ZERO_PROFILE,
+    ZERO_PROFILE_ID,
+    CircuitBreaker,
+    Rung,
+    async_escalate,
+)
+
+CONFIG = {
+    "port": 9000,
+    "ssl_cert": "/ssl/fullchain.pem",
+    "ssl_key": "/ssl/privkey.pem",
+    "charge_point_id": "DE*BMW*TEST123",
+    "max_current": 32,
+}
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_on_mostly_unanswered_calls() -> None:
+    """The breaker needs enough recent calls, most of them unanswered."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(window=60, min_calls=4, threshold=0.75, clock=clock)
+
+    for _ in range(3):
+        breaker.record(answered=False)
+    assert not breaker.is_open  # too few calls to judge
+
+    breaker.record(answered=True)
+    assert breaker.failure_ratio == 0.75
+    assert breaker.is_open
+
+    clock.now = 61
+    assert breaker.calls == 0
+    assert not breaker.is_open
+
+
+def test_breaker_stays_closed_while_wallbox_answers() -> None:
+    """Rejections are answers; they never open the breaker."""
+    breaker = CircuitBreaker(window=60, min_calls=4, threshold=0.75)
+    for answered in (False, True, False, True, False, True):
+        breaker.record(answered)
+    assert not breaker.is_open
+
+    breaker.reset()
+    assert breaker.calls == 0
+
+
+async def test_escalate_stops_at_first_successful_rung() -> None:
+    """Disabled rungs are skipped, failing rungs lead to the next one."""
+    retry = AsyncMock(return_value=False)
+    clear = AsyncMock(side_effect=TimeoutError)
+    zero = AsyncMock(return_value=True)
+    reset = AsyncMock(return_value=True)
+    rungs = [
+        Rung(RUNG_RETRY, retry),
+        Rung(RUNG_CLEAR_PROFILES, clear),
+        Rung(RUNG_ZERO_PROFILE, zero),
+        Rung(RUNG_RESET, reset),
+    ]
+    breaker = CircuitBreaker(window=60, min_calls=1, threshold=0.5)
+    breaker.record(answered=False)
+
+    enabled = [RUNG_CLEAR_PROFILES, RUNG_ZERO_PROFILE, RUNG_RESET]
+    assert await async_escalate(rungs, enabled, breaker) == RUNG_ZERO_PROFILE
+
+    retry.assert_not_awaited()
+    clear.assert_awaited_once()
+    reset.assert_not_awaited()
+
+
+async def test_escalate_resets_only_with_open_breaker() -> None:
+    """A wallbox that still answers is not rebooted."""
+    reset = AsyncMock(return_value=True)
+    rungs = [Rung(RUNG_RETRY, AsyncMock(return_value=False)), Rung(RUNG_RESET, reset)]
+    breaker = CircuitBreaker(window=60, min_calls=2, threshold=0.75)
+    breaker.record(answered=True)
+    breaker.record(answered=True)
+
+    assert await async_escalate(rungs, ESCALATION_STEPS, breaker) is None
+    reset.assert_not_awaited()
+
+    for _ in range(6):
+        breaker.record(answered=False)
+    assert await async_escalate(rungs, ESCALATION_STEPS, breaker) == RUNG_RESET
+
+
+async def test_zero_profile_lifted_on_resume() -> None:
+    """The 0 A station cap of a pause escalation is cleared before resuming."""
+    coordinator = BMWWallboxCoordinator(MagicMock(), CONFIG)
+    coordinator.config["escalation_steps"] = [RUNG_ZERO_PROFILE]
+    coordinator.current_transaction_id = "tx-1"
+    coordinator.data["power"] = 7000.0
+    request_id, _ = coordinator.profiles.begin_report()
+    coordinator.profiles.add_report(request_id, 1, (), "CSO")
+
+    async def call(request):
+        # Only the station-wide cap is accepted
+        accepted = getattr(request, "evse_id", 0) == 0
+        return MagicMock(status="Accepted" if accepted else "Rejected")
+
+    coordinator.charge_point = MagicMock()
+    coordinator.charge_point.call = AsyncMock(side_effect=call)
+
+    result = await coordinator.async_pause_charging(allow_nuke=True)
+    assert result["action"] == "paused"
+    assert coordinator.zero_profile_installed
+
+    await coordinator.async_resume_charging()
+
+    sent = [c.args[0] for c in coordinator.charge_point.call.call_args_list]
+    cleared = [r for r in sent if type(r).__name__ == "ClearChargingProfile"]
+    assert cleared[-1].charging_profile_id == ZERO_PROFILE_ID
+    assert not coordinator.zero_profile_installed
+
+
+async def test_concurrent_bootstrap_keeps_breaker_closed() -> None:
+    """Bootstrap calls queued behind each other are not counted as failures."""
+    coordinator = BMWWallboxCoordinator(MagicMock(), CONFIG)
+    coordinator.commands.policies = {
+        action: CommandPolicy(timeout=0.05, attempts=policy.attempts)
+        for action, policy in POLICIES.items()
+    }
+    busy = asyncio.Lock()  # like the OCPP library's call lock
+
+    async def slow(request):
+        async with busy:
+            await asyncio.sleep(0.02)
+        if type(request).__name__ == "GetChargingProfiles":
+            return MagicMock(status="NoProfiles")
+        return MagicMock(status="Accepted", set_variable_result=[])
+
+    coordinator.charge_point = MagicMock()
+    coordinator.charge_point.call = AsyncMock(side_effect=slow)
+
+    await coordinator._async_bootstrap()
+
+    assert coordinator.charge_point.call.await_count >= 5
+    assert not any(s.timeouts for s in coordinator.commands.stats.values())
+    assert not coordinator.breaker.is_open
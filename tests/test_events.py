@@ -0,0 +1,122 @@
+"""Tests for awaitable wallbox events."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.bmw_wallbox.coordinator import (
+    BMWWallboxCoordinator,
+    WallboxChargePoint,
+)
+from custom_components.bmw_wallbox.events import (
+    EVENT_CHARGING_STATE_CHANGED,
+    EVENT_CONNECTED,
+    EVENT_TRANSACTION_STARTED,
+    WallboxEvents,
+)
+
+CONFIG = {
+    "port": 9000,
+    "ssl_cert": "/ssl/fullchain.pem",
+    "ssl_key": "/ssl/privkey.pem",
+    "charge_point_id": "DE*BMW*TEST123",
+    "max_current": 32,
+}
+
+
+async def test_wait_for_matching_event() -> None:
+    """Only an event with matching payload values resolves the waiter."""
+    events = WallboxEvents()
+    charging = events.expect(EVENT_CHARGING_STATE_CHANGED, to="Charging")
+
+    events.fire(EVENT_CHARGING_STATE_CHANGED, previous="Idle", to="EVConnected")
+    assert not charging.done()
+
+    events.fire(EVENT_CHARGING_STATE_CHANGED, previous="EVConnected", to="Charging")
+    assert await charging == {"previous": "EVConnected", "to": "Charging"}
+    assert not events._waiters
+
+
+async def test_wait_times_out_and_forgets_waiter() -> None:
+    """A timed out waiter is removed."""
+    events = WallboxEvents()
+    with pytest.raises(TimeoutError):
+        await events.wait(EVENT_TRANSACTION_STARTED, 0.01)
+    assert not events._waiters
+
+
+async def test_start_waits_for_transaction_event() -> None:
+    """Without an ID in the response, start continues on TransactionEvent."""
+    coordinator = BMWWallboxCoordinator(MagicMock(), CONFIG)
+    charge_point = WallboxChargePoint("DE*BMW*TEST123", MagicMock(), coordinator)
+
+    async def call(request):
+        if type(request).__name__ == "RequestStartTransaction":
+            asyncio.get_running_loop().call_soon(
+                asyncio.ensure_future,
+                charge_point.on_transaction_event(
+                    event_type="Started",
+                    timestamp="2026-01-01T00:00:00Z",
+                    trigger_reason="RemoteStart",
+                    seq_no=0,
+                    transaction_info={
+                        "transaction_id": "tx-new",
+                        "charging_state": "EVConnected",
+                    },
+                ),
+            )
+            return MagicMock(status="Accepted", transaction_id=None)
+        return MagicMock(status="Accepted")
+
+    coordinator.charge_point = MagicMock()
+    coordinator.charge_point.call = AsyncMock(side_effect=call)
+    coordinator.profiles.remove()
+
+    with patch("asyncio.create_task") as create_task:
+        result = await asyncio.wait_for(coordinator.async_start_charging(), 1)
+    create_task.call_args.args[0].close()
+
+    assert result["action"] == "started"
+    profile = coordinator.charge_point.call.call_args.args[0].charging_profile
+    assert profile.transaction_id == "tx-new"
+
+
+async def test_meter_values_requested_once_charging() -> None:
+    """The refresh after start/resume runs when the car starts charging."""
+    coordinator = BMWWallboxCoordinator(MagicMock(), CONFIG)
+    coordinator.data.charging_state = "SuspendedEVSE"
+    coordinator.async_trigger_meter_values = AsyncMock()
+
+    refresh = asyncio.ensure_future(coordinator._async_refresh_when_charging())
+    await asyncio.sleep(0)
+    coordinator.async_trigger_meter_values.assert_not_awaited()
+
+    coordinator.events.fire(
+        EVENT_CHARGING_STATE_CHANGED, previous="SuspendedEVSE", to="Charging"
+    )
+    await asyncio.wait_for(refresh, 1)
+    coordinator.async_trigger_meter_values.assert_awaited_once()
+
+
+async def test_start_with_reset_continues_on_reconnect() -> None:
+    """After a reset the start is retried as soon as the wallbox is back."""
+    coordinator = BMWWallboxCoordinator(MagicMock(), CONFIG)
+    coordinator.async_start_charging = AsyncMock(
+        side_effect=[
+            {"success": False, "needs_reset": True},
+            {"success": True, "action": "started"},
+        ]
+    )
+
+    async def reset(status_callback=None):
+        asyncio.get_running_loop().call_soon(coordinator.events.fire, EVENT_CONNECTED)
+        return {"success": True}
+
+    coordinator.async_reset_wallbox = reset
+    coordinator.data.connected = True
+
+    result = await asyncio.wait_for(coordinator.async_start_charging_with_reset(), 1)
+
+    assert result["action"] == "started"
+    assert coordinator.async_start_charging.await_count == 2
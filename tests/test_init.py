@@ -11,6 +11,7 @@ import pytest
 from custom_components.bmw_wallbox import (
     DOMAIN,
     PLATFORMS,
+    _async_update_listener,
     async_setup_entry,
     async_unload_entry,
 )
@@ -21,6 +22,7 @@ def mock_hass():
     """Mock HomeAssistant."""
     hass = MagicMock(spec=HomeAssistant)
     hass.data = {}
+    hass.services = MagicMock()
     hass.config_entries = MagicMock()
     hass.config_entries.async_forward_entry_setups = AsyncMock(return_value=True)
     hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
@@ -59,6 +61,7 @@ async def test_async_setup_entry(mock_hass, mock_config_entry):
         "custom_components.bmw_wallbox.BMWWallboxCoordinator"
     ) as mock_coordinator_class:
         mock_coordinator = MagicMock()
+        mock_coordinator.async_restore_state = AsyncMock()
         mock_coordinator.async_start_server = AsyncMock()
         mock_coordinator_class.return_value = mock_coordinator
 
@@ -89,6 +92,7 @@ async def test_async_setup_entry_server_start_fails(mock_hass, mock_config_entry
         "custom_components.bmw_wallbox.BMWWallboxCoordinator"
     ) as mock_coordinator_class:
         mock_coordinator = MagicMock()
+        mock_coordinator.async_restore_state = AsyncMock()
         mock_coordinator.async_start_server = AsyncMock(
             side_effect=Exception("Failed to start server")
         )
@@ -171,8 +175,10 @@ async def test_multiple_entries(mock_hass):
         "custom_components.bmw_wallbox.BMWWallboxCoordinator"
     ) as mock_coordinator_class:
         mock_coordinator1 = MagicMock()
+        mock_coordinator1.async_restore_state = AsyncMock()
         mock_coordinator1.async_start_server = AsyncMock()
         mock_coordinator2 = MagicMock()
+        mock_coordinator2.async_restore_state = AsyncMock()
         mock_coordinator2.async_start_server = AsyncMock()
 
         mock_coordinator_class.side_effect = [mock_coordinator1, mock_coordinator2]
@@ -186,3 +192,36 @@ async def test_multiple_entries(mock_hass):
         assert len(mock_hass.data[DOMAIN]) == 2
         assert mock_hass.data[DOMAIN]["entry_1"] == mock_coordinator1
         assert mock_hass.data[DOMAIN]["entry_2"] == mock_coordinator2
+
+
+async def test_options_update_applied_without_reload(mock_hass, mock_config_entry):
+    """Test option changes are applied in place, keeping the connection."""
+    mock_coordinator = MagicMock()
+    mock_coordinator.requires_reload.return_value = False
+    mock_coordinator.async_apply_options = AsyncMock()
+    mock_hass.data[DOMAIN] = {mock_config_entry.entry_id: mock_coordinator}
+    mock_hass.config_entries.async_reload = AsyncMock()
+    mock_config_entry.options = {"max_current": 16}
+
+    await _async_update_listener(mock_hass, mock_config_entry)
+
+    mock_coordinator.async_apply_options.assert_awaited_once_with(
+        {**mock_config_entry.data, "max_current": 16}
+    )
+    mock_hass.config_entries.async_reload.assert_not_called()
+
+
+async def test_server_settings_change_reloads(mock_hass, mock_config_entry):
+    """Test changes to the listener settings still reload the entry."""
+    mock_coordinator = MagicMock()
+    mock_coordinator.requires_reload.return_value = True
+    mock_coordinator.async_apply_options = AsyncMock()
+    mock_hass.data[DOMAIN] = {mock_config_entry.entry_id: mock_coordinator}
+    mock_hass.config_entries.async_reload = AsyncMock()
+
+    await _async_update_listener(mock_hass, mock_config_entry)
+
+    mock_hass.config_entries.async_reload.assert_awaited_once_with(
+        mock_config_entry.entry_id
+    )
+    mock_coordinator.async_apply_options.assert_not_called()
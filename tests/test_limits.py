@@ -0,0 +1,149 @@
+"""Test the BMW Wallbox current limit command queue."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.bmw_wallbox.coordinator import BMWWallboxCoordinator
+from custom_components.bmw_wallbox.limits import LimitCommandQueue
+
+
+@pytest.fixture
+def coordinator():
+    """Create a coordinator with a mocked hass."""
+    return BMWWallboxCoordinator(
+        MagicMock(),
+        {
+            "port": 9000,
+            "ssl_cert": "/ssl/fullchain.pem",
+            "ssl_key": "/ssl/privkey.pem",
+            "charge_point_id": "DE*BMW*TEST123",
+            "max_current": 32,
+        },
+    )
+
+
+class FakeWallbox:
+    """Records sent limits; each send waits until released."""
+
+    def __init__(self, accept: bool = True) -> None:
+        self.sent: list[float] = []
+        self.accept = accept
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def send(self, limit: float) -> bool:
+        self.sent.append(limit)
+        await self.release.wait()
+        return self.accept
+
+
+async def test_pending_updates_coalesced_to_latest() -> None:
+    """Updates queued during a send collapse into one send of the latest."""
+    wallbox = FakeWallbox()
+    wallbox.release.clear()
+    queue = LimitCommandQueue(wallbox.send)
+
+    first = asyncio.create_task(queue.async_submit(6))
+    await asyncio.sleep(0)
+    rest = [asyncio.create_task(queue.async_submit(limit)) for limit in (8, 10, 12)]
+    await asyncio.sleep(0)
+    assert queue.depth == 3
+
+    wallbox.release.set()
+    assert await asyncio.gather(first, *rest) == [True] * 4
+    assert wallbox.sent == [6, 12]
+    assert queue.coalesced == 2
+    assert queue.depth == 0
+
+
+async def test_identical_limit_not_resent() -> None:
+    """The last accepted limit is skipped until the context changes."""
+    wallbox = FakeWallbox()
+    transaction = "tx-1"
+    queue = LimitCommandQueue(wallbox.send, context=lambda: transaction)
+
+    assert await queue.async_submit(16) is True
+    assert await queue.async_submit(16) is True
+    assert wallbox.sent == [16]
+    assert queue.skipped == 1
+
+    transaction = "tx-2"
+    await queue.async_submit(16)
+    queue.invalidate()
+    await queue.async_submit(16)
+    assert wallbox.sent == [16, 16, 16]
+
+
+async def test_rejected_limit_retried() -> None:
+    """A rejected limit is sent again on the next request."""
+    wallbox = FakeWallbox(accept=False)
+    queue = LimitCommandQueue(wallbox.send)
+
+    assert await queue.async_submit(16) is False
+    assert await queue.async_submit(16) is False
+    assert wallbox.sent == [16, 16]
+
+
+async def test_latency_and_depth_reported() -> None:
+    """Latency of the last send is measured and changes are announced."""
+    times = iter([10.0, 10.25])
+    on_change = MagicMock()
+    queue = LimitCommandQueue(
+        FakeWallbox().send, on_change=on_change, clock=lambda: next(times)
+    )
+
+    await queue.async_submit(16)
+
+    assert queue.last_latency == 0.25
+    assert on_change.call_count == 2
+
+
+async def test_cancel_releases_waiters() -> None:
+    """Unloading cancels the send and every caller waiting on it."""
+    wallbox = FakeWallbox()
+    wallbox.release.clear()
+    queue = LimitCommandQueue(wallbox.send)
+    waiter = asyncio.create_task(queue.async_submit(16))
+    await asyncio.sleep(0)
+
+    queue.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+
+async def test_cancel_during_send_releases_waiters() -> None:
+    """Callers of a limit being sent are released when it is cancelled."""
+    wallbox = FakeWallbox()
+    wallbox.release.clear()
+    queue = LimitCommandQueue(wallbox.send)
+    waiter = asyncio.create_task(queue.async_submit(16))
+    while not wallbox.sent:
+        await asyncio.sleep(0)
+
+    queue.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+
+async def _accepted(*args, **kwargs) -> bool:
+    return True
+
+
+async def test_coordinator_limit_goes_through_queue(coordinator) -> None:
+    """async_set_current_limit sends once and publishes queue metrics."""
+    coordinator.publish_window = 0
+    coordinator.charge_point = MagicMock()
+    coordinator._send_charging_profile = MagicMock(side_effect=_accepted)
+
+    assert await coordinator.async_set_current_limit(16) is True
+    assert await coordinator.async_set_current_limit(16) is True
+
+    # TxDefault only (no transaction), sent once
+    assert coordinator._send_charging_profile.call_count == 1
+    assert coordinator.data.current_limit == 16
+    assert coordinator.data.limit_latency is not None
+    assert coordinator.data.limit_queue_depth == 0
@@ -0,0 +1,82 @@
+"""Test the BMW Wallbox typed state."""
+
+import pytest
+
+from custom_components.bmw_wallbox.models import STATE_KEYS, WallboxState
+
+
+def test_defaults_match_previous_dict() -> None:
+    """Test defaults mirror the old coordinator dict."""
+    state = WallboxState()
+
+    assert state.connected is False
+    assert state.charging_state == "Unknown"
+    assert state.power == 0.0
+    assert state.energy_total is None
+    assert state.led_brightness == 46
+
+
+def test_copy_is_independent() -> None:
+    """Test copies do not share mutations with the original."""
+    state = WallboxState(power=1000.0)
+    new = state.copy()
+    new.power = 2000.0
+
+    assert state.power == 1000.0
+    assert new == WallboxState(power=2000.0)
+
+
+def test_evolve_replaces_fields() -> None:
+    """Test evolve returns a new snapshot with the given fields."""
+    state = WallboxState()
+    new = state.evolve(connected=True, transaction_id="tx-1")
+
+    assert new is not state
+    assert new.connected is True
+    assert new.transaction_id == "tx-1"
+    assert state.connected is False
+
+
+def test_evolve_rejects_unknown_field() -> None:
+    """Test evolve does not accept unknown fields."""
+    with pytest.raises(KeyError):
+        WallboxState().evolve(not_a_field=1)
+
+
+def test_changed_keys() -> None:
+    """Test changed_keys reports exactly the differing fields."""
+    state = WallboxState()
+    new = state.evolve(power=7000.0, current=30.0)
+
+    assert new.changed_keys(state) == {"power", "current"}
+    assert new.changed_keys(new.copy()) == frozenset()
+    assert new.changed_keys(None) == STATE_KEYS
+
+
+def test_mapping_interface() -> None:
+    """Test dict-style access keeps working."""
+    state = WallboxState()
+    state["power"] = 1500.0
+
+    assert state["power"] == 1500.0
+    assert state.get("power") == 1500.0
+    assert state.get("missing", "default") == "default"
+    assert "power" in state
+    assert "missing" not in state
+    assert len(state) == len(STATE_KEYS)
+    assert set(state) == STATE_KEYS
+
+    with pytest.raises(KeyError):
+        state["missing"]
+    with pytest.raises(KeyError):
+        state["missing"] = 1
+    with pytest.raises(TypeError):
+        del state["power"]
+
+
+def test_state_is_slotted() -> None:
+    """Test arbitrary attributes cannot be added."""
+    state = WallboxState()
+
+    with pytest.raises(AttributeError):
+        state.not_a_field = 1
@@ -42,8 +42,8 @@ async def test_current_limit_number_fallback(
     hass: HomeAssistant, mock_coordinator, mock_config_entry
 ) -> None:
     """Test current limit number falls back to config when no data."""
-    # Remove current_limit from data
-    del mock_coordinator.data["current_limit"]
+    # No current_limit tracked yet
+    mock_coordinator.data.current_limit = None
 
     number = BMWWallboxCurrentLimitNumber(mock_coordinator, mock_config_entry)
 
@@ -62,7 +62,7 @@ async def test_current_limit_set_with_active_transaction(
 
     # Should update coordinator.data
     assert mock_coordinator.data["current_limit"] == 20
-    mock_coordinator.async_set_updated_data.assert_called_with(mock_coordinator.data)
+    mock_coordinator.async_update_state.assert_called_with(current_limit=20)
 
     # Should call async_set_current_limit since there's an active transaction
     mock_coordinator.async_set_current_limit.assert_called_once_with(20)
@@ -82,7 +82,7 @@ async def test_current_limit_set_without_transaction(
 
     # Should update coordinator.data
     assert mock_coordinator.data["current_limit"] == 16
-    mock_coordinator.async_set_updated_data.assert_called_with(mock_coordinator.data)
+    mock_coordinator.async_update_state.assert_called_with(current_limit=16)
 
     # Should NOT call async_set_current_limit since there's no active transaction
     mock_coordinator.async_set_current_limit.assert_not_called()
@@ -125,3 +125,14 @@ async def test_current_limit_handles_failed_command(
     # Should still update coordinator.data (for next start/resume)
     assert mock_coordinator.data["current_limit"] == 24
     mock_coordinator.async_set_current_limit.assert_called_once_with(24)
+
+
+async def test_current_limit_number_max_follows_options(
+    hass: HomeAssistant, mock_coordinator, mock_config_entry
+) -> None:
+    """Test the slider maximum picks up option changes without a reload."""
+    number = BMWWallboxCurrentLimitNumber(mock_coordinator, mock_config_entry)
+
+    mock_config_entry.options = {"max_current": 16}
+
+    assert number.native_max_value == 16
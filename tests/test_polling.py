@@ -0,0 +1,97 @@
+"""Test BMW Wallbox adaptive meter polling."""
+
+import pytest
+
+from custom_components.bmw_wallbox.polling import (
+    POLL_MAX_FACTOR,
+    POLL_MIN_INTERVAL,
+    POLL_SETTLE_TIME,
+    AdaptivePoller,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Fake clock."""
+    return FakeClock()
+
+
+@pytest.fixture
+def poller(clock):
+    """Poller with a 10 s configured interval."""
+    return AdaptivePoller(10, clock=clock)
+
+
+def test_stale_until_first_push(poller, clock) -> None:
+    """Test polling is needed until data is pushed, then only when old."""
+    assert poller.is_stale()
+
+    poller.note_push(7000.0)
+    clock.now = 9
+    assert not poller.is_stale()
+
+    clock.now = 10
+    assert poller.is_stale()
+
+
+def test_backs_off_while_power_is_stable(poller, clock) -> None:
+    """Test the interval doubles up to the cap while charging steadily."""
+    poller.note_push(7000.0)
+    poller.note_push(7050.0)
+
+    intervals = [poller.next_interval(active=True) for _ in range(5)]
+
+    assert intervals == [20, 40, 60, 60, 60]
+    assert intervals[-1] == 10 * POLL_MAX_FACTOR
+
+
+def test_ramp_tightens_polling(poller, clock) -> None:
+    """Test a big power change polls quickly until things settle."""
+    poller.next_interval(active=True)
+    poller.note_push(7000.0)
+
+    assert poller.note_push(3500.0) is True
+    assert poller.interval == POLL_MIN_INTERVAL
+    assert poller.next_interval(active=True) == POLL_MIN_INTERVAL
+
+    clock.now = POLL_SETTLE_TIME
+    assert poller.next_interval(active=True) == POLL_MIN_INTERVAL * 2
+
+
+def test_limit_change_tightens_polling(poller) -> None:
+    """Test a limit change switches to the fast interval."""
+    poller.next_interval(active=True)
+
+    assert poller.tighten() is True
+    assert poller.interval == POLL_MIN_INTERVAL
+    # Already fast: nothing to reschedule
+    assert poller.tighten() is False
+
+
+def test_idle_uses_configured_interval(poller) -> None:
+    """Test outside a session the configured interval is used."""
+    poller.next_interval(active=True)
+    poller.next_interval(active=True)
+
+    assert poller.next_interval(active=False) == 10
+
+
+def test_base_interval_change(poller) -> None:
+    """Test a new configured interval restarts the schedule from it."""
+    poller.next_interval(active=True)
+    poller.set_base_interval(30)
+
+    assert poller.interval == 30
+    assert poller.fast_interval == POLL_MIN_INTERVAL
@@ -0,0 +1,184 @@
+"""Tests for the charging profile cache."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from ocpp.v201.datatypes import (
+    ChargingProfileType,
+    ChargingSchedulePeriodType,
+    ChargingScheduleType,
+)
+from ocpp.v201.enums import (
+    ChargingProfileKindEnumType,
+    ChargingProfilePurposeEnumType,
+    ChargingRateUnitEnumType,
+)
+
+from custom_components.bmw_wallbox.coordinator import (
+    BMWWallboxCoordinator,
+    WallboxChargePoint,
+)
+from custom_components.bmw_wallbox.profiles import ProfileCache
+
+CONFIG = {
+    "port": 9000,
+    "ssl_cert": "/ssl/fullchain.pem",
+    "ssl_key": "/ssl/privkey.pem",
+    "charge_point_id": "DE*BMW*TEST123",
+    "max_current": 32,
+}
+
+TX = ChargingProfilePurposeEnumType.tx_profile
+TX_DEFAULT = ChargingProfilePurposeEnumType.tx_default_profile
+
+
+def _profile(profile_id, purpose=TX, stack_level=0, transaction_id="tx-1"):
+    return ChargingProfileType(
+        id=profile_id,
+        stack_level=stack_level,
+        charging_profile_purpose=purpose,
+        charging_profile_kind=ChargingProfileKindEnumType.absolute,
+        charging_schedule=[
+            ChargingScheduleType(
+                id=1,
+                charging_rate_unit=ChargingRateUnitEnumType.amps,
+                charging_schedule_period=[
+                    ChargingSchedulePeriodType(start_period=0, limit=0.0)
+                ],
+            )
+        ],
+        transaction_id=transaction_id if purpose == TX else None,
+    )
+
+
+def _reported(profile_id, purpose="TxProfile", stack_level=0, transaction_id=None):
+    """A profile as it arrives in ReportChargingProfiles (snake_case dict)."""
+    report = {
+        "id": profile_id,
+        "stack_level": stack_level,
+        "charging_profile_purpose": purpose,
+        "charging_profile_kind": "Absolute",
+        "charging_schedule": [],
+    }
+    if transaction_id is not None:
+        report["transaction_id"] = transaction_id
+    return report
+
+
+async def test_conflicts() -> None:
+    """Only other profiles of the same purpose at the same or a higher level."""
+    cache = ProfileCache()
+    cache.record(1, _profile(998, TX_DEFAULT))
+    cache.record(1, _profile(999, stack_level=1))
+    cache.record(1, _profile(5, stack_level=2))
+    cache.record(1, _profile(6, stack_level=3, transaction_id="tx-old"))
+    pause = _profile(999)
+
+    assert [c.id for c in cache.conflicts(1, pause)] == [5]
+    assert cache.conflicts(0, pause) == []
+
+    cache.end_transaction("tx-1")
+    assert {p.id for p in cache.profiles} == {998, 6}
+
+
+async def test_report_replaces_cache_but_keeps_newer_sends() -> None:
+    """A report spread over messages syncs once; sends during it win."""
+    cache = ProfileCache()
+    cache.record(1, _profile(5))
+    assert not cache.known
+
+    request_id, done = cache.begin_report()
+    cache.add_report(request_id, 1, [_reported(998, "TxDefaultProfile")], "CSO", True)
+    cache.record(1, _profile(999))
+    assert not done.done()
+
+    cache.add_report(request_id, 0, [_reported(7, "ChargingStationMaxProfile")], "EMS")
+    await done
+
+    assert cache.known
+    assert {(p.id, p.evse_id, p.source) for p in cache.profiles} == {
+        (998, 1, "CSO"),
+        (999, 1, "CSO"),
+        (7, 0, "EMS"),
+    }
+
+    # A stale report is ignored
+    cache.add_report(request_id - 1, 1, [], "CSO")
+    assert len(cache.profiles) == 3
+
+
+async def test_reconcile_through_report_handler() -> None:
+    """GetChargingProfiles completes when ReportChargingProfiles arrives."""
+    coordinator = BMWWallboxCoordinator(MagicMock(), CONFIG)
+    charge_point = WallboxChargePoint("DE*BMW*TEST123", MagicMock(), coordinator)
+
+    async def call(request):
+        # The wallbox reports right after accepting the request
+        asyncio.get_running_loop().call_soon(
+            asyncio.ensure_future,
+            charge_point.on_report_charging_profiles(
+                request_id=request.request_id,
+                charging_limit_source="CSO",
+                charging_profile=[_reported(999, stack_level=1, transaction_id="tx-1")],
+                evse_id=1,
+            ),
+        )
+        return MagicMock(status="Accepted")
+
+    coordinator.charge_point = MagicMock()
+    coordinator.charge_point.call = AsyncMock(side_effect=call)
+
+    assert await coordinator.async_reconcile_profiles() is True
+    assert [p.id for p in coordinator.profiles.profiles] == [999]
+
+    coordinator.charge_point.call = AsyncMock(
+        return_value=MagicMock(status="NoProfiles")
+    )
+    assert await coordinator.async_reconcile_profiles() is True
+    assert coordinator.profiles.profiles == []
+
+
+async def test_pause_clears_only_conflicting_profiles() -> None:
+    """Pause sends no ClearChargingProfile unless a cached profile conflicts."""
+    coordinator = BMWWallboxCoordinator(MagicMock(), CONFIG)
+    coordinator.charge_point = MagicMock()
+    coordinator.charge_point.call = AsyncMock(
+        return_value=MagicMock(status="Accepted", ongoing_indicator=True)
+    )
+    coordinator.current_transaction_id = "tx-1"
+    coordinator.data.power = 7000.0
+    coordinator.async_refresh_transaction_id = AsyncMock()
+    coordinator.async_trigger_meter_values = AsyncMock()
+
+    request_id, _ = coordinator.profiles.begin_report()
+    coordinator.profiles.add_report(
+        request_id,
+        1,
+        [
+            _reported(998, "TxDefaultProfile"),
+            _reported(42, stack_level=2, transaction_id="tx-1"),
+        ],
+        "CSO",
+    )
+
+    with patch("asyncio.create_task"):
+        assert (await coordinator.async_pause_charging())["success"]
+
+    sent = [
+        type(c.args[0]).__name__ for c in coordinator.charge_point.call.call_args_list
+    ]
+    assert sent == ["ClearChargingProfile", "SetChargingProfile"]
+    assert (
+        coordinator.charge_point.call.call_args_list[0].args[0].charging_profile_id
+        == 42
+    )
+    assert {p.id for p in coordinator.profiles.profiles} == {998, 999}
+
+    # Nothing conflicts any more: resume is a single round trip
+    coordinator.charge_point.call.reset_mock()
+    with patch("asyncio.create_task"):
+        assert (await coordinator.async_resume_charging(16))["success"]
+    sent = [
+        type(c.args[0]).__name__ for c in coordinator.charge_point.call.call_args_list
+    ]
+    assert sent == ["SetChargingProfile"]
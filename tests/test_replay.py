@@ -0,0 +1,125 @@
+"""Tests for the offline TransactionEvent replay."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+
+from custom_components.bmw_wallbox.coordinator import (
+    BMWWallboxCoordinator,
+    WallboxChargePoint,
+)
+from custom_components.bmw_wallbox.replay import TransactionEventOrder
+
+CONFIG = {
+    "port": 9000,
+    "ssl_cert": "/ssl/fullchain.pem",
+    "ssl_key": "/ssl/privkey.pem",
+    "charge_point_id": "DE*BMW*TEST123",
+    "max_current": 32,
+}
+START = datetime(2026, 1, 1, 20, 0, tzinfo=UTC)
+
+
+def _charge_point() -> WallboxChargePoint:
+    coordinator = BMWWallboxCoordinator(MagicMock(), CONFIG)
+    coordinator.async_set_updated_data = MagicMock(
+        side_effect=coordinator.async_set_updated_data
+    )
+    return WallboxChargePoint("DE*BMW*TEST123", MagicMock(), coordinator)
+
+
+async def _event(charge_point, seq_no, minute, state, power, offline=False):
+    timestamp = (START + timedelta(minutes=minute)).isoformat()
+    extra = {"offline": True} if offline else {}
+    await charge_point.on_transaction_event(
+        event_type="Updated",
+        timestamp=timestamp,
+        trigger_reason="MeterValuePeriodic",
+        seq_no=seq_no,
+        transaction_info={"transaction_id": "tx-1", "charging_state": state},
+        meter_value=[
+            {
+                "timestamp": timestamp,
+                "sampled_value": [{"measurand": "Power.Active.Import", "value": power}],
+            }
+        ],
+        **extra,
+    )
+
+
+def test_event_order() -> None:
+    """seq_no orders a transaction's events, the timestamp across transactions."""
+    order = TransactionEventOrder()
+    assert not order.is_stale(START, "tx-1", 5)
+    order.note_applied(START, "tx-1", 5)
+
+    assert order.is_stale(START + timedelta(minutes=1), "tx-1", 5)  # repeat
+    assert not order.is_stale(START - timedelta(minutes=1), "tx-1", 6)
+    assert order.is_stale(START - timedelta(minutes=1), "tx-0", 9)
+    assert not order.is_stale(START + timedelta(minutes=1), "tx-2", 0)
+    # seq_no restarted after a reboot
+    assert not order.is_stale(START + timedelta(minutes=1), "tx-1", 0)
+
+
+async def test_replay_applied_in_order_with_one_publish() -> None:
+    """A burst arriving out of order ends on the newest state, published once."""
+    charge_point = _charge_point()
+    coordinator = charge_point.coordinator
+
+    await _event(charge_point, 3, 3, "SuspendedEV", 0, offline=True)
+    await _event(charge_point, 1, 1, "Charging", 7000, offline=True)
+    await _event(charge_point, 2, 2, "Charging", 7200, offline=True)
+    coordinator.async_set_updated_data.assert_not_called()
+
+    charge_point.async_flush_replay()
+
+    coordinator.async_set_updated_data.assert_called_once()
+    assert coordinator.data.charging_state == "SuspendedEV"
+    assert coordinator.data.sequence_number == 3
+    # Recorded in timestamp order, not in arrival order
+    assert [v for _, v in coordinator.meter_history.items("power")] == [
+        7000.0,
+        7200.0,
+        0.0,
+    ]
+
+
+async def test_stale_replay_kept_out_of_live_state() -> None:
+    """Replays older than a live event only reach the meter history."""
+    charge_point = _charge_point()
+    coordinator = charge_point.coordinator
+
+    await _event(charge_point, 10, 10, "Charging", 11000)
+    await _event(charge_point, 8, 8, "SuspendedEVSE", 0, offline=True)
+    charge_point.async_flush_replay()
+
+    assert coordinator.data.charging_state == "Charging"
+    assert coordinator.data.power == 11000
+    assert coordinator.data.sequence_number == 10
+    assert len(coordinator.meter_history.items("power")) == 2
+
+
+async def test_live_event_flushes_pending_replay_first() -> None:
+    """A live event applies the queued older events before itself."""
+    charge_point = _charge_point()
+    coordinator = charge_point.coordinator
+
+    await _event(charge_point, 4, 4, "SuspendedEV", 0, offline=True)
+    await _event(charge_point, 5, 5, "Charging", 7000)
+
+    assert coordinator.data.charging_state == "Charging"
+    assert coordinator.data.sequence_number == 5
+    assert not charge_point._replay_batch
+
+
+async def test_live_view_follows_reboot_mid_transaction() -> None:
+    """A rebooted wallbox restarting seq_no in the same transaction is applied."""
+    charge_point = _charge_point()
+    coordinator = charge_point.coordinator
+
+    await _event(charge_point, 10, 10, "Charging", 11000)
+    await _event(charge_point, 1, 12, "SuspendedEVSE", 0)
+    await _event(charge_point, 2, 13, "Charging", 7000)
+
+    assert coordinator.data.charging_state == "Charging"
+    assert coordinator.data.power == 7000
+    assert coordinator.data.sequence_number == 2
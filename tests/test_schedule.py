@@ -0,0 +1,176 @@
+"""Tests for tariff-based charging schedules."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from ocpp.v201.enums import (
+    ChargingProfileKindEnumType,
+    ChargingProfilePurposeEnumType,
+    RecurrencyKindEnumType,
+)
+import pytest
+
+from custom_components.bmw_wallbox.const import DOMAIN
+from custom_components.bmw_wallbox.coordinator import BMWWallboxCoordinator
+from custom_components.bmw_wallbox.schedule import (
+    SCHEDULE_MAX_PERIODS,
+    SCHEDULE_PROFILE_ID,
+    build_charging_profile,
+    tariff_periods,
+)
+from custom_components.bmw_wallbox.services import (
+    SET_CHARGING_SCHEDULE_SCHEMA,
+    set_charging_schedule,
+)
+
+START = datetime(2026, 1, 1, 22, 0, tzinfo=UTC)
+HOUR = timedelta(hours=1)
+
+CONFIG = {
+    "port": 9000,
+    "ssl_cert": "/ssl/fullchain.pem",
+    "ssl_key": "/ssl/privkey.pem",
+    "charge_point_id": "DE*BMW*TEST123",
+    "max_current": 32,
+}
+
+
+def _periods(profile):
+    schedule = profile.charging_schedule[0]
+    return [(p.start_period, p.limit) for p in schedule.charging_schedule_period]
+
+
+def test_build_profile_with_many_periods() -> None:
+    """Periods become offsets from the first start; equal neighbours merge."""
+    profile = build_charging_profile(
+        [
+            (START + 2 * HOUR, 0),
+            (START, 16),
+            (START + HOUR, 16),
+            (START + 3 * HOUR, 32),
+        ],
+        end=START + 8 * HOUR,
+    )
+
+    assert profile.id == SCHEDULE_PROFILE_ID
+    assert (
+        profile.charging_profile_purpose
+        == ChargingProfilePurposeEnumType.charging_station_max_profile
+    )
+    assert profile.charging_profile_kind == ChargingProfileKindEnumType.absolute
+    schedule = profile.charging_schedule[0]
+    assert schedule.start_schedule == "2026-01-01T22:00:00Z"
+    assert schedule.duration == 8 * 3600
+    assert _periods(profile) == [(0, 16.0), (7200, 0.0), (10800, 32.0)]
+
+
+def test_build_recurring_profile() -> None:
+    """A daily schedule repeats and must fit in one day."""
+    profile = build_charging_profile(
+        [(START, 32), (START + 8 * HOUR, 6)], recurrency="daily"
+    )
+    assert profile.charging_profile_kind == ChargingProfileKindEnumType.recurring
+    assert profile.recurrency_kind == RecurrencyKindEnumType.daily
+
+    with pytest.raises(ValueError, match="must fit"):
+        build_charging_profile(
+            [(START, 32), (START + 25 * HOUR, 6)], recurrency="daily"
+        )
+
+
+def test_build_profile_validates_periods() -> None:
+    """Empty, too long or ending too early schedules are rejected."""
+    with pytest.raises(ValueError, match="at least one"):
+        build_charging_profile([])
+    with pytest.raises(ValueError, match="at most"):
+        build_charging_profile(
+            [(START + i * HOUR, i % 2 * 16) for i in range(SCHEDULE_MAX_PERIODS + 1)]
+        )
+    with pytest.raises(ValueError, match="must end"):
+        build_charging_profile([(START, 16), (START + HOUR, 0)], end=START)
+
+
+def test_tariff_periods_from_prices() -> None:
+    """Priced periods charge at the maximum up to max_price, else 0 A."""
+    entries = [
+        {"start": START, "price": 0.12},
+        {"start": START + HOUR, "price": 0.35},
+        {"start": START + 2 * HOUR, "limit": 40},
+    ]
+
+    assert tariff_periods(entries, 16, max_price=0.2) == [
+        (START, 16),
+        (START + HOUR, 0.0),
+        (START + 2 * HOUR, 16),
+    ]
+    with pytest.raises(ValueError, match="max_price"):
+        tariff_periods(entries, 16)
+
+
+async def test_coordinator_uploads_and_reinstalls_schedule() -> None:
+    """The schedule goes to EVSE 0 once and again after a reconnect."""
+    coordinator = BMWWallboxCoordinator(MagicMock(), CONFIG)
+    coordinator.charge_point = MagicMock()
+    coordinator.charge_point.call = AsyncMock(return_value=MagicMock(status="Accepted"))
+
+    assert await coordinator.async_set_charging_schedule(
+        [(START, 16), (START + HOUR, 0)]
+    )
+    request = coordinator.charge_point.call.call_args.args[0]
+    assert request.evse_id == 0
+    assert request.charging_profile is coordinator.charging_schedule
+
+    coordinator.charge_point.call.reset_mock()
+    await coordinator._apply_default_limit_on_connect()
+    sent = [
+        c.args[0].charging_profile.id
+        for c in coordinator.charge_point.call.call_args_list
+    ]
+    assert sent == [SCHEDULE_PROFILE_ID, 998]
+
+    assert await coordinator.async_clear_charging_schedule()
+    assert coordinator.charging_schedule is None
+    clear = coordinator.charge_point.call.call_args.args[0]
+    assert clear.charging_profile_id == SCHEDULE_PROFILE_ID
+
+
+async def test_rejected_schedule_not_kept() -> None:
+    """A rejected upload is not re-installed later."""
+    coordinator = BMWWallboxCoordinator(MagicMock(), CONFIG)
+    coordinator.charge_point = MagicMock()
+    coordinator.charge_point.call = AsyncMock(return_value=MagicMock(status="Rejected"))
+
+    assert not await coordinator.async_set_charging_schedule([(START, 16)])
+    assert coordinator.charging_schedule is None
+
+
+async def test_set_charging_schedule_service() -> None:
+    """The service validates periods and reports rejections."""
+    coordinator = MagicMock(config=CONFIG)
+    coordinator.async_set_charging_schedule = AsyncMock(return_value=True)
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"entry": coordinator}}
+
+    data = SET_CHARGING_SCHEDULE_SCHEMA(
+        {
+            "periods": [
+                {"start": "2026-01-01T22:00:00+00:00", "price": 0.1},
+                {"start": "2026-01-01T23:00:00+00:00", "price": 0.3},
+            ],
+            "max_price": 0.2,
+            "recurrency": "daily",
+        }
+    )
+    await set_charging_schedule(hass, data)
+
+    coordinator.async_set_charging_schedule.assert_awaited_once_with(
+        [(START, 32), (START + HOUR, 0.0)], end=None, recurrency="daily"
+    )
+
+    with pytest.raises(ServiceValidationError):
+        await set_charging_schedule(hass, {**data, "max_price": None})
+
+    coordinator.async_set_charging_schedule.return_value = False
+    with pytest.raises(HomeAssistantError):
+        await set_charging_schedule(hass, data)
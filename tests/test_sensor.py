@@ -8,6 +8,9 @@ from custom_components.bmw_wallbox.sensor import (
     BMWWallboxEnergyTotalSensor,
     BMWWallboxEventTypeSensor,
     BMWWallboxIDTokenSensor,
+    BMWWallboxLastSessionEnergySensor,
+    BMWWallboxLimitLatencySensor,
+    BMWWallboxLinkRttSensor,
     BMWWallboxPhasesUsedSensor,
     BMWWallboxPowerSensor,
     BMWWallboxSequenceNumberSensor,
@@ -218,6 +221,49 @@ async def test_stopped_reason_sensor(
     assert sensor.native_value == "EVDisconnected"
 
 
+async def test_last_session_energy_sensor(
+    hass: HomeAssistant, mock_coordinator, mock_config_entry
+) -> None:
+    """Test last session energy sensor."""
+    sensor = BMWWallboxLastSessionEnergySensor(mock_coordinator, mock_config_entry)
+    mock_coordinator.data["last_session_energy"] = 12.5
+    mock_coordinator.sessions.last_session.stop_reason = "EVDisconnected"
+
+    assert sensor.native_value == 12.5
+    assert sensor.native_unit_of_measurement == "kWh"
+    assert sensor.extra_state_attributes["stop_reason"] == "EVDisconnected"
+
+    mock_coordinator.sessions = None
+    assert sensor.extra_state_attributes is None
+
+
+async def test_limit_latency_sensor(
+    hass: HomeAssistant, mock_coordinator, mock_config_entry
+) -> None:
+    """Test current limit command latency sensor."""
+    sensor = BMWWallboxLimitLatencySensor(mock_coordinator, mock_config_entry)
+    mock_coordinator.data["limit_latency"] = 180
+    mock_coordinator.data["limit_queue_depth"] = 2
+
+    assert sensor.native_value == 180
+    assert sensor.native_unit_of_measurement == "ms"
+    assert sensor.extra_state_attributes == {"queue_depth": 2}
+
+
+async def test_link_rtt_sensor(
+    hass: HomeAssistant, mock_coordinator, mock_config_entry
+) -> None:
+    """Test connection round trip sensor."""
+    sensor = BMWWallboxLinkRttSensor(mock_coordinator, mock_config_entry)
+    mock_coordinator.data["link_rtt"] = 42.5
+    mock_coordinator.liveness.pings = 10
+    mock_coordinator.liveness.lost_pings = 1
+
+    assert sensor.native_value == 42.5
+    assert sensor.native_unit_of_measurement == "ms"
+    assert sensor.extra_state_attributes == {"pings": 10, "lost_pings": 1}
+
+
 async def test_event_type_sensor(
     hass: HomeAssistant, mock_coordinator, mock_config_entry
 ) -> None:
@@ -358,3 +404,14 @@ async def test_voltage_sensor_zero_returns_none(
     mock_coordinator.data["voltage"] = 0
 
     assert sensor.native_value is None
+
+
+async def test_sensor_subscribes_to_its_data_keys(
+    hass: HomeAssistant, mock_coordinator, mock_config_entry
+) -> None:
+    """Sensors register the data keys they read as their listener context."""
+    power = BMWWallboxPowerSensor(mock_coordinator, mock_config_entry)
+    current = BMWWallboxCurrentSensor(mock_coordinator, mock_config_entry)
+
+    assert power.coordinator_context == frozenset({"power"})
+    assert "current_l1" in current.coordinator_context
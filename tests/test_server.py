@@ -0,0 +1,221 @@
+"""Test the shared BMW Wallbox OCPP server."""
+
+from http import HTTPStatus
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.bmw_wallbox.const import DATA_SERVERS
+from custom_components.bmw_wallbox.server import (
+    _TLS_CONTEXTS,
+    OCPPServer,
+    _use_latest_tls_context,
+    async_get_server,
+    async_get_ssl_context,
+    async_release_server,
+    charge_point_id_from_path,
+)
+
+
+@pytest.fixture
+def hass():
+    """Mock HomeAssistant."""
+    hass = MagicMock()
+    hass.data = {}
+    hass.async_add_executor_job = AsyncMock(
+        side_effect=lambda target, *args: target(*args)
+    )
+    return hass
+
+
+@pytest.fixture(autouse=True)
+def clear_tls_cache():
+    """Start every test with an empty TLS context cache."""
+    _TLS_CONTEXTS.clear()
+    yield
+    _TLS_CONTEXTS.clear()
+
+
+@pytest.fixture(autouse=True)
+def issue_registry():
+    """Patch the repair issue registry."""
+    with patch("custom_components.bmw_wallbox.server.ir") as ir:
+        yield ir
+
+
+@pytest.fixture
+def mock_serve():
+    """Patch websockets.serve and return the fake listener."""
+    listener = MagicMock()
+    listener.wait_closed = AsyncMock()
+    with (
+        patch(
+            "custom_components.bmw_wallbox.server.websockets.serve",
+            AsyncMock(return_value=listener),
+        ) as serve,
+        patch(
+            "custom_components.bmw_wallbox.server.async_get_ssl_context",
+            AsyncMock(),
+        ),
+        patch("custom_components.bmw_wallbox.server.async_track_time_interval"),
+    ):
+        serve.listener = listener
+        yield serve
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("/DE*BMW*TEST123", "DE*BMW*TEST123"),
+        ("/ocpp/DE*BMW*TEST123/", "DE*BMW*TEST123"),
+        ("/DE%2ABMW%2ATEST123?foo=bar", "DE*BMW*TEST123"),
+    ],
+)
+def test_charge_point_id_from_path(path, expected) -> None:
+    """Test the charge point ID is the last path segment."""
+    assert charge_point_id_from_path(path) == expected
+
+
+async def test_wallboxes_on_one_port_share_a_listener(hass, mock_serve) -> None:
+    """Test two entries on the same port bind a single server."""
+    first, second = MagicMock(), MagicMock()
+
+    server1 = await async_get_server(
+        hass, 9000, "/ssl/cert.pem", "/ssl/key.pem", "WB1", first
+    )
+    server2 = await async_get_server(
+        hass, 9000, "/ssl/cert.pem", "/ssl/key.pem", "WB2", second
+    )
+
+    assert server1 is server2
+    assert mock_serve.await_count == 1
+    assert server1.charge_points == {"WB1": first, "WB2": second}
+
+    await async_release_server(hass, 9000, "WB1")
+    mock_serve.listener.close.assert_not_called()
+
+    await async_release_server(hass, 9000, "WB2")
+    mock_serve.listener.close.assert_called_once()
+    assert hass.data[DATA_SERVERS] == {}
+
+
+async def test_failed_bind_is_not_registered(hass, mock_serve) -> None:
+    """Test a server that fails to start is removed from the registry."""
+    mock_serve.side_effect = OSError("Address in use")
+
+    with pytest.raises(OSError, match="Address in use"):
+        await async_get_server(hass, 9000, "/c", "/k", "WB1", MagicMock())
+
+    assert hass.data[DATA_SERVERS] == {}
+
+
+async def test_handshake_rejects_unknown_charge_point(hass, issue_registry) -> None:
+    """Test unknown IDs get a 404 during the handshake and raise an issue."""
+    server = OCPPServer(hass, 9000, "/c", "/k")
+    server.register("WB1", MagicMock())
+    server.register("WB2", MagicMock())
+    connection = MagicMock()
+
+    # asyncio implementation: (connection, request)
+    assert await server._process_request(connection, MagicMock(path="/WB1")) is None
+    response = await server._process_request(connection, MagicMock(path="/WB9"))
+    assert response is connection.respond.return_value
+    assert connection.respond.call_args.args[0] == HTTPStatus.NOT_FOUND
+
+    # legacy implementation: (path, request_headers)
+    assert await server._process_request("/WB1", {}) is None
+    status, _headers, _body = await server._process_request("/WB9", {})
+    assert status == HTTPStatus.NOT_FOUND
+
+    issue = issue_registry.async_create_issue.call_args
+    assert issue.args[2] == "unknown_charge_point_9000"
+    assert issue.kwargs["translation_placeholders"]["charge_point_id"] == "WB9"
+
+
+async def test_single_entry_accepts_any_path(hass, issue_registry) -> None:
+    """Test the only entry on a port gets connections with another ID."""
+    server = OCPPServer(hass, 9000, "/c", "/k")
+    coordinator = MagicMock(async_handle_connection=AsyncMock())
+    server.register("WB1", coordinator)
+    websocket = MagicMock()
+    websocket.request.path = "/ocpp/legacy-id"
+
+    assert await server._process_request(MagicMock(), websocket.request) is None
+    await server._on_connect(websocket)
+
+    coordinator.async_handle_connection.assert_awaited_once_with("legacy-id", websocket)
+    issue_registry.async_create_issue.assert_not_called()
+
+
+async def test_connection_routed_to_matching_coordinator(hass) -> None:
+    """Test each connection reaches the coordinator for its path."""
+    server = OCPPServer(hass, 9000, "/c", "/k")
+    first = MagicMock(async_handle_connection=AsyncMock())
+    second = MagicMock(async_handle_connection=AsyncMock())
+    server.register("WB1", first)
+    server.register("WB2", second)
+    websocket = MagicMock()
+    websocket.request.path = "/WB2"
+
+    await server._on_connect(websocket)
+
+    second.async_handle_connection.assert_awaited_once_with("WB2", websocket)
+    first.async_handle_connection.assert_not_awaited()
+
+
+async def test_duplicate_charge_point_rejected(hass) -> None:
+    """Test the same ID cannot be registered twice on a port."""
+    server = OCPPServer(hass, 9000, "/c", "/k")
+    server.register("WB1", MagicMock())
+
+    with pytest.raises(ValueError, match="already registered"):
+        server.register("WB1", MagicMock())
+
+
+async def test_tls_context_cached_until_files_change(hass) -> None:
+    """Test contexts are reused across calls and reloaded after rotation."""
+    mtimes = (1, 1)
+    with (
+        patch(
+            "custom_components.bmw_wallbox.server._tls_mtimes",
+            side_effect=lambda *_: mtimes,
+        ),
+        patch(
+            "custom_components.bmw_wallbox.server._load_tls_context",
+            side_effect=lambda *_: MagicMock(),
+        ) as load,
+    ):
+        first = await async_get_ssl_context(hass, "/ssl/cert.pem", "/ssl/key.pem")
+        again = await async_get_ssl_context(hass, "/ssl/cert.pem", "/ssl/key.pem")
+        assert again is first
+        assert load.call_count == 1
+
+        mtimes = (2, 2)
+        renewed = await async_get_ssl_context(hass, "/ssl/cert.pem", "/ssl/key.pem")
+        assert renewed is not first
+        assert load.call_count == 2
+
+
+async def test_handshake_switches_to_renewed_context() -> None:
+    """Test handshakes on the listener's old context use the newest one."""
+    paths = ("/ssl/cert.pem", "/ssl/key.pem")
+    old, new = MagicMock(), MagicMock()
+    _TLS_CONTEXTS[paths] = ((2, 2), new)
+    ssl_object = MagicMock()
+
+    _use_latest_tls_context(paths, ssl_object, "wallbox.example.com", old)
+    assert ssl_object.context is new
+
+    ssl_object = MagicMock()
+    _use_latest_tls_context(paths, ssl_object, "wallbox.example.com", new)
+    assert ssl_object.context is not new
+
+
+async def test_tls_check_keeps_serving_on_bad_files(hass) -> None:
+    """Test a failed reload (e.g. mid-rotation) keeps the current context."""
+    server = OCPPServer(hass, 9000, "/ssl/missing.pem", "/ssl/missing.pem")
+
+    # Missing files raise OSError, which must not escape the periodic check
+    await server._async_check_tls()
+
+    assert _TLS_CONTEXTS == {}
@@ -0,0 +1,166 @@
+"""Test the BMW Wallbox charging session ledger."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.bmw_wallbox.const import DOMAIN
+from custom_components.bmw_wallbox.services import get_sessions
+from custom_components.bmw_wallbox.sessions import (
+    CURVE_RESOLUTION,
+    MAX_CURVE_POINTS,
+    MAX_SESSIONS,
+    ChargingSession,
+    SessionLedger,
+)
+
+START = datetime(2026, 1, 1, 20, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+def mock_store():
+    """Patch the Home Assistant Store used by the ledger."""
+    with patch("custom_components.bmw_wallbox.sessions.Store") as store_class:
+        store = store_class.return_value
+        store.async_load = AsyncMock(return_value=None)
+        store.async_save = AsyncMock()
+        yield store
+
+
+@pytest.fixture
+def ledger(mock_store):
+    """Create an empty ledger."""
+    return SessionLedger(MagicMock(), "entry")
+
+
+def _charge(ledger, transaction_id, start, minutes, start_energy=100.0, power=7000):
+    """Feed a Started/Updated.../Ended sequence into the ledger."""
+    ledger.async_handle_event("Started", transaction_id, start, start_energy, 0.0)
+    for minute in range(1, minutes):
+        ledger.async_handle_event(
+            "Updated",
+            transaction_id,
+            start + timedelta(minutes=minute),
+            start_energy + minute * power / 60000,
+            power,
+        )
+    return ledger.async_handle_event(
+        "Ended",
+        transaction_id,
+        start + timedelta(minutes=minutes),
+        start_energy + minutes * power / 60000,
+        0.0,
+        "EVDisconnected",
+    )
+
+
+async def test_session_recorded(ledger, mock_store) -> None:
+    """Started/Updated/Ended produce one session with energy and duration."""
+    session = _charge(ledger, "tx-1", START, 60)
+
+    assert session is ledger.last_session
+    assert ledger.active is None
+    assert session.energy == 7.0
+    assert session.duration == 3600
+    assert session.stop_reason == "EVDisconnected"
+    assert session.curve_step == CURVE_RESOLUTION
+    assert session.power_curve[1:59] == [7000] * 58
+    mock_store.async_delay_save.assert_called_once()
+
+
+async def test_power_curve_bounded(ledger) -> None:
+    """Long sessions halve the curve resolution instead of growing."""
+    session = _charge(ledger, "tx-1", START, 24 * 60)
+
+    assert len(session.power_curve) <= MAX_CURVE_POINTS
+    assert session.curve_step > CURVE_RESOLUTION
+
+
+async def test_ledger_bounded(ledger) -> None:
+    """Only the newest MAX_SESSIONS sessions are kept."""
+    for i in range(MAX_SESSIONS + 5):
+        _charge(ledger, f"tx-{i}", START + timedelta(hours=i), 2)
+
+    sessions = ledger.sessions()
+    assert len(sessions) == MAX_SESSIONS
+    assert sessions[0].transaction_id == f"tx-{MAX_SESSIONS + 4}"
+
+
+async def test_missed_ended_closes_session(ledger) -> None:
+    """A new transaction closes one whose Ended event was missed."""
+    ledger.async_handle_event("Started", "tx-1", START, 10.0, 0.0)
+    ledger.async_handle_event("Updated", "tx-1", START + timedelta(hours=1), 17.0, 0.0)
+    ledger.async_handle_event("Started", "tx-2", START + timedelta(hours=5), 17.0, 0.0)
+
+    assert ledger.last_session.transaction_id == "tx-1"
+    assert ledger.last_session.energy == 7.0
+    assert ledger.last_session.duration == 3600
+    assert ledger.active.transaction_id == "tx-2"
+
+
+async def test_late_sample_widens_active_session(ledger) -> None:
+    """A replayed reading extends the energy range but leaves other sessions."""
+    ledger.async_handle_event("Updated", "tx-1", START, 101.0, 7000)
+    ledger.async_handle_event(
+        "Updated", "tx-1", START + timedelta(hours=1), 108.0, 7000
+    )
+
+    ledger.async_add_late_sample("tx-1", START - timedelta(minutes=5), 100.4, 7000)
+    ledger.async_add_late_sample("tx-0", START, 90.0, 7000)
+
+    assert ledger.active.start_energy == 100.4
+    assert ledger.active.stop_energy == 108.0
+
+
+async def test_query_since_and_limit(ledger) -> None:
+    """Sessions are returned newest first, filtered by start time."""
+    for i in range(5):
+        _charge(ledger, f"tx-{i}", START + timedelta(days=i), 2)
+
+    assert [s.transaction_id for s in ledger.sessions(limit=2)] == ["tx-4", "tx-3"]
+    recent = ledger.sessions(since=START + timedelta(days=3))
+    assert [s.transaction_id for s in recent] == ["tx-4", "tx-3"]
+
+
+async def test_ledger_survives_reload(ledger, mock_store) -> None:
+    """Finished and active sessions are restored from storage."""
+    _charge(ledger, "tx-1", START, 10)
+    ledger.async_handle_event("Started", "tx-2", START + timedelta(hours=1), 50.0, 0.0)
+    data_func = mock_store.async_delay_save.call_args.args[0]
+    mock_store.async_load.return_value = data_func()
+
+    restored = SessionLedger(MagicMock(), "entry")
+    await restored.async_load()
+
+    assert restored.last_session == ledger.last_session
+    assert restored.active.transaction_id == "tx-2"
+
+
+async def test_get_sessions_service(ledger) -> None:
+    """The service returns sessions of every wallbox with derived fields."""
+    _charge(ledger, "tx-1", START, 30)
+    hass = MagicMock()
+    hass.data = {
+        DOMAIN: {
+            "entry": MagicMock(
+                sessions=ledger, config={"charge_point_id": "DE*BMW*TEST123"}
+            )
+        }
+    }
+
+    response = get_sessions(hass, {})
+
+    [session] = response["sessions"]
+    assert session["charge_point_id"] == "DE*BMW*TEST123"
+    assert session["energy"] == 3.5
+    assert session["duration"] == 1800
+    assert get_sessions(hass, {"since": START + timedelta(days=1)}) == {"sessions": []}
+
+
+def test_session_storage_is_compact() -> None:
+    """Only public fields are written to the ledger file."""
+    session = ChargingSession("tx-1", START.isoformat(), 1.0)
+    session.add_sample(START, 1000)
+
+    assert not any(key.startswith("_") for key in session.to_storage())
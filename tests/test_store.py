@@ -0,0 +1,120 @@
+"""Test the persistent BMW Wallbox state store."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.bmw_wallbox.coordinator import BMWWallboxCoordinator
+from custom_components.bmw_wallbox.store import SAVE_DELAY, WallboxStore
+
+
+@pytest.fixture
+def mock_store():
+    """Patch the Home Assistant Store used by WallboxStore."""
+    with patch("custom_components.bmw_wallbox.store.Store") as store_class:
+        store = store_class.return_value
+        store.async_load = AsyncMock(return_value=None)
+        store.async_save = AsyncMock()
+        store.async_remove = AsyncMock()
+        yield store
+
+
+@pytest.fixture
+def coordinator():
+    """Create a coordinator with a mocked hass."""
+    return BMWWallboxCoordinator(
+        MagicMock(),
+        {
+            "port": 9000,
+            "ssl_cert": "/ssl/fullchain.pem",
+            "ssl_key": "/ssl/privkey.pem",
+            "charge_point_id": "DE*BMW*TEST123",
+            "max_current": 16,
+        },
+    )
+
+
+async def test_writes_are_batched(mock_store) -> None:
+    """Many updates schedule one delayed write, re-armed only after it ran."""
+    store = WallboxStore(MagicMock(), "entry")
+
+    store.async_update(energy_total=1.0)
+    store.async_update(energy_total=1.1)
+    store.async_update(energy_total=1.1)
+
+    mock_store.async_delay_save.assert_called_once()
+    data_func, delay = mock_store.async_delay_save.call_args.args
+    assert delay == SAVE_DELAY
+    assert data_func() == {"energy_total": 1.1}
+
+    store.async_update(energy_total=1.2)
+    assert mock_store.async_delay_save.call_count == 2
+
+
+async def test_flush_only_writes_pending_changes(mock_store) -> None:
+    """Unloading writes pending changes immediately, and nothing otherwise."""
+    store = WallboxStore(MagicMock(), "entry")
+    await store.async_flush()
+    mock_store.async_save.assert_not_called()
+
+    store.async_update(transaction_id="tx-1")
+    await store.async_flush()
+    mock_store.async_save.assert_awaited_once_with({"transaction_id": "tx-1"})
+
+
+async def test_coordinator_restores_state(coordinator, mock_store) -> None:
+    """Entities start from the persisted values instead of empty ones."""
+    mock_store.async_load.return_value = {
+        "energy_total": 1234.5,
+        "transaction_id": "tx-1",
+        "current_limit": 32,
+        "device_info": {"model": "EIAW-E22KTSE6B04", "serial_number": "SN1"},
+    }
+
+    await coordinator.async_restore_state(
+        WallboxStore(coordinator.hass, "entry"),
+        MagicMock(async_load=AsyncMock(), last_session=None),
+    )
+
+    assert coordinator.data.energy_total == 1234.5
+    assert coordinator.data.transaction_id == "tx-1"
+    assert coordinator.current_transaction_id == "tx-1"
+    # Clamped to the configured maximum
+    assert coordinator.data.current_limit == 16
+    assert coordinator.device_info["serial_number"] == "SN1"
+
+
+async def test_coordinator_persists_on_publish(coordinator, mock_store) -> None:
+    """Publishing a change to a persisted key schedules a write."""
+    await coordinator.async_restore_state(
+        WallboxStore(coordinator.hass, "entry"),
+        MagicMock(async_load=AsyncMock(), last_session=None),
+    )
+    coordinator.publish_window = 0
+
+    coordinator.async_update_state(sequence_number=3)
+    mock_store.async_delay_save.reset_mock()
+    coordinator.async_update_state(sequence_number=4)
+    mock_store.async_delay_save.assert_not_called()
+
+    coordinator.async_update_state(energy_total=42.0)
+    assert coordinator.store.data["energy_total"] == 42.0
+
+
+async def test_restored_transaction_cleared_when_wallbox_has_none(
+    coordinator, mock_store
+) -> None:
+    """A transaction that ended while HA was down is dropped on reconnect."""
+    mock_store.async_load.return_value = {"transaction_id": "tx-1"}
+    await coordinator.async_restore_state(
+        WallboxStore(coordinator.hass, "entry"),
+        MagicMock(async_load=AsyncMock(), last_session=None),
+    )
+    coordinator.publish_window = 0
+    coordinator.charge_point = MagicMock()
+    coordinator.charge_point.call = AsyncMock(return_value=MagicMock(status="Rejected"))
+
+    assert await coordinator._recover_transaction_on_connect() is True
+
+    assert coordinator.current_transaction_id is None
+    assert coordinator.data.transaction_id is None
@@ -0,0 +1,117 @@
+"""Test the BMW Wallbox meter history rings."""
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from homeassistant.util import dt as dt_util
+import pytest
+
+from custom_components.bmw_wallbox.const import DOMAIN
+from custom_components.bmw_wallbox.diagnostics import async_get_config_entry_diagnostics
+from custom_components.bmw_wallbox.models import WallboxState
+from custom_components.bmw_wallbox.services import get_meter_history
+from custom_components.bmw_wallbox.timeseries import (
+    RAW_CAPACITY,
+    TIER_1MIN,
+    TIER_15MIN,
+    TIER_RAW,
+    AggregateRing,
+    MeterHistory,
+    RingBuffer,
+)
+
+T0 = 1_767_225_600.0  # 2026-01-01T00:00:00Z
+
+
+def test_ring_buffer_overwrites_oldest() -> None:
+    """The raw ring keeps the newest samples, oldest first."""
+    ring = RingBuffer(3)
+    for i in range(5):
+        ring.append(T0 + i, float(i))
+
+    assert len(ring) == 3
+    assert ring.items() == [(T0 + 2, 2.0), (T0 + 3, 3.0), (T0 + 4, 4.0)]
+    assert ring.items(since=T0 + 4) == [(T0 + 4, 4.0)]
+
+
+def test_aggregate_ring_min_max_avg() -> None:
+    """Samples are folded into per-bucket min/max/avg, keeping spikes."""
+    ring = AggregateRing(60, 10)
+    for offset, value in ((0, 1000), (10, 11000), (50, 3000), (65, 500)):
+        ring.add(T0 + offset, value)
+
+    assert ring.items() == [
+        (T0, 1000, 11000, 5000),
+        (T0 + 60, 500, 500, 500),  # still open
+    ]
+
+
+def test_aggregate_ring_ignores_late_samples() -> None:
+    """A sample for an already closed bucket does not reopen it."""
+    ring = AggregateRing(60, 10)
+    ring.add(T0 + 70, 1.0)
+    ring.add(T0 + 10, 100.0)
+
+    assert ring.items() == [(T0 + 60, 1.0, 1.0, 1.0)]
+
+
+def test_history_bounded_per_series() -> None:
+    """Every tier has a fixed size, however many samples arrive."""
+    history = MeterHistory()
+    for i in range(RAW_CAPACITY * 3):
+        history.add("power", T0 + i * 10, 7000.0)
+
+    assert len(history.items("power", TIER_RAW)) == RAW_CAPACITY
+    assert len(history.items("power", TIER_1MIN)) == RAW_CAPACITY * 3 // 6
+    assert history.items("power", TIER_15MIN)[0][1:] == (7000.0, 7000.0, 7000.0)
+    assert history.items("voltage") == []
+    with pytest.raises(ValueError, match="Unknown tier"):
+        history.items("power", "5m")
+
+
+async def test_meter_history_service_and_diagnostics() -> None:
+    """The history is exposed to the service and to diagnostics."""
+    coordinator = MagicMock(
+        config={"charge_point_id": "DE*BMW*TEST123", "rfid_token": "secret"},
+        data=WallboxState(),
+        device_info={},
+        bootstrap_metrics={},
+        meter_history=MeterHistory(),
+    )
+    coordinator.meter_history.add("power", T0, 7200.0)
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"entry": coordinator}}
+
+    response = get_meter_history(hass, {"key": "power", "tier": TIER_RAW})
+    assert response["series"][0]["points"] == [["2026-01-01T00:00:00+00:00", 7200.0]]
+
+    diagnostics = await async_get_config_entry_diagnostics(
+        hass, MagicMock(entry_id="entry")
+    )
+    assert diagnostics["config"]["rfid_token"] == "**REDACTED**"
+    assert diagnostics["meter_history"][TIER_1MIN]["power"] == [
+        (T0, 7200.0, 7200.0, 7200.0)
+    ]
+
+
+def test_meter_history_since_is_local_time() -> None:
+    """A `since` without a timezone is Home Assistant's local time."""
+    coordinator = MagicMock(
+        config={"charge_point_id": "DE*BMW*TEST123"}, meter_history=MeterHistory()
+    )
+    coordinator.meter_history.add("power", T0, 7200.0)  # 00:00 UTC
+    coordinator.meter_history.add("power", T0 + 3600, 3600.0)  # 01:00 UTC
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"entry": coordinator}}
+
+    default_time_zone = dt_util.DEFAULT_TIME_ZONE
+    dt_util.set_default_time_zone(dt_util.get_time_zone("Europe/Berlin"))
+    try:
+        # 01:30 in Berlin is 00:30 UTC
+        response = get_meter_history(
+            hass, {"key": "power", "since": datetime(2026, 1, 1, 1, 30)}
+        )
+    finally:
+        dt_util.set_default_time_zone(default_time_zone)
+
+    assert response["series"][0]["points"] == [["2026-01-01T01:00:00+00:00", 3600.0]]
@@ -0,0 +1,192 @@
+"""Tests for the connection liveness watchdog."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.bmw_wallbox.binary_sensor import BMWWallboxConnectedBinarySensor
+from custom_components.bmw_wallbox.coordinator import (
+    BMWWallboxCoordinator,
+    WallboxChargePoint,
+)
+from custom_components.bmw_wallbox.watchdog import LivenessMonitor
+
+CONFIG = {
+    "port": 9000,
+    "ssl_cert": "/ssl/fullchain.pem",
+    "ssl_key": "/ssl/privkey.pem",
+    "charge_point_id": "DE*BMW*TEST123",
+    "max_current": 32,
+}
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_rtt_and_jitter_smoothed() -> None:
+    """The first pong sets the RTT; later ones move it by 1/8, jitter by 1/16."""
+    monitor = LivenessMonitor(clock=FakeClock())
+    monitor.note_pong(0.040)
+    assert (monitor.rtt, monitor.jitter) == (0.040, 0.0)
+
+    monitor.note_pong(0.120)
+    assert monitor.rtt == pytest.approx(0.050)
+    assert monitor.jitter == pytest.approx(0.005)
+    assert monitor.last_rtt == 0.120
+
+
+def test_silence_counts_from_last_sign_of_life() -> None:
+    """Messages and pongs reset the silence; lost pings don't."""
+    clock = FakeClock()
+    monitor = LivenessMonitor(clock=clock)
+    clock.now = 20
+    monitor.note_alive()
+    clock.now = 45
+    monitor.note_lost_ping()
+    assert monitor.silence() == 25
+    assert (monitor.pings, monitor.lost_pings) == (1, 1)
+
+    monitor.reset()
+    assert monitor.silence() == 0
+    assert monitor.rtt is None
+
+
+def test_heartbeat_stretched_while_traffic_flows() -> None:
+    """Heartbeats are stretched while other messages prove liveness."""
+    clock = FakeClock()
+    monitor = LivenessMonitor(clock=clock)
+    assert monitor.heartbeat_interval(10, 300) == 10
+
+    monitor.note_traffic()
+    clock.now = 19
+    assert monitor.heartbeat_interval(10, 300) == 300
+
+    clock.now = 21
+    assert monitor.heartbeat_interval(10, 300) == 10
+
+
+def _heartbeat_response(status: str) -> MagicMock:
+    response = MagicMock()
+    response.set_variable_result = [
+        {
+            "attribute_status": status,
+            "component": {"name": "OCPPCommCtrlr"},
+            "variable": {"name": "HeartbeatInterval"},
+        }
+    ]
+    return response
+
+
+async def test_heartbeat_interval_follows_traffic() -> None:
+    """The wallbox gets the long interval during a session and back after."""
+    coordinator = BMWWallboxCoordinator(MagicMock(), CONFIG)
+    coordinator.charge_point = MagicMock()
+    coordinator.charge_point.call = AsyncMock(
+        return_value=_heartbeat_response("Accepted")
+    )
+    coordinator.heartbeat_interval = 10
+
+    await coordinator.async_tune_heartbeat()
+    coordinator.charge_point.call.assert_not_awaited()
+
+    coordinator.liveness.note_traffic()
+    await coordinator.async_tune_heartbeat()
+    request = coordinator.charge_point.call.call_args.args[0]
+    assert request.set_variable_data[0].attribute_value == "300"
+    assert coordinator.heartbeat_interval == 300
+
+    coordinator.liveness.last_traffic -= 60
+    await coordinator.async_tune_heartbeat()
+    assert coordinator.heartbeat_interval == 10
+    assert coordinator.charge_point.call.await_count == 2
+
+
+async def test_heartbeat_not_retried_when_rejected() -> None:
+    """A firmware that refuses the variable is left alone."""
+    coordinator = BMWWallboxCoordinator(MagicMock(), CONFIG)
+    coordinator.charge_point = MagicMock()
+    coordinator.charge_point.call = AsyncMock(
+        return_value=_heartbeat_response("Rejected")
+    )
+    coordinator.heartbeat_interval = 10
+    coordinator.liveness.note_traffic()
+
+    await coordinator.async_tune_heartbeat()
+    await coordinator.async_tune_heartbeat()
+
+    coordinator.charge_point.call.assert_awaited_once()
+    assert coordinator.heartbeat_interval == 10
+
+
+async def test_silent_wallbox_marked_offline_and_closed() -> None:
+    """A half-open connection is closed once the deadline passes."""
+    coordinator = BMWWallboxCoordinator(MagicMock(), CONFIG)
+    coordinator.config["liveness_deadline"] = 0.05
+    websocket = MagicMock()
+    websocket.ping = AsyncMock(side_effect=asyncio.Future)  # never answered
+    websocket.close = AsyncMock()
+    charge_point = WallboxChargePoint("DE*BMW*TEST123", websocket, coordinator)
+    coordinator.charge_point = charge_point
+    coordinator.data.connected = True
+    coordinator.liveness.reset()
+
+    await asyncio.wait_for(coordinator._async_watch_connection(charge_point), 1)
+
+    websocket.close.assert_awaited_once()
+    assert coordinator.data.connected is False
+    assert coordinator.liveness.lost_pings >= 1
+
+
+async def test_silent_wallbox_refreshes_online_sensor() -> None:
+    """The Wallbox Online sensor is notified when the watchdog gives up."""
+    coordinator = BMWWallboxCoordinator(MagicMock(), CONFIG)
+    coordinator.config["liveness_deadline"] = 0.05
+    websocket = MagicMock()
+    websocket.ping = AsyncMock(side_effect=asyncio.Future)
+    websocket.close = AsyncMock()
+    charge_point = WallboxChargePoint("DE*BMW*TEST123", websocket, coordinator)
+    coordinator.charge_point = charge_point
+    coordinator.async_update_state(connected=True)
+    coordinator.liveness.reset()
+    listener = MagicMock()
+    coordinator.async_add_key_listener(
+        listener, BMWWallboxConnectedBinarySensor._data_keys
+    )
+
+    await asyncio.wait_for(coordinator._async_watch_connection(charge_point), 1)
+
+    listener.assert_called_once()
+    assert "connected" in coordinator.dirty_keys
+
+
+async def test_pong_publishes_link_quality() -> None:
+    """Answered pings keep the wallbox online and publish RTT and jitter."""
+    coordinator = BMWWallboxCoordinator(MagicMock(), CONFIG)
+    coordinator.config["liveness_deadline"] = 20
+    websocket = MagicMock()
+
+    async def ping():
+        pong = asyncio.get_running_loop().create_future()
+        pong.set_result(None)
+        return pong
+
+    websocket.ping = ping
+    websocket.close = AsyncMock()
+    charge_point = WallboxChargePoint("DE*BMW*TEST123", websocket, coordinator)
+    coordinator.charge_point = charge_point
+
+    watch = asyncio.ensure_future(coordinator._async_watch_connection(charge_point))
+    await asyncio.sleep(0.01)
+    watch.cancel()
+
+    assert coordinator.data.link_rtt is not None
+    assert coordinator.data.link_jitter == 0.0
+    websocket.close.assert_not_awaited()